@@ -0,0 +1,117 @@
+# Cache respons Gemini dua tingkat: LRU di memori proses dan tabel ai_cache di SQLite.
+# Kunci cache = SHA-256 dari nama model + prompt yang dinormalisasi, sehingga prompt yang sama
+# (mis. analisis kasus yang sama) dijawab dari cache tanpa memakai kuota API.
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_TTL_SECONDS = int(os.environ.get("KALAM_AI_CACHE_TTL", 7 * 24 * 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("KALAM_AI_CACHE_SIZE", 512))
+DEFAULT_MAX_DB_ENTRIES = int(os.environ.get("KALAM_AI_CACHE_DB_SIZE", 20000))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", prompt)).strip()
+
+
+def make_key(model_name, prompt):
+    return hashlib.sha256(f"{model_name}\x00{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, db=None, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_db_entries=DEFAULT_MAX_DB_ENTRIES, clock=time.time):
+        # db=None: hanya cache memori (mis. untuk pengujian offline)
+        self.db = db
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_db_entries = max_db_entries
+        self.clock = clock
+        self._lru = OrderedDict()  # key -> (created_at, text)
+        self._lock = threading.Lock()
+        self._puts = 0
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _expired(self, created_at):
+        return self.ttl_seconds is not None and self.clock() - created_at > self.ttl_seconds
+
+    def _remember(self, key, created_at, text):
+        # Dipanggil dengan self._lock terpegang
+        self._lru[key] = (created_at, text)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, model_name, prompt):
+        key = make_key(model_name, prompt)
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._lru[key]
+        if self.db is not None:
+            row = self.db.fetchone("SELECT created_at, response FROM ai_cache WHERE key=?", (key,))
+            if row is not None and not self._expired(row[0]):
+                with self._lock:
+                    self._remember(key, row[0], row[1])
+                    self.db_hits += 1
+                return row[1]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model_name, prompt, text):
+        key = make_key(model_name, prompt)
+        now = self.clock()
+        with self._lock:
+            self._remember(key, now, text)
+            self._puts += 1
+            prune = self._puts % 100 == 0
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO ai_cache (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, model_name, text, now),
+            )
+            if prune:
+                self.prune()
+
+    def prune(self):
+        # Buang entri kedaluwarsa dan entri tertua di atas batas ukuran tabel
+        if self.db is None:
+            return
+        with self.db.transaction() as tx:
+            if self.ttl_seconds is not None:
+                tx.execute("DELETE FROM ai_cache WHERE created_at < ?", (self.clock() - self.ttl_seconds,))
+            tx.execute(
+                "DELETE FROM ai_cache WHERE key IN (SELECT key FROM ai_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_db_entries,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        if self.db is not None:
+            self.db.execute("DELETE FROM ai_cache")
+
+    def stats(self):
+        with self._lock:
+            hits = self.memory_hits + self.db_hits
+            total = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "hit_rate": hits / total if total else 0.0,
+                "memory_entries": len(self._lru),
+            }
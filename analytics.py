@@ -0,0 +1,148 @@
+# Agregat untuk Dashboard Analytics dan Learning Analytics. Tabel agg_* diperbarui secara inkremental
+# oleh trigger AFTER INSERT pada tabel sumber (lihat migrasi 5 di schema.py), sehingga dashboard hanya
+# membaca ringkasan berukuran kecil (per pengguna / per hari / per bucket skor), bukan tabel mentah.
+# rebuild_aggregates() menghitung ulang semuanya dari tabel sumber (backfill / perbaikan).
+import numpy as np
+import pandas as pd
+
+SCORE_BUCKET = 10  # lebar bucket histogram skor: 0-9, 10-19, ..., 100
+ACTIVITY_SOURCES = ("learning_logs", "discussions")
+
+AGGREGATE_TABLES = [
+    # Status terakhir per (user, modul) dan ringkasan penyelesaian per user
+    '''CREATE TABLE IF NOT EXISTS agg_progress_latest (user_id INTEGER, module TEXT, status TEXT, PRIMARY KEY (user_id, module))''',
+    '''CREATE TABLE IF NOT EXISTS agg_progress_user (user_id INTEGER PRIMARY KEY, modules INTEGER NOT NULL DEFAULT 0, completed INTEGER NOT NULL DEFAULT 0)''',
+    '''CREATE TABLE IF NOT EXISTS agg_attendance_user (user_id INTEGER PRIMARY KEY, total INTEGER NOT NULL DEFAULT 0, present INTEGER NOT NULL DEFAULT 0)''',
+    '''CREATE TABLE IF NOT EXISTS agg_evaluation_scores (competency TEXT, bucket INTEGER, n INTEGER NOT NULL DEFAULT 0, score_sum INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (competency, bucket))''',
+    '''CREATE TABLE IF NOT EXISTS agg_activity_daily (day TEXT, source TEXT, n INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (day, source))''',
+    '''CREATE TABLE IF NOT EXISTS agg_activity_user (user_id INTEGER, source TEXT, n INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, source))''',
+]
+
+# Status/skor kosong (mis. dari impor) harus aman: perbandingan status memakai IS (0/1, tidak pernah NULL)
+# dan evaluasi tanpa skor tidak masuk histogram. Modul kosong disimpan sebagai '' di agg_progress_latest,
+# karena NULL tidak pernah cocok dengan "module = ..." maupun ON CONFLICT (setiap baris jadi modul baru).
+# Baris tanpa user_id tidak masuk agregat per pengguna: NULL di kolom INTEGER PRIMARY KEY diganti rowid baru.
+AGGREGATE_TRIGGERS = [
+    '''CREATE TRIGGER IF NOT EXISTS trg_progress_agg AFTER INSERT ON progress WHEN NEW.user_id IS NOT NULL BEGIN
+        INSERT INTO agg_progress_user (user_id) VALUES (NEW.user_id) ON CONFLICT (user_id) DO NOTHING;
+        UPDATE agg_progress_user SET
+            modules = modules + NOT EXISTS (SELECT 1 FROM agg_progress_latest WHERE user_id = NEW.user_id AND module = COALESCE(NEW.module, '')),
+            completed = completed + (NEW.status IS 'Completed')
+                - COALESCE((SELECT status IS 'Completed' FROM agg_progress_latest WHERE user_id = NEW.user_id AND module = COALESCE(NEW.module, '')), 0)
+        WHERE user_id = NEW.user_id;
+        INSERT INTO agg_progress_latest (user_id, module, status) VALUES (NEW.user_id, COALESCE(NEW.module, ''), NEW.status)
+            ON CONFLICT (user_id, module) DO UPDATE SET status = excluded.status;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_attendance_agg AFTER INSERT ON attendance WHEN NEW.user_id IS NOT NULL BEGIN
+        INSERT INTO agg_attendance_user (user_id, total, present) VALUES (NEW.user_id, 1, NEW.status IS 'Hadir')
+            ON CONFLICT (user_id) DO UPDATE SET total = total + 1, present = present + (NEW.status IS 'Hadir');
+    END''',
+    f'''CREATE TRIGGER IF NOT EXISTS trg_evaluations_agg AFTER INSERT ON evaluations WHEN NEW.score IS NOT NULL BEGIN
+        INSERT INTO agg_evaluation_scores (competency, bucket, n, score_sum) VALUES (NEW.competency, NEW.score / {SCORE_BUCKET}, 1, NEW.score)
+            ON CONFLICT (competency, bucket) DO UPDATE SET n = n + 1, score_sum = score_sum + NEW.score;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_learning_logs_agg AFTER INSERT ON learning_logs BEGIN
+        INSERT INTO agg_activity_daily (day, source, n) VALUES (substr(NEW.timestamp, 1, 10), 'learning_logs', 1)
+            ON CONFLICT (day, source) DO UPDATE SET n = n + 1;
+        INSERT INTO agg_activity_user (user_id, source, n) SELECT NEW.user_id, 'learning_logs', 1 WHERE NEW.user_id IS NOT NULL
+            ON CONFLICT (user_id, source) DO UPDATE SET n = n + 1;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_discussions_agg AFTER INSERT ON discussions BEGIN
+        INSERT INTO agg_activity_daily (day, source, n) VALUES (substr(NEW.timestamp, 1, 10), 'discussions', 1)
+            ON CONFLICT (day, source) DO UPDATE SET n = n + 1;
+        INSERT INTO agg_activity_user (user_id, source, n) SELECT NEW.user_id, 'discussions', 1 WHERE NEW.user_id IS NOT NULL
+            ON CONFLICT (user_id, source) DO UPDATE SET n = n + 1;
+    END''',
+]
+
+
+def rebuild_aggregates(tx):
+    # Hitung ulang semua tabel agregat dari tabel sumber; dipakai sebagai langkah migrasi (backfill)
+    for table in ("agg_progress_latest", "agg_progress_user", "agg_attendance_user",
+                  "agg_evaluation_scores", "agg_activity_daily", "agg_activity_user"):
+        tx.execute(f"DELETE FROM {table}")
+    tx.execute('''INSERT INTO agg_progress_latest (user_id, module, status)
+                  SELECT p.user_id, COALESCE(p.module, ''), p.status FROM progress p
+                  JOIN (SELECT MAX(id) AS id FROM progress WHERE user_id IS NOT NULL GROUP BY user_id, COALESCE(module, '')) last ON p.id = last.id''')
+    tx.execute('''INSERT INTO agg_progress_user (user_id, modules, completed)
+                  SELECT user_id, COUNT(*), SUM(status IS 'Completed') FROM agg_progress_latest GROUP BY user_id''')
+    tx.execute('''INSERT INTO agg_attendance_user (user_id, total, present)
+                  SELECT user_id, COUNT(*), SUM(status IS 'Hadir') FROM attendance WHERE user_id IS NOT NULL GROUP BY user_id''')
+    tx.execute(f'''INSERT INTO agg_evaluation_scores (competency, bucket, n, score_sum)
+                   SELECT competency, score / {SCORE_BUCKET}, COUNT(*), SUM(score) FROM evaluations
+                   WHERE score IS NOT NULL GROUP BY competency, score / {SCORE_BUCKET}''')
+    for source in ACTIVITY_SOURCES:
+        tx.execute(f'''INSERT INTO agg_activity_daily (day, source, n)
+                       SELECT substr(timestamp, 1, 10), '{source}', COUNT(*) FROM {source} GROUP BY substr(timestamp, 1, 10)''')
+        tx.execute(f'''INSERT INTO agg_activity_user (user_id, source, n)
+                       SELECT user_id, '{source}', COUNT(*) FROM {source} WHERE user_id IS NOT NULL GROUP BY user_id''')
+
+
+# Pembacaan ringkasan. cache: QueryCache. Hasil akhir (setelah pengolahan pandas/NumPy) di-cache dengan
+# tabel sumbernya sebagai kunci invalidasi, karena INSERT ke tabel sumber (lewat trigger) yang mengubah
+# agregatnya.
+def progress_summary(cache):
+    def load():
+        df = cache.db.read_sql("SELECT user_id, modules, completed FROM agg_progress_user")
+        modules = df["modules"].to_numpy(dtype=float)
+        df["completion_rate"] = np.divide(df["completed"].to_numpy(dtype=float), modules,
+                                          out=np.zeros_like(modules), where=modules > 0)
+        return df
+    return cache.get_or_load("progress", ("progress_summary",), load)
+
+
+def attendance_summary(cache):
+    def load():
+        df = cache.db.read_sql("SELECT user_id, total, present FROM agg_attendance_user")
+        total = df["total"].to_numpy(dtype=float)
+        df["attendance_rate"] = np.divide(df["present"].to_numpy(dtype=float), total,
+                                          out=np.zeros_like(total), where=total > 0)
+        return df
+    return cache.get_or_load("attendance", ("attendance_summary",), load)
+
+
+def _bucket_label(bucket):
+    low = int(bucket) * SCORE_BUCKET
+    return f"{low}-{min(low + SCORE_BUCKET - 1, 100)}"
+
+
+def score_distribution(cache):
+    # Kembalikan (histogram skor semua kompetensi, ringkasan per kompetensi: n, rata-rata, bucket median)
+    def load():
+        df = cache.db.read_sql("SELECT competency, bucket, n, score_sum FROM agg_evaluation_scores ORDER BY competency, bucket")
+        histogram = df.groupby("bucket")["n"].sum().sort_index()
+        histogram.index = [_bucket_label(b) for b in histogram.index]
+        rows = []
+        for competency, group in df.groupby("competency", sort=True):
+            cumulative = np.cumsum(group["n"].to_numpy())
+            median_bucket = group["bucket"].to_numpy()[np.searchsorted(cumulative, cumulative[-1] / 2)]
+            rows.append({
+                "competency": competency,
+                "n": int(cumulative[-1]),
+                "mean_score": group["score_sum"].sum() / cumulative[-1],
+                "median_bucket": _bucket_label(median_bucket),
+            })
+        return histogram, pd.DataFrame(rows, columns=["competency", "n", "mean_score", "median_bucket"])
+    return cache.get_or_load("evaluations", ("score_distribution",), load)
+
+
+def activity_daily(cache, days=30):
+    # Aktivitas per hari (baris) per sumber (kolom) untuk N hari terakhir yang tercatat
+    def load():
+        df = cache.db.read_sql("SELECT day, source, n FROM agg_activity_daily WHERE day IN "
+                               "(SELECT DISTINCT day FROM agg_activity_daily ORDER BY day DESC LIMIT ?)", params=(days,))
+        if df.empty:
+            return df
+        return df.pivot_table(index="day", columns="source", values="n", aggfunc="sum", fill_value=0).sort_index()
+    return cache.get_or_load(ACTIVITY_SOURCES, ("activity_daily", days), load)
+
+
+def activity_by_user(cache, limit=10):
+    def load():
+        df = cache.db.read_sql("SELECT user_id, source, n FROM agg_activity_user")
+        if df.empty:
+            return df
+        table = df.pivot_table(index="user_id", columns="source", values="n", aggfunc="sum", fill_value=0)
+        table["total"] = table.to_numpy().sum(axis=1)
+        return table.sort_values("total", ascending=False).head(limit)
+    return cache.get_or_load(ACTIVITY_SOURCES, ("activity_by_user", limit), load)
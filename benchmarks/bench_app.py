@@ -0,0 +1,354 @@
+# Benchmark beban aplikasi lewat AppTest Streamlit, tanpa browser dan tanpa API Gemini (model stub).
+# Database sementara diisi data sintetis (--rows baris untuk tabel bervolume tinggi), lalu N pengguna
+# simulasi (proses, masing-masing satu sesi AppTest) menjalankan skrip sesi yang sama: membuka setiap
+# menu sidebar, setiap sub fitur, dan melakukan interaksi umum (cari, komentar, post, pesan, analisis AI).
+#
+# Diukur: latensi per interaksi (p50/p95), query SQLite per rerun (dari metrics.py), puncak memori (RSS),
+# dan throughput interaksi per detik. Hasil ditambahkan ke benchmarks/results/bench_app.jsonl dan
+# dibandingkan dengan hasil terakhir berkonfigurasi sama (rows, users) untuk mendeteksi regresi.
+#
+#   python benchmarks/bench_app.py                          # 10 ribu baris, 1 pengguna
+#   python benchmarks/bench_app.py --rows 1000000 --users 8 --iterations 3
+#   python benchmarks/bench_app.py --fail-on-regression     # exit 1 jika p50 memburuk > --threshold
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+APP = os.path.join(ROOT, "Kalam.py")
+RESULTS = os.path.join(ROOT, "benchmarks", "results", "bench_app.jsonl")
+
+# (judul menu, file halaman), urut seperti sidebar
+PAGES = [
+    ("Home", "views/home.py"),
+    ("Pencarian", "views/pencarian.py"),
+    ("1. Pembelajaran Klinis & Kasus", "views/klinis.py"),
+    ("2. Asesmen & Evaluasi", "views/asesmen.py"),
+    ("3. Komunikasi & Kolaborasi", "views/komunikasi.py"),
+    ("4. Manajemen Konten", "views/konten.py"),
+    ("5. Monitoring & Tracking", "views/monitoring.py"),
+    ("6. Laboratorium Virtual/Simulasi", "views/laboratorium.py"),
+    ("7. Manajemen Pengguna", "views/pengguna.py"),
+    ("8. Dukungan Teknis", "views/dukungan.py"),
+]
+
+WORDS = ("كلام", "محادثة", "طالب", "مدرسة", "kalam", "nahwu", "sharaf", "muhadatsah", "latihan", "dialog",
+         "perkenalan", "keluarga", "pasar", "kosakata", "mufradat", "qiraah", "istima", "kitabah", "evaluasi")
+
+
+# --- Data sintetis ---
+
+def _text(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(db, rows, rng):
+    # Tabel bervolume tinggi mendapat `rows` baris; tabel teks yang diindeks FTS sepersepuluhnya,
+    # tabel induk (kasus, forum, tugas) jauh lebih sedikit agar daftar pilihannya tetap wajar.
+    from blobstore import BlobStore
+    from search import index_material
+
+    users = max(50, rows // 100)
+    cases, forums, assignments = max(100, rows // 100), max(5, rows // 1000), 20
+    texts = max(100, rows // 10)
+    stamp = "2025-01-01T08:00:00"
+
+    def user(i):
+        return i % users + 1
+
+    db.executemany("INSERT INTO cases (title, description, user_id) VALUES (?, ?, ?)",
+                   ((f"Kasus {i}", _text(rng, 30), user(i)) for i in range(cases)))
+    db.executemany("INSERT INTO forums (topic, user_id) VALUES (?, ?)", ((f"Forum {i}: {_text(rng, 3)}", user(i)) for i in range(forums)))
+    db.executemany("INSERT INTO assignments (title, description, due_date, user_id) VALUES (?, ?, ?, ?)",
+                   ((f"Tugas {i}", _text(rng), "2025-06-01", 1) for i in range(assignments)))
+    db.executemany("INSERT INTO simulations (title, description) VALUES (?, ?)", ((f"Simulasi {i}", _text(rng)) for i in range(10)))
+
+    db.executemany("INSERT INTO attendance (user_id, date, status) VALUES (?, ?, ?)",
+                   ((user(i), f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "Hadir" if i % 7 else "Absen") for i in range(rows)))
+    db.executemany("INSERT INTO evaluations (user_id, competency, score) VALUES (?, ?, ?)",
+                   ((user(i), rng.choice(("Istima", "Kalam", "Qiraah", "Kitabah")), rng.randint(40, 100)) for i in range(rows)))
+    db.executemany("INSERT INTO progress (user_id, module, status) VALUES (?, ?, ?)",
+                   ((user(i), f"Modul {i % 40 + 1}", "Completed" if i % 3 else "In Progress") for i in range(rows)))
+    db.executemany("INSERT INTO notifications (user_id, message, timestamp) VALUES (?, ?, ?)",
+                   ((user(i), _text(rng, 6), stamp) for i in range(rows)))
+    # Sebagian pesan adalah percakapan user 1 <-> 2 (percakapan yang dibuka sesi benchmark)
+    db.executemany("INSERT INTO messages (from_user, to_user, content, timestamp) VALUES (?, ?, ?, ?)",
+                   (((1, 2) if i % 10 == 0 else (2, 1) if i % 10 == 1 else (user(i), user(i + 1))) + (_text(rng, 8), stamp)
+                    for i in range(rows)))
+
+    db.executemany("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (?, ?, ?, ?)",
+                   ((i % cases + 1, user(i), _text(rng), stamp) for i in range(texts)))
+    db.executemany("INSERT INTO forum_posts (forum_id, user_id, content, timestamp) VALUES (?, ?, ?, ?)",
+                   ((i % forums + 1, user(i), _text(rng), stamp) for i in range(texts)))
+    db.executemany("INSERT INTO learning_logs (user_id, case_id, log, timestamp) VALUES (?, ?, ?, ?)",
+                   ((user(i), i % cases + 1, _text(rng), stamp) for i in range(texts)))
+    db.executemany("INSERT INTO reports (user_id, content, timestamp) VALUES (?, ?, ?)", ((user(i), _text(rng, 40), stamp) for i in range(texts)))
+    db.executemany("INSERT INTO submissions (assignment_id, user_id, content, timestamp) VALUES (?, ?, ?, ?)",
+                   ((i % assignments + 1, user(i), _text(rng, 20), stamp) for i in range(texts)))
+
+    blobs = BlobStore()
+    for i in range(min(500, max(10, rows // 100))):
+        title, content = f"Materi {i}", _text(rng, 200)
+        sha, size = blobs.put_bytes(content.encode("utf-8"))
+        with db.transaction() as tx:
+            material_id = db.execute("INSERT INTO materials (title, type, blob_sha, size) VALUES (?, ?, ?, ?)", (title, "text/markdown", sha, size))
+            index_material(tx, material_id, title, content)
+
+
+# --- Skrip sesi ---
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def _fill_and_click(fields, button):
+    # fields: [(jenis widget, label, nilai)]; lalu klik tombol berlabel `button`
+    def action(at):
+        for kind, label, value in fields:
+            _widget(getattr(at, kind), label).set_value(value)
+        return _widget(at.button, button).click().run()
+    return action
+
+
+# Interaksi per (halaman, sub fitur), dijalankan setelah sub fitur itu dibuka
+ACTIONS = {
+    ("views/pencarian.py", None): [
+        ("cari", lambda at: _widget(at.text_input, "Kata kunci").set_value("kalam latihan").run()),
+    ],
+    ("views/klinis.py", "Diskusi Kasus"): [
+        ("halaman berikutnya", lambda at: at.button(key="cases_next").click().run()),
+        ("komentar", _fill_and_click([("text_area", "Tambah Komentar", "komentar benchmark")], "Kirim Komentar")),
+        ("analisis AI", lambda at: _widget(at.button, "Analisis Kasus dengan Gemini AI").click().run()),
+    ],
+    ("views/asesmen.py", "Evaluasi Kompetensi"): [
+        ("simpan evaluasi", _fill_and_click([("text_input", "Kompetensi", "Kalam"), ("number_input", "Skor", 80)], "Simpan Evaluasi")),
+    ],
+    ("views/komunikasi.py", "Forum Diskusi"): [
+        ("post forum", _fill_and_click([("text_area", "Tambah Post", "post benchmark")], "Kirim Post")),
+    ],
+    ("views/komunikasi.py", "Chat/Pesan Langsung"): [
+        ("kirim pesan", _fill_and_click([("number_input", "Kirim ke User ID", 2), ("text_area", "Pesan", "pesan benchmark")], "Kirim Pesan")),
+    ],
+    ("views/monitoring.py", "Progress Tracking"): [
+        ("update progress", _fill_and_click([("text_input", "Modul", "Modul 1")], "Update Progress")),
+    ],
+}
+
+
+def run_session(at, record):
+    # Satu sesi: setiap menu, setiap sub fitur, dan interaksi di ACTIONS. record(label, detik, error)
+    def step(label, action):
+        started = time.perf_counter()
+        try:
+            action(at)
+            error = at.exception[0].message if at.exception else None
+        except Exception as e:  # widget tidak ditemukan, timeout, dll. dicatat sebagai error langkah ini
+            error = f"{type(e).__name__}: {e}"
+        record(label, time.perf_counter() - started, error)
+
+    for title, page_file in PAGES:
+        step(title, lambda at: at.switch_page(page_file).run())
+        boxes = [s for s in at.selectbox if s.label == "Pilih Sub Fitur"]
+        subpages = list(boxes[0].options) if boxes else [None]
+        for i, subpage in enumerate(subpages):
+            if i:
+                step(f"{title} / {subpage}", lambda at: _widget(at.selectbox, "Pilih Sub Fitur").select(subpage).run())
+            for name, action in ACTIONS.get((page_file, subpage), []):
+                step(f"{title} / {subpage or title}: {name}", action)
+
+
+def user_worker(iterations):
+    # Dijalankan di proses terpisah (satu per pengguna simulasi): satu sesi pemanasan (impor modul,
+    # pembuatan sumber daya bersama) lalu `iterations` sesi terukur; hasil dicetak sebagai JSON
+    from streamlit.testing.v1 import AppTest
+
+    from common import get_metrics  # objek Metrics yang sama dengan yang dipakai aplikasi (cache_resource)
+
+    at = AppTest.from_file(APP, default_timeout=300)
+    run_session(at, lambda *sample: None)
+    metrics = get_metrics()
+    metrics.reset()
+    samples = []
+    started = time.time()
+    for _ in range(iterations):
+        run_session(at, lambda label, seconds, error: samples.append((label, seconds, error)))
+    print(json.dumps({"samples": samples, "runs": metrics.runs(), "started": started, "finished": time.time(),
+                      "peak_rss_mb": peak_rss_mb()}))
+
+
+def run_users(users, iterations):
+    # Pengguna simulasi = proses terpisah yang berbagi file database (WAL), dijalankan bersamaan.
+    # AppTest memakai state global Streamlit sehingga tidak bisa dijalankan paralel di thread.
+    command = [sys.executable, os.path.abspath(__file__), "--worker", str(iterations)]
+    workers = [subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, cwd=ROOT) for _ in range(users)]
+    reports = []
+    for worker in workers:
+        out, _ = worker.communicate()
+        if worker.returncode:
+            raise RuntimeError(f"Worker benchmark gagal (exit {worker.returncode})")
+        reports.append(json.loads(out.strip().splitlines()[-1]))
+    return reports
+
+
+# --- Ringkasan dan perbandingan ---
+
+def _percentiles(values):
+    values = np.asarray(values, dtype=float)
+    return {"n": len(values), "mean": float(values.mean()), "p50": float(np.percentile(values, 50)), "p95": float(np.percentile(values, 95))}
+
+
+def summarize(reports):
+    samples = [sample for report in reports for sample in report["samples"]]
+    runs = [run for report in reports for run in report["runs"]]
+    # Throughput atas rentang waktu saat semua pengguna berjalan (tanpa startup dan pemanasan worker)
+    wall_seconds = max(r["finished"] for r in reports) - min(r["started"] for r in reports)
+    steps = defaultdict(list)
+    errors = defaultdict(list)
+    for label, seconds, error in samples:
+        steps[label].append(seconds)
+        if error:
+            errors[label].append(error)
+    pages = defaultdict(list)
+    for run in runs:
+        pages[run["page"]].append(run)
+    per_page = {}
+    for page, page_runs in pages.items():
+        per_page[page] = {
+            "reruns": len(page_runs),
+            "queries_mean": float(np.mean([r.get("queries", 0) for r in page_runs])),
+            "queries_max": int(max(r.get("queries", 0) for r in page_runs)),
+            **{f"{part}_mean": float(np.mean([r[part] for r in page_runs])) for part in ("seconds", "sql", "write", "read_sql", "gemini", "other")},
+        }
+    latencies = [seconds for _, seconds, _ in samples]
+    return {
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in reports),
+        "interactions": len(samples),
+        "errors": sum(len(e) for e in errors.values()),
+        "wall_seconds": wall_seconds,
+        "interactions_per_second": len(samples) / wall_seconds if wall_seconds else None,
+        "latency": _percentiles(latencies) if latencies else None,
+        "queries_per_rerun": float(np.mean([r.get("queries", 0) for r in runs])) if runs else None,
+        "steps": {label: _percentiles(values) for label, values in steps.items()},
+        "pages": per_page,
+        "error_samples": {label: messages[0] for label, messages in errors.items()},
+    }
+
+
+def load_baseline(path, rows, users):
+    # Hasil terakhir di riwayat dengan konfigurasi yang sama
+    if not os.path.exists(path):
+        return None
+    baseline = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            result = json.loads(line)
+            if result["rows"] == rows and result["users"] == users:
+                baseline = result
+    return baseline
+
+
+def compare(baseline, result, threshold):
+    # Cetak perubahan p50 per langkah; kembalikan daftar langkah yang memburuk lebih dari threshold
+    print(f"\nDibandingkan dengan {baseline['commit'] or '?'} ({time.strftime('%Y-%m-%d %H:%M', time.localtime(baseline['at']))}):")
+    regressions = []
+    for label, stats in result["steps"].items():
+        before = baseline["steps"].get(label)
+        if not before or not before["p50"]:
+            continue
+        change = stats["p50"] / before["p50"] - 1
+        if change > threshold:
+            regressions.append(label)
+        marker = "  <-- regresi" if change > threshold else ""
+        print(f"{label[:60]:60} {before['p50'] * 1000:9.1f} -> {stats['p50'] * 1000:9.1f} ms ({change:+.0%}){marker}")
+    for key in ("interactions_per_second", "queries_per_rerun", "peak_rss_mb"):
+        if baseline.get(key) and result.get(key):
+            print(f"{key:60} {baseline[key]:9.1f} -> {result[key]:9.1f}    ({result[key] / baseline[key] - 1:+.0%})")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        user_worker(int(sys.argv[2]))
+        return
+    parser = argparse.ArgumentParser(description="Benchmark beban aplikasi dengan AppTest dan model Gemini stub")
+    parser.add_argument("--rows", type=int, default=10_000, help="baris per tabel bervolume tinggi")
+    parser.add_argument("--users", type=int, default=1, help="jumlah pengguna simulasi bersamaan")
+    parser.add_argument("--iterations", type=int, default=2, help="jumlah sesi terukur per pengguna")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--results", default=RESULTS, help="file riwayat hasil (JSON Lines)")
+    parser.add_argument("--no-save", action="store_true", help="jangan tambahkan hasil ke riwayat")
+    parser.add_argument("--threshold", type=float, default=0.2, help="kenaikan p50 yang dianggap regresi (0.2 = 20%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="kalam_bench_")
+    # Diwarisi worker; harus di-set sebelum modul aplikasi diimpor (storage, blobstore, common membaca env saat impor)
+    os.environ["KALAM_DB_PATH"] = os.path.join(tmp, "bench.db")
+    os.environ["KALAM_BLOB_DIR"] = os.path.join(tmp, "blobs")
+    os.environ["KALAM_GEMINI_STUB"] = "1"
+    os.environ.setdefault("KALAM_METRICS_RING", "1000000")
+
+    from schema import migrate
+    from storage import ConnectionPool
+
+    started = time.perf_counter()
+    db = ConnectionPool(os.environ["KALAM_DB_PATH"])
+    migrate(db)
+    seed(db, args.rows, random.Random(args.seed))
+    db.close_all()
+    seed_seconds = time.perf_counter() - started
+    rss_after_seed = peak_rss_mb()
+    print(f"Data sintetis: {args.rows} baris/tabel dalam {seed_seconds:.1f} detik", file=sys.stderr)
+
+    result = {"at": time.time(), "commit": git_commit(), "rows": args.rows, "users": args.users, "iterations": args.iterations,
+              "seed_seconds": seed_seconds, "rss_after_seed_mb": rss_after_seed, **summarize(run_users(args.users, args.iterations))}
+    shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"\n{'Langkah':60} {'n':>4} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for label, stats in result["steps"].items():
+        print(f"{label[:60]:60} {stats['n']:>4} {stats['p50'] * 1000:9.1f} {stats['p95'] * 1000:9.1f}")
+    print(f"\n{'Halaman':34} {'rerun':>6} {'query/rerun':>12} {'maks':>5} {'rerun (ms)':>11}")
+    for page, stats in result["pages"].items():
+        print(f"{str(page)[:34]:34} {stats['reruns']:>6} {stats['queries_mean']:12.1f} {stats['queries_max']:>5} {stats['seconds_mean'] * 1000:11.1f}")
+    print(f"\n{result['interactions']} interaksi, {result['errors']} error, {result['interactions_per_second']:.1f} interaksi/detik, "
+          f"p50 {result['latency']['p50'] * 1000:.1f} ms, p95 {result['latency']['p95'] * 1000:.1f} ms, "
+          f"puncak RSS per pengguna {result['peak_rss_mb']:.0f} MB")
+    for label, message in result["error_samples"].items():
+        print(f"ERROR {label}: {message}")
+
+    regressions = []
+    baseline = load_baseline(args.results, args.rows, args.users)
+    if baseline:
+        regressions = compare(baseline, result, args.threshold)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
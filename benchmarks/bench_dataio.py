@@ -0,0 +1,69 @@
+# Benchmark impor/ekspor massal (dataio.py) untuk riwayat absensi besar: membuat CSV berisi N baris
+# secara streaming, mengimpornya, lalu mengekspor kembali ke CSV dan Parquet. Puncak memori (RSS)
+# dicatat untuk menunjukkan bahwa memori tidak tumbuh mengikuti jumlah baris.
+#
+#   python benchmarks/bench_dataio.py                 # 1 juta baris
+#   python benchmarks/bench_dataio.py --rows 10000000
+import argparse
+import csv
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dataio import export_table, import_table  # noqa: E402
+from schema import migrate  # noqa: E402
+from storage import ConnectionPool  # noqa: E402
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def write_attendance_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user_id", "date", "status"])
+        for i in range(rows):
+            writer.writerow([i % 500 + 1, f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", "Hadir" if i % 7 else "Absen"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--skip-parquet", action="store_true")
+    args = parser.parse_args()
+
+    results = {"rows": args.rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "attendance.csv")
+        write_attendance_csv(source, args.rows)
+        results["rss_after_generate_mb"] = peak_rss_mb()
+
+        db = ConnectionPool(os.path.join(tmp, "bench.db"))
+        migrate(db)
+        with open(source, "rb") as f:
+            report = import_table(db, "attendance", f)
+        results["import_seconds"] = report["seconds"]
+        results["import_rows_per_second"] = report["rows"] / report["seconds"]
+        results["rss_after_import_mb"] = peak_rss_mb()
+
+        for fmt in ("csv",) if args.skip_parquet else ("csv", "parquet"):
+            with open(os.path.join(tmp, f"export.{fmt}"), "wb") as f:
+                started = time.perf_counter()
+                report = export_table(db, "attendance", f, fmt)
+            results[f"export_{fmt}_seconds"] = time.perf_counter() - started
+            results[f"export_{fmt}_mb"] = os.path.getsize(f.name) / 1e6
+            results[f"rss_after_export_{fmt}_mb"] = peak_rss_mb()
+        results["aggregate_users"] = db.scalar("SELECT COUNT(*) FROM agg_attendance_user")
+        db.close_all()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
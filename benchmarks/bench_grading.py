@@ -0,0 +1,62 @@
+# Benchmark throughput penilaian AI massal (grading.py) terhadap model tiruan lokal dengan latensi tetap.
+# Setiap konfigurasi memakai database sementara berisi N submission yang belum dinilai.
+#
+#   python benchmarks/bench_grading.py
+#   python benchmarks/bench_grading.py --submissions 500 --delay 0.2 --concurrency 1 4 8 --batch 1 8
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from grading import fake_grader, grade_submissions  # noqa: E402
+from llm import GeminiExecutor, StubModel  # noqa: E402
+from schema import migrate  # noqa: E402
+from storage import ConnectionPool  # noqa: E402
+
+SAMPLE = "أَنَا طَالِبٌ فِي الْمَدْرَسَةِ. أُحِبُّ اللُّغَةَ الْعَرَبِيَّةَ وَأَتَكَلَّمُ مَعَ أَصْدِقَائِي كُلَّ يَوْمٍ."
+
+
+def seed(db, n):
+    assignment_id = db.execute("INSERT INTO assignments (title, description, due_date, user_id) VALUES (?, ?, ?, ?)",
+                               ("Kalam: perkenalan diri", "Tulis dialog perkenalan", "2025-01-01", 1))
+    db.executemany("INSERT INTO submissions (assignment_id, user_id, content, timestamp) VALUES (?, ?, ?, ?)",
+                   [(assignment_id, i, SAMPLE * (1 + i % 5), "2025-01-01T00:00:00") for i in range(n)])
+    return assignment_id
+
+
+def bench(n, delay, concurrency, batch):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionPool(os.path.join(tmp, "bench.db"))
+        migrate(db)
+        assignment_id = seed(db, n)
+        model = StubModel(fake_grader, model_name="fake-grader", delay=delay)
+        executor = GeminiExecutor(max_workers=concurrency)
+        try:
+            report = grade_submissions(db, model, executor, assignment_id, concurrency=concurrency, max_items=batch)
+        finally:
+            executor.shutdown()
+            db.close_all()
+    return {"concurrency": concurrency, "batch": batch, **report}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.1, help="latensi model tiruan per permintaan (detik)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+
+    results = [bench(args.submissions, args.delay, c, b) for b in args.batch for c in args.concurrency]
+    print(f"{'paralel':>8} {'per req':>8} {'dinilai':>8} {'req':>6} {'detik':>8} {'sub/detik':>10}")
+    for r in results:
+        print(f"{r['concurrency']:>8} {r['batch']:>8} {r['graded']:>8} {r['requests']:>6} {r['seconds']:>8.2f} {r['submissions_per_second']:>10.1f}")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# Benchmark indeks vektor retrieval.py: kecepatan embedding lokal (HashingEmbedder), latensi query
+# brute force vs IVF, dan recall@k IVF terhadap brute force, untuk korpus potongan sintetis.
+# Tahap kedua mengukur jalur lengkap Retriever (sync dari database sementara + retrieve).
+#
+#   python benchmarks/bench_retrieval.py                    # 100 ribu potongan
+#   python benchmarks/bench_retrieval.py --chunks 20000 --nprobe 4 8 16
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from retrieval import CHUNK_WORDS, HashingEmbedder, Retriever, VectorIndex  # noqa: E402
+from schema import migrate  # noqa: E402
+from storage import ConnectionPool  # noqa: E402
+
+WORDS = ("كلام", "محادثة", "طالب", "مدرسة", "بيت", "سوق", "kalam", "nahwu", "sharaf", "muhadatsah", "latihan",
+         "dialog", "perkenalan", "keluarga", "pasar", "kosakata", "mufradat", "qiraah", "istima", "kitabah",
+         "evaluasi", "guru", "murid", "kelas", "percakapan", "tata", "bahasa", "kalimat", "fiil", "isim")
+
+
+def corpus(n, rng):
+    # Setiap potongan bertopik: sebagian kata dari kosakata topiknya sendiri agar ada struktur yang bisa dicari
+    topics = [rng.sample(WORDS, 6) + [f"topik{t}"] for t in range(200)]
+    return [" ".join(rng.choice(topics[i % 200]) if rng.random() < 0.5 else rng.choice(WORDS) for _ in range(CHUNK_WORDS))
+            for i in range(n)]
+
+
+def query_latency(index, queries, k):
+    latencies, results = [], []
+    for q in queries:
+        started = time.perf_counter()
+        results.append([chunk_id for chunk_id, _ in index.search(q, k)])
+        latencies.append(time.perf_counter() - started)
+    return np.array(latencies) * 1000, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chunks", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=4)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--db-rows", type=int, default=20_000, help="baris diskusi untuk tahap Retriever (0 = lewati)")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    texts = corpus(args.chunks, rng)
+    embedder = HashingEmbedder()
+    started = time.perf_counter()
+    vectors = embedder.embed(texts)
+    embed_seconds = time.perf_counter() - started
+    queries = embedder.embed([" ".join(rng.sample(WORDS, 4)) for _ in range(args.queries)], query=True)
+    results = {"chunks": args.chunks, "dim": embedder.dim, "embed_chunks_per_second": args.chunks / embed_seconds}
+
+    ids = np.arange(1, args.chunks + 1)
+    brute = VectorIndex(embedder.dim, ivf_min=args.chunks + 1)
+    brute.add(ids, np.ones(args.chunks), ids, vectors)
+    latencies, exact = query_latency(brute, queries, args.k)
+    results["brute"] = {"p50_ms": float(np.percentile(latencies, 50)), "p95_ms": float(np.percentile(latencies, 95))}
+
+    for nprobe in args.nprobe:
+        ivf = VectorIndex(embedder.dim, ivf_min=1, nprobe=nprobe)
+        started = time.perf_counter()
+        ivf.add(ids, np.ones(args.chunks), ids, vectors)
+        train_seconds = time.perf_counter() - started
+        latencies, approx = query_latency(ivf, queries, args.k)
+        recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact) if e])
+        results[f"ivf_nprobe_{nprobe}"] = {"p50_ms": float(np.percentile(latencies, 50)), "p95_ms": float(np.percentile(latencies, 95)),
+                                           "recall": float(recall), "train_seconds": train_seconds}
+
+    if args.db_rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = ConnectionPool(os.path.join(tmp, "bench.db"))
+            migrate(db)
+            db.executemany("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (?, ?, ?, ?)",
+                           [(i % 100 + 1, 1, text, "2025-01-01") for i, text in enumerate(texts[:args.db_rows])])
+            retriever = Retriever(db, embedder)
+            started = time.perf_counter()
+            retriever.sync()
+            results["retriever_sync_rows_per_second"] = args.db_rows / (time.perf_counter() - started)
+            db.execute("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (?, ?, ?, ?)", (1, 1, texts[0], "2025-01-02"))
+            latencies = []
+            for _ in range(50):
+                started = time.perf_counter()
+                retriever.retrieve(" ".join(rng.sample(WORDS, 4)))
+                latencies.append((time.perf_counter() - started) * 1000)
+            results["retriever_retrieve_p50_ms"] = float(np.percentile(latencies, 50))
+            db.close_all()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Benchmark waktu startup (cold start) dan rerun per halaman menggunakan AppTest Streamlit.
+# Setiap halaman diukur di proses baru agar cold start (impor modul, pembuatan sumber daya) terlihat.
+#
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --baseline /tmp/Kalam_lama.py   # bandingkan dengan versi satu-file
+#
+# Versi satu-file bisa diambil dari riwayat git, mis. `git show <commit>:Kalam.py > /tmp/Kalam_lama.py`.
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "Kalam.py")
+
+_PAGE = re.compile(r'st\.Page\(\s*"([^"]+)"\s*,\s*title="([^"]+)"')
+
+
+def registered_pages(app=APP):
+    # (judul menu, file halaman) untuk setiap st.Page di daftar st.navigation Kalam.py
+    with open(app, encoding="utf-8") as f:
+        return [(title, page_file) for page_file, title in _PAGE.findall(f.read())]
+
+
+PAGES = registered_pages()
+
+
+def worker(app, title, page_file, reruns, multipage):
+    # Dijalankan di proses terpisah: ukur satu halaman lalu cetak hasilnya sebagai JSON
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=120)
+    at.secrets["GEMINI_API_KEY"] = "bench"
+    started = time.perf_counter()
+    if multipage:
+        at.switch_page(page_file).run()
+    else:
+        at.run()
+        if title not in at.sidebar.selectbox[0].options:
+            # Halaman yang belum ada di versi satu-file
+            print(json.dumps({"page": title, "skipped": True}))
+            return
+        at.sidebar.selectbox[0].select(title).run()
+    cold = time.perf_counter() - started
+    warm = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        warm.append(time.perf_counter() - started)
+    print(json.dumps({
+        "page": title,
+        "cold_seconds": cold,
+        "rerun_median_seconds": statistics.median(warm) if warm else None,
+        "gemini_sdk_loaded": "google.generativeai" in sys.modules,
+        "error": str(at.exception[0].message) if at.exception else None,
+    }))
+
+
+def measure(app, reruns, multipage):
+    results = []
+    for title, page_file in PAGES:
+        env = dict(os.environ)
+        env.setdefault("KALAM_DB_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+        env.setdefault("KALAM_BLOB_DIR", tempfile.mkdtemp())
+        env["PYTHONPATH"] = os.pathsep.join([ROOT, env.get("PYTHONPATH", "")])
+        out = subprocess.run(
+            [sys.executable, __file__, "--worker", app, title, page_file, str(reruns), "1" if multipage else "0"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(app)), env=env, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        if not result.get("skipped"):
+            results.append(result)
+    return results
+
+
+def print_table(label, results):
+    print(f"\n{label}")
+    print(f"{'Halaman':34} {'cold (ms)':>10} {'rerun (ms)':>11}  SDK Gemini")
+    for r in results:
+        rerun = f"{r['rerun_median_seconds'] * 1000:11.1f}" if r["rerun_median_seconds"] is not None else f"{'-':>11}"
+        flag = "ya" if r["gemini_sdk_loaded"] else "tidak"
+        error = f"  ERROR: {r['error']}" if r["error"] else ""
+        print(f"{r['page']:34} {r['cold_seconds'] * 1000:10.1f} {rerun}  {flag}{error}")
+    cold = statistics.mean(r["cold_seconds"] for r in results)
+    reruns = [r["rerun_median_seconds"] for r in results if r["rerun_median_seconds"] is not None]
+    print(f"{'Rata-rata':34} {cold * 1000:10.1f} {statistics.mean(reruns) * 1000 if reruns else 0:11.1f}")
+    return cold
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        app, title, page_file, reruns, multipage = sys.argv[2:7]
+        worker(app, title, page_file, int(reruns), multipage == "1")
+        return
+    parser = argparse.ArgumentParser(description="Benchmark cold start dan rerun per halaman")
+    parser.add_argument("--reruns", type=int, default=5, help="jumlah rerun hangat per halaman")
+    parser.add_argument("--baseline", help="path ke Kalam.py versi satu-file untuk pembanding")
+    args = parser.parse_args()
+
+    current = print_table("Multipage (sekarang)", measure(APP, args.reruns, multipage=True))
+    if args.baseline:
+        baseline = print_table("Satu-file (baseline)", measure(os.path.abspath(args.baseline), args.reruns, multipage=False))
+        print(f"\nCold start rata-rata: {baseline * 1000:.1f} ms -> {current * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
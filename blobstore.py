@@ -0,0 +1,134 @@
+# Penyimpanan isi file (materi, upload) di luar database, dialamatkan dengan hash SHA-256 isinya.
+# File ditulis per potongan sambil di-hash, lalu dipindahkan secara atomik ke blobs/ab/cd/<sha256>;
+# isi yang sama hanya disimpan sekali. Tabel materials cukup menyimpan metadata dan blob_sha.
+# Untuk ditampilkan, blob dipublikasikan ke static/media/ (server.enableStaticServing) sehingga browser
+# mengambilnya langsung dari disk per potongan/Range, tanpa dimuat ke memori proses Streamlit.
+#
+# Perhatian: file yang dipublikasikan bersifat publik. Siapa pun yang memegang URL /app/static/media/<sha>
+# bisa mengunduhnya tanpa login (sha tidak bisa ditebak, tetapi URL bisa dibagikan). Karena itu hanya
+# materi yang sedang ditampilkan yang dipublikasikan, dan prune_published() menghapus publikasi blob yang
+# tidak lagi dipakai materi mana pun (dipanggil saat startup, lihat common.get_blob_store).
+import hashlib
+import os
+import shutil
+import tempfile
+
+BLOB_DIR = os.environ.get("KALAM_BLOB_DIR", "blobs")
+CHUNK_SIZE = 1024 * 1024
+# Folder static/ harus bersebelahan dengan Kalam.py agar disajikan Streamlit di /app/static/
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_MAX_SIZE = 200 * 1024 * 1024  # batas ukuran file yang mau disajikan static serving Streamlit
+
+
+class BlobStore:
+    def __init__(self, root=BLOB_DIR, chunk_size=CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(os.path.join(self.root, "tmp"), exist_ok=True)
+
+    def path(self, sha):
+        return os.path.join(self.root, sha[:2], sha[2:4], sha)
+
+    def put_stream(self, fileobj):
+        # Tulis isi fileobj per potongan; kembalikan (sha256, ukuran dalam byte)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = fileobj.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha = digest.hexdigest()
+            target = self.path(sha)
+            if os.path.exists(target):
+                # Deduplikasi: isi yang sama sudah tersimpan
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return sha, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_bytes(self, data):
+        return self.put_stream(_BytesReader(data))
+
+    def publish(self, sha, extension="", static_dir=STATIC_DIR):
+        # Kembalikan URL /app/static/media/<sha><ext>; file di-hard-link (disalin bila beda filesystem)
+        # ke folder static sekali saja. Ekstensi menentukan Content-Type yang dikirim server.
+        name = sha + extension
+        target = os.path.join(static_dir, "media", name)
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(self.path(sha), target)
+            except FileExistsError:
+                pass
+            except OSError:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target))
+                os.close(fd)
+                shutil.copyfile(self.path(sha), tmp_path)
+                os.replace(tmp_path, target)
+        return f"/app/static/media/{name}"
+
+    def unpublish(self, sha, static_dir=STATIC_DIR):
+        # Hapus publikasi blob ini (semua ekstensi); kembalikan jumlah file yang dihapus
+        media = os.path.join(static_dir, "media")
+        removed = 0
+        for name in os.listdir(media) if os.path.isdir(media) else []:
+            if name.startswith(sha):
+                os.remove(os.path.join(media, name))
+                removed += 1
+        return removed
+
+    def prune_published(self, referenced, static_dir=STATIC_DIR):
+        # Hapus publikasi yang blob-nya tidak ada di referenced (sha yang masih dipakai materials)
+        media = os.path.join(static_dir, "media")
+        removed = 0
+        for name in os.listdir(media) if os.path.isdir(media) else []:
+            if os.path.splitext(name)[0] not in referenced:
+                os.remove(os.path.join(media, name))
+                removed += 1
+        return removed
+
+    def open(self, sha):
+        return open(self.path(sha), "rb")
+
+    def read_bytes(self, sha):
+        with self.open(sha) as f:
+            return f.read()
+
+    def read_text(self, sha, encoding="utf-8"):
+        return self.read_bytes(sha).decode(encoding)
+
+
+class _BytesReader:
+    # Pembaca minimal di atas bytes tanpa menyalin seluruh isi seperti io.BytesIO
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._pos = 0
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._pos + size
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos += len(chunk)
+        return chunk
+
+
+def move_material_contents(tx, store=None):
+    # Langkah migrasi: pindahkan isi BLOB lama di materials ke blob store, satu baris per kali
+    store = store or BlobStore()
+    ids = [row[0] for row in tx.execute("SELECT id FROM materials WHERE content IS NOT NULL").fetchall()]
+    for material_id in ids:
+        content = tx.execute("SELECT content FROM materials WHERE id=?", (material_id,)).fetchone()[0]
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        sha, size = store.put_bytes(content)
+        tx.execute("UPDATE materials SET blob_sha=?, size=?, content=NULL WHERE id=?", (sha, size, material_id))
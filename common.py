@@ -0,0 +1,153 @@
+# Sumber daya bersama untuk semua halaman (views/*.py). Semuanya dibuat sekali per proses lewat
+# st.cache_resource; SDK Gemini baru diimpor saat halaman yang memakai AI pertama kali membutuhkannya,
+# sehingga halaman lain tidak menanggung biaya impor dan konfigurasinya.
+import logging
+import os
+import time
+
+import streamlit as st
+
+from ai_cache import ResponseCache
+from blobstore import BlobStore
+from grading import PROMPT_HEADER as GRADING_PROMPT, BackgroundGrader, fake_grader
+from llm import MODEL_NAME, GeminiExecutor, StubModel, generate_text, stream_text
+from metrics import Metrics
+from query_cache import QueryCache
+from retrieval import Retriever, augment_prompt, make_embedder
+from schema import migrate
+from storage import ConnectionPool, DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Asumsikan user_id default untuk demo (karena login dihapus)
+user_id = 1
+role = 'admin'  # Default ke admin agar semua fitur accessible untuk demo
+
+
+# Metrik kinerja (durasi query, panggilan Gemini, rerun) untuk panel Performa, dibagi antar sesi
+@st.cache_resource
+def get_metrics():
+    return Metrics()
+
+
+# Inisialisasi database SQLite berbasis file (mode WAL), dibagi antar sesi lewat cache_resource.
+# Migrasi skema hanya dijalankan sekali per proses, bukan di setiap rerun.
+@st.cache_resource
+def _open_db():
+    started = time.perf_counter()
+    db = ConnectionPool(DB_PATH, metrics=get_metrics())
+    startup_report = migrate(db)
+    startup_report["startup_seconds"] = time.perf_counter() - started
+    return db, startup_report
+
+
+def get_db():
+    return _open_db()[0]
+
+
+def get_startup_report():
+    return _open_db()[1]
+
+
+# Cache hasil query, dibatalkan per (tabel, scope) oleh penulisan
+@st.cache_resource
+def get_query_cache():
+    return QueryCache(get_db())
+
+
+# Blob store untuk isi file materi (di luar database). Publikasi media milik materi yang sudah
+# dihapus dibersihkan sekali per proses.
+@st.cache_resource
+def get_blob_store():
+    blobs = BlobStore()
+    referenced = {sha for (sha,) in get_db().fetchall("SELECT DISTINCT blob_sha FROM materials WHERE blob_sha IS NOT NULL")}
+    blobs.prune_published(referenced)
+    return blobs
+
+
+# Cache respons Gemini (LRU di memori + tabel ai_cache), dibagi antar sesi
+@st.cache_resource
+def get_ai_cache():
+    return ResponseCache(get_db())
+
+
+# Executor bersama untuk panggilan Gemini: jumlah panggilan paralel dibatasi, dengan timeout dan retry
+@st.cache_resource
+def get_ai_executor():
+    return GeminiExecutor()
+
+
+# Job penilaian AI massal di thread latar, memakai executor Gemini yang sama dengan fitur AI lain
+@st.cache_resource
+def get_grader():
+    return BackgroundGrader(get_db(), get_ai_executor())
+
+
+# Indeks vektor materi/kasus/diskusi/log untuk konteks prompt, diperbarui inkremental di thread latar
+@st.cache_resource
+def get_retriever():
+    embedder = make_embedder()
+    if embedder.name.startswith("gemini"):
+        get_model()  # genai.configure dengan API key
+    retriever = Retriever(get_db(), embedder, get_blob_store())
+    retriever.start_background()
+    return retriever
+
+
+@st.cache_resource
+def get_model():
+    if os.environ.get("KALAM_GEMINI_STUB"):
+        # Model stub lokal untuk pengembangan/pengujian offline (tanpa API key)
+        return StubModel(responder=_stub_responder)
+    import google.generativeai as genai  # Integrasi dengan Google Gemini API, diimpor saat pertama dipakai
+
+    # Akses API Key dari secrets.toml
+    genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
+    return genai.GenerativeModel(MODEL_NAME)
+
+
+def _stub_responder(prompt):
+    # Prompt penilaian massal dijawab JSON skor tiruan agar alur penilaian juga bisa dicoba offline
+    if prompt.startswith(GRADING_PROMPT):
+        return fake_grader(prompt)
+    return f"[stub] {prompt[:200]}"
+
+
+# Lampirkan potongan paling relevan (retrieval.py) ke prompt; kembalikan (prompt, potongan).
+# Jika retrieval gagal (mis. API embedding tidak tersedia), prompt dikirim tanpa konteks.
+def prompt_with_context(prompt, query, **retrieve_kwargs):
+    try:
+        passages = get_retriever().retrieve(query, **retrieve_kwargs)
+    except Exception:
+        logger.exception("Retrieval konteks prompt gagal")
+        return prompt, []
+    return augment_prompt(prompt, passages), passages
+
+
+# Fungsi untuk integrasi Gemini: Generate saran atau analisis.
+# stream=True mengembalikan generator potongan teks untuk st.write_stream.
+# Durasi (termasuk hit cache) dan ukuran respons dicatat sebagai kategori "gemini".
+def generate_gemini_response(prompt, stream=False):
+    if stream:
+        return _stream_gemini_response(prompt)
+    started = time.perf_counter()
+    try:
+        text = generate_text(get_model(), prompt, cache=get_ai_cache(), executor=get_ai_executor())
+    except Exception as e:
+        text = f"Error: {str(e)}"
+    get_metrics().observe("gemini", time.perf_counter() - started, nbytes=len(text.encode("utf-8")))
+    return text
+
+
+def _stream_gemini_response(prompt):
+    # Durasi diukur sampai potongan terakhir diterima
+    started = time.perf_counter()
+    nbytes = 0
+    try:
+        for chunk in stream_text(get_model(), prompt, cache=get_ai_cache(), executor=get_ai_executor()):
+            nbytes += len(chunk.encode("utf-8"))
+            yield chunk
+    except Exception as e:
+        yield f"Error: {str(e)}"
+    finally:
+        get_metrics().observe("gemini", time.perf_counter() - started, nbytes=nbytes)
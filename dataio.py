@@ -0,0 +1,285 @@
+# Impor/ekspor massal data platform dalam CSV atau Parquet. Keduanya streaming: impor membaca file per
+# potongan CHUNK_ROWS baris, memvalidasi dan mengonversi nilai sesuai tipe kolom tabel, lalu menulis
+# lewat executemany; ekspor membaca cursor per potongan dan menulisnya langsung ke file. Memori yang
+# dipakai sebanding dengan satu potongan, bukan ukuran tabel.
+#
+# Satu impor = satu transaksi: jika ada baris yang tidak valid, seluruh impor dibatalkan (penulisan lain
+# menunggu sampai impor selesai). Parquet butuh pyarrow (opsional; CSV selalu tersedia).
+#
+#   python dataio.py export attendance attendance.parquet
+#   python dataio.py import attendance absensi.csv [--skip-existing]
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+CHUNK_ROWS = 10_000
+MAX_REPORTED_ERRORS = 20
+
+# Tabel yang boleh diimpor: data mentah yang tidak punya struktur turunan. Tabel turunan (agg_*, indeks
+# pencarian, soal kuis, ...) diisi oleh trigger/kode aplikasi dari tabel ini.
+IMPORT_TABLES = ("attendance", "evaluations", "progress", "cases", "discussions", "assignments", "submissions",
+                 "learning_logs", "reports", "forums", "forum_posts", "messages", "notifications", "simulations")
+# Tabel internal/turunan yang tidak diekspor
+_INTERNAL_PREFIXES = ("agg_", "rag_", "search_index", "sqlite_")
+_INTERNAL_TABLES = {"ai_cache", "feed_unread", "grading_runs", "table_versions"}
+
+
+class ImportValidationError(ValueError):
+    # errors: pesan per baris (paling banyak MAX_REPORTED_ERRORS), untuk ditampilkan ke pengguna
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def exportable_tables(db):
+    names = [row[0] for row in db.fetchall("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+    return [n for n in names if not n.startswith(_INTERNAL_PREFIXES) and n not in _INTERNAL_TABLES]
+
+
+def table_columns(db, table):
+    # [(nama, tipe dasar)] dengan tipe: "INTEGER", "REAL", "TEXT", atau "BLOB"
+    columns = []
+    for _, name, declared, *_ in db.fetchall(f"PRAGMA table_info({table})"):
+        declared = (declared or "").upper()
+        kind = "INTEGER" if "INT" in declared else "REAL" if any(t in declared for t in ("REAL", "FLOA", "DOUB")) \
+            else "BLOB" if "BLOB" in declared else "TEXT"
+        columns.append((name, kind))
+    return columns
+
+
+def format_of(path, fmt=None):
+    fmt = (fmt or os.path.splitext(path)[1].lstrip(".")).lower()
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Format tidak dikenal: {fmt!r} (gunakan csv atau parquet)")
+    return fmt
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Format Parquet membutuhkan paket pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def available_formats():
+    # Parquet hanya ditawarkan jika pyarrow (dependensi opsional) terpasang
+    try:
+        _pyarrow()
+    except RuntimeError:
+        return ["csv"]
+    return ["csv", "parquet"]
+
+
+# --- Validasi dan konversi nilai ---
+
+def _to_int(value):
+    if isinstance(value, bool):
+        raise ValueError
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError
+        return int(value)
+    text = str(value).strip()
+    try:
+        return int(text)
+    except ValueError:
+        number = float(text)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+
+def _to_real(value):
+    if isinstance(value, bool):
+        raise ValueError
+    return float(value)
+
+
+def _to_text(value):
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_blob(value):
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+_CONVERTERS = {"INTEGER": _to_int, "REAL": _to_real, "TEXT": _to_text, "BLOB": _to_blob}
+
+
+def _converter(columns, header):
+    # Periksa header terhadap kolom tabel; kembalikan fungsi baris(dict) -> tuple nilai terkonversi
+    known = dict(columns)
+    unknown = [h for h in header if h not in known]
+    if unknown:
+        raise ImportValidationError([f"Kolom tidak dikenal: {', '.join(unknown)} (kolom tabel: {', '.join(known)})"])
+    if len(set(header)) != len(header):
+        raise ImportValidationError(["Nama kolom di header tidak boleh ganda"])
+    if not any(h != "id" for h in header):
+        raise ImportValidationError(["File tidak berisi satu pun kolom tabel"])
+    converters = [(name, _CONVERTERS[known[name]]) for name in header]
+
+    def convert(row):
+        values = []
+        for name, convert_value in converters:
+            value = row.get(name)
+            if value is None or (isinstance(value, str) and value == ""):
+                values.append(None)
+                continue
+            try:
+                values.append(convert_value(value))
+            except (ValueError, TypeError, OverflowError):
+                raise ValueError(f"kolom {name}: nilai {value!r} bukan {known[name]}") from None
+        return tuple(values)
+
+    return convert
+
+
+# --- Pembaca potongan ---
+
+def _csv_chunks(fileobj, chunk_rows):
+    # fileobj boleh biner (UploadedFile, open(..., "rb")) atau teks
+    text = fileobj if isinstance(fileobj, io.TextIOBase) else io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(text)
+    header = reader.fieldnames or []
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield header, chunk
+            chunk = []
+    yield header, chunk
+
+
+def _parquet_chunks(fileobj, chunk_rows):
+    pa = _pyarrow()
+    parquet = pa.parquet.ParquetFile(fileobj)
+    header = parquet.schema_arrow.names
+    empty = True
+    for batch in parquet.iter_batches(batch_size=chunk_rows):
+        empty = False
+        yield header, batch.to_pylist()
+    if empty:
+        yield header, []
+
+
+def import_table(db, table, fileobj, fmt="csv", skip_existing=False, chunk_rows=CHUNK_ROWS):
+    # Impor file ke tabel dalam satu transaksi. skip_existing: baris dengan id yang sudah ada dilewati
+    # (INSERT OR IGNORE), bukan membatalkan impor. Kembalikan laporan (rows, inserted, seconds).
+    if table not in IMPORT_TABLES:
+        raise ValueError(f"Tabel {table!r} tidak bisa diimpor (pilihan: {', '.join(IMPORT_TABLES)})")
+    started = time.perf_counter()
+    columns = table_columns(db, table)
+    chunks = _parquet_chunks(fileobj, chunk_rows) if fmt == "parquet" else _csv_chunks(fileobj, chunk_rows)
+    rows = inserted = 0
+    convert = sql = None
+    with db.transaction():
+        for header, chunk in chunks:
+            if convert is None:
+                convert = _converter(columns, header)
+                names = ", ".join(_quote(h) for h in header)
+                verb = "INSERT OR IGNORE" if skip_existing else "INSERT"
+                sql = f"{verb} INTO {table} ({names}) VALUES ({', '.join('?' * len(header))})"
+            values, errors = [], []
+            for offset, row in enumerate(chunk):
+                try:
+                    values.append(convert(row))
+                except ValueError as exc:
+                    # Nomor baris data (tanpa header), dihitung dari 1
+                    errors.append(f"Baris {rows + offset + 1}: {exc}")
+                    if len(errors) >= MAX_REPORTED_ERRORS:
+                        break
+            if errors:
+                raise ImportValidationError(errors)
+            if values:
+                inserted += max(db.executemany(sql, values), 0)
+            rows += len(chunk)
+    return {"table": table, "rows": rows, "inserted": inserted, "seconds": time.perf_counter() - started}
+
+
+def export_table(db, table, fileobj, fmt="csv", chunk_rows=CHUNK_ROWS):
+    # Tulis seluruh tabel ke fileobj (biner) per potongan, urut id. Kembalikan laporan (rows, seconds).
+    if table not in exportable_tables(db):
+        raise ValueError(f"Tabel {table!r} tidak bisa diekspor")
+    started = time.perf_counter()
+    columns = table_columns(db, table)
+    names = [name for name, _ in columns]
+    order = ' ORDER BY "id"' if "id" in names else ""
+    # Hasil dibaca bertahap per potongan, tanpa memuat seluruh tabel
+    chunks = db.iterchunks(f"SELECT {', '.join(_quote(n) for n in names)} FROM {table}{order}", size=chunk_rows)
+    rows = 0
+    if fmt == "parquet":
+        pa = _pyarrow()
+        types = {"INTEGER": pa.int64(), "REAL": pa.float64(), "TEXT": pa.string(), "BLOB": pa.binary()}
+        schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        with pa.parquet.ParquetWriter(fileobj, schema) as writer:
+            for chunk in chunks:
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows += len(chunk)
+    else:
+        text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="", write_through=True)
+        writer = csv.writer(text)
+        writer.writerow(names)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            rows += len(chunk)
+        text.flush()
+        text.detach()  # jangan tutup fileobj milik pemanggil
+    return {"table": table, "rows": rows, "seconds": time.perf_counter() - started}
+
+
+def main(argv=None):
+    from schema import migrate
+    from storage import ConnectionPool, DB_PATH
+
+    parser = argparse.ArgumentParser(description="Impor/ekspor tabel platform dalam CSV atau Parquet")
+    parser.add_argument("--db", default=DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    export_parser = commands.add_parser("export", help="ekspor tabel ke file")
+    export_parser.add_argument("table")
+    export_parser.add_argument("path", help="file tujuan (.csv / .parquet), '-' untuk stdout (CSV)")
+    export_parser.add_argument("--format", choices=["csv", "parquet"])
+    import_parser = commands.add_parser("import", help="impor file ke tabel")
+    import_parser.add_argument("table", choices=IMPORT_TABLES)
+    import_parser.add_argument("path", help="file sumber (.csv / .parquet)")
+    import_parser.add_argument("--format", choices=["csv", "parquet"])
+    import_parser.add_argument("--skip-existing", action="store_true", help="lewati baris yang id-nya sudah ada")
+    for sub in (export_parser, import_parser):
+        sub.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    db = ConnectionPool(args.db)
+    migrate(db)
+    try:
+        if args.command == "export":
+            if args.path == "-":
+                report = export_table(db, args.table, sys.stdout.buffer, format_of("-.csv", args.format), args.chunk_rows)
+            else:
+                with open(args.path, "wb") as f:
+                    report = export_table(db, args.table, f, format_of(args.path, args.format), args.chunk_rows)
+        else:
+            with open(args.path, "rb") as f:
+                report = import_table(db, args.table, f, format_of(args.path, args.format), args.skip_existing, args.chunk_rows)
+    except ImportValidationError as exc:
+        print("Impor dibatalkan:\n" + "\n".join(f"- {e}" for e in exc.errors), file=sys.stderr)
+        return 1
+    finally:
+        db.close_all()
+    print(json.dumps(report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
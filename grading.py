@@ -0,0 +1,319 @@
+# Penilaian AI massal untuk submissions tugas: submission yang belum dinilai dibaca bertahap (keyset),
+# beberapa submission dikemas ke satu permintaan model selama masih di bawah batas token, permintaan
+# dijalankan paralel secara terbatas lewat GeminiExecutor, lalu skor dan umpan balik ditulis kembali
+# per kelompok dalam satu transaksi.
+#
+# Checkpoint-nya adalah tabel submission_feedback itu sendiri: job yang terhenti (proses mati, tombol
+# Hentikan) cukup dijalankan lagi dan hanya submission yang belum punya baris feedback yang diproses.
+# Kemajuan dan throughput setiap job dicatat di grading_runs. Saat API terkena rate limit, job berhenti
+# mengirim permintaan baru (status "stopped") alih-alih mencoba ulang satu per satu; jalankan lagi nanti.
+#
+#   python grading.py --fake                       # model tiruan lokal, tanpa API key
+#   python grading.py --assignment 3 --concurrency 4
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import datetime
+
+from llm import is_rate_limit_error, model_name_of
+
+MAX_PROMPT_TOKENS = int(os.environ.get("KALAM_GRADING_MAX_TOKENS", 6000))
+MAX_PER_REQUEST = int(os.environ.get("KALAM_GRADING_BATCH", 8))
+DEFAULT_CONCURRENCY = int(os.environ.get("KALAM_GRADING_CONCURRENCY", 2))
+MAX_SUBMISSION_CHARS = 4000  # submission yang lebih panjang dipotong sebelum dikirim
+FETCH_SIZE = 200  # baris per query saat membaca submission yang belum dinilai
+FLUSH_SIZE = 50  # hasil ditulis ke database setiap sekian submission
+
+GRADING_TABLES = [
+    '''CREATE TABLE IF NOT EXISTS submission_feedback (id INTEGER PRIMARY KEY, submission_id INTEGER UNIQUE, assignment_id INTEGER,
+        score INTEGER, feedback TEXT, model TEXT, run_id INTEGER, graded_at TEXT)''',
+    '''CREATE INDEX IF NOT EXISTS idx_submission_feedback_assignment_id ON submission_feedback (assignment_id)''',
+    '''CREATE TABLE IF NOT EXISTS grading_runs (id INTEGER PRIMARY KEY, assignment_id INTEGER, model TEXT, status TEXT,
+        graded INTEGER NOT NULL DEFAULT 0, failed INTEGER NOT NULL DEFAULT 0, requests INTEGER NOT NULL DEFAULT 0,
+        seconds REAL NOT NULL DEFAULT 0, started_at TEXT, updated_at TEXT, error TEXT)''',
+]
+
+PROMPT_HEADER = """Anda adalah guru bahasa Arab yang menilai tugas kalam (berbicara) siswa.
+Nilai setiap submission di bawah dengan skor 0-100 dan beri umpan balik singkat dalam bahasa Indonesia
+tentang kelancaran, ketepatan nahwu/sharaf, dan kosakata.
+Jawab HANYA dengan array JSON, satu objek per submission: [{"id": <id>, "score": <0-100>, "feedback": "<teks>"}]
+"""
+_SUBMISSION_HEADER = re.compile(r"^### Submission (\d+)", re.M)
+
+
+def estimate_tokens(text):
+    # Perkiraan kasar dan sengaja konservatif (teks Arab memakai lebih banyak token per karakter)
+    return len(text) // 3 + 1
+
+
+def _format_submission(row):
+    submission_id, _, assignment_title, content = row
+    content = content or ""
+    if len(content) > MAX_SUBMISSION_CHARS:
+        content = content[:MAX_SUBMISSION_CHARS] + "…"
+    return f"### Submission {submission_id} (Tugas: {assignment_title or '-'})\n{content}\n"
+
+
+def build_prompt(batch):
+    return PROMPT_HEADER + "\n" + "\n".join(_format_submission(row) for row in batch)
+
+
+def pack_batches(rows, max_tokens=MAX_PROMPT_TOKENS, max_items=MAX_PER_REQUEST):
+    # Kelompokkan baris menjadi permintaan yang perkiraan tokennya <= max_tokens (minimal satu baris)
+    budget = max_tokens - estimate_tokens(PROMPT_HEADER)
+    batch, used = [], 0
+    for row in rows:
+        tokens = estimate_tokens(_format_submission(row))
+        if batch and (used + tokens > budget or len(batch) >= max_items):
+            yield batch
+            batch, used = [], 0
+        batch.append(row)
+        used += tokens
+    if batch:
+        yield batch
+
+
+def parse_grades(text, expected_ids):
+    # {submission_id: (skor, feedback)} untuk id yang diminta; ValueError jika respons bukan JSON
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        raise ValueError("Respons model tidak berisi array JSON")
+    grades = {}
+    for item in json.loads(text[start:end + 1]):
+        try:
+            submission_id = int(item["id"])
+            score = max(0, min(100, int(round(float(item["score"])))))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if submission_id in expected_ids:
+            grades[submission_id] = (score, str(item.get("feedback", "")).strip())
+    return grades
+
+
+def fake_grader(prompt):
+    # Responder untuk StubModel: menilai setiap submission di prompt secara deterministik
+    return json.dumps([
+        {"id": int(sid), "score": 60 + int(sid) * 7 % 41, "feedback": f"Umpan balik otomatis untuk submission {sid}."}
+        for sid in _SUBMISSION_HEADER.findall(prompt)
+    ])
+
+
+def iter_ungraded(db, assignment_id=None, fetch_size=FETCH_SIZE):
+    # (id, assignment_id, judul tugas, isi) submission tanpa feedback, urut id, dibaca per halaman
+    sql = '''SELECT s.id, s.assignment_id, a.title, s.content FROM submissions s
+             LEFT JOIN assignments a ON a.id = s.assignment_id
+             LEFT JOIN submission_feedback f ON f.submission_id = s.id
+             WHERE f.submission_id IS NULL AND s.id > ?'''
+    params = []
+    if assignment_id is not None:
+        sql += " AND s.assignment_id = ?"
+        params.append(assignment_id)
+    sql += " ORDER BY s.id LIMIT ?"
+    last_id = 0
+    while True:
+        rows = db.fetchall(sql, (last_id, *params, fetch_size))
+        yield from rows
+        if len(rows) < fetch_size:
+            return
+        last_id = rows[-1][0]
+
+
+def count_ungraded(db, assignment_id):
+    return db.scalar('''SELECT COUNT(*) FROM submissions s LEFT JOIN submission_feedback f ON f.submission_id = s.id
+                        WHERE s.assignment_id = ? AND f.submission_id IS NULL''', (assignment_id,), default=0)
+
+
+def resumable_run(db, assignment_id):
+    # Job terakhir untuk tugas ini yang belum selesai (dihentikan, gagal, atau terputus saat running)
+    row = db.fetchone("SELECT id, status FROM grading_runs WHERE assignment_id IS ? ORDER BY id DESC LIMIT 1", (assignment_id,))
+    return row[0] if row is not None and row[1] != "done" else None
+
+
+def _generate(model, prompt):
+    return model.generate_content(prompt).text
+
+
+def _scopes(assignment_id):
+    return None if assignment_id is None else [assignment_id]
+
+
+def grade_submissions(db, model, executor, assignment_id=None, run_id=None, concurrency=DEFAULT_CONCURRENCY,
+                      max_tokens=MAX_PROMPT_TOKENS, max_items=MAX_PER_REQUEST, stop=None):
+    # Nilai semua submission yang belum dinilai (untuk satu tugas, atau semua jika assignment_id None).
+    # run_id melanjutkan job sebelumnya (penghitung diakumulasikan). stop: threading.Event untuk berhenti
+    # setelah permintaan yang sedang berjalan selesai. Mengembalikan laporan throughput.
+    name = model_name_of(model)
+    now = datetime.now().isoformat()
+    if run_id is None:
+        run_id = db.execute("INSERT INTO grading_runs (assignment_id, model, status, started_at, updated_at) VALUES (?, ?, 'running', ?, ?)",
+                            (assignment_id, name, now, now), scopes=_scopes(assignment_id))
+    else:
+        db.execute("UPDATE grading_runs SET status = 'running', error = NULL, updated_at = ? WHERE id = ?", (now, run_id), scopes=_scopes(assignment_id))
+    previous_seconds = db.scalar("SELECT seconds FROM grading_runs WHERE id = ?", (run_id,), default=0)
+
+    started = time.perf_counter()
+    totals = {"graded": 0, "failed": 0, "requests": 0}
+    unsaved = {"graded": 0, "failed": 0, "requests": 0}
+    buffer = []
+
+    def flush(status="running", error=None):
+        # Satu transaksi: feedback kelompok ini + penghitung job (checkpoint)
+        with db.transaction():
+            if buffer:
+                db.executemany('''INSERT OR REPLACE INTO submission_feedback (submission_id, assignment_id, score, feedback, model, run_id, graded_at)
+                                  VALUES (?, ?, ?, ?, ?, ?, ?)''', buffer, scopes=list({row[1] for row in buffer}))
+            db.execute('''UPDATE grading_runs SET graded = graded + ?, failed = failed + ?, requests = requests + ?, seconds = ?,
+                              status = ?, error = ?, updated_at = ? WHERE id = ?''',
+                       (unsaved["graded"], unsaved["failed"], unsaved["requests"], previous_seconds + time.perf_counter() - started,
+                        status, error, datetime.now().isoformat(), run_id), scopes=_scopes(assignment_id))
+        buffer.clear()
+        unsaved.update(graded=0, failed=0, requests=0)
+
+    def count(key, n=1):
+        totals[key] += n
+        unsaved[key] += n
+
+    batches = pack_batches(iter_ungraded(db, assignment_id), max_tokens, max_items)
+    retries = deque()  # submission dari permintaan gabungan yang gagal, dicoba ulang satu per satu
+    pending = {}
+    rate_limited = None  # error rate limit pertama; setelahnya tidak ada permintaan baru
+    try:
+        while True:
+            while len(pending) < concurrency and rate_limited is None and not (stop is not None and stop.is_set()):
+                batch = retries.popleft() if retries else next(batches, None)
+                if batch is None:
+                    break
+                pending[executor.submit(_generate, model, build_prompt(batch))] = batch
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending.pop(future)
+                count("requests")
+                limited = False
+                try:
+                    grades = parse_grades(future.result(), {row[0] for row in batch})
+                except Exception as exc:
+                    grades = {}
+                    limited = is_rate_limit_error(exc)
+                    if limited and rate_limited is None:
+                        rate_limited = exc
+                graded_at = datetime.now().isoformat()
+                for submission_id, ass_id, _, _ in batch:
+                    if submission_id in grades:
+                        score, feedback = grades[submission_id]
+                        buffer.append((submission_id, ass_id, score, feedback, name, run_id, graded_at))
+                        count("graded")
+                missing = [row for row in batch if row[0] not in grades]
+                if limited:
+                    pass  # tetap tanpa feedback, dinilai saat job dilanjutkan
+                elif len(batch) > 1:
+                    retries.extend([row] for row in missing)
+                else:
+                    count("failed", len(missing))
+            if len(buffer) >= FLUSH_SIZE:
+                flush()
+    except BaseException as exc:
+        for future in pending:
+            future.cancel()
+        flush("failed", str(exc))
+        raise
+    status = "stopped" if rate_limited is not None or (stop is not None and stop.is_set()) else "done"
+    flush(status, None if rate_limited is None else f"Rate limit: {rate_limited}")
+
+    seconds = time.perf_counter() - started
+    return {
+        "run_id": run_id,
+        "status": status,
+        **totals,
+        "seconds": seconds,
+        "submissions_per_second": totals["graded"] / seconds if seconds else 0.0,
+    }
+
+
+class BackgroundGrader:
+    # Job penilaian yang berjalan di thread latar, paling banyak satu per tugas; dibagi antar sesi
+    # (lihat common.get_grader). Job yang terputus dilanjutkan saat dimulai lagi.
+    def __init__(self, db, executor, concurrency=DEFAULT_CONCURRENCY):
+        self.db = db
+        self.executor = executor
+        self.concurrency = concurrency
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.reports = {}
+
+    def running(self, assignment_id):
+        with self._lock:
+            job = self._jobs.get(assignment_id)
+            return job is not None and job[0].is_alive()
+
+    def start(self, assignment_id, model):
+        with self._lock:
+            job = self._jobs.get(assignment_id)
+            if job is not None and job[0].is_alive():
+                return False
+            stop = threading.Event()
+            run_id = resumable_run(self.db, assignment_id)
+            thread = threading.Thread(target=self._run, args=(assignment_id, model, run_id, stop),
+                                      name=f"grading-{assignment_id}", daemon=True)
+            self._jobs[assignment_id] = (thread, stop)
+            thread.start()
+            return True
+
+    def stop(self, assignment_id):
+        with self._lock:
+            job = self._jobs.get(assignment_id)
+        if job is not None:
+            job[1].set()
+
+    def _run(self, assignment_id, model, run_id, stop):
+        try:
+            self.reports[assignment_id] = grade_submissions(self.db, model, self.executor, assignment_id, run_id=run_id,
+                                                            concurrency=self.concurrency, stop=stop)
+        except Exception as exc:
+            # Status dan pesan error sudah tercatat di grading_runs
+            self.reports[assignment_id] = {"status": "failed", "error": str(exc)}
+
+
+def main(argv=None):
+    from llm import MODEL_NAME, GeminiExecutor, StubModel
+    from schema import migrate
+    from storage import ConnectionPool, DB_PATH
+
+    parser = argparse.ArgumentParser(description="Nilai submission yang belum dinilai dengan AI")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--assignment", type=int, help="hanya tugas ini (default: semua tugas)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--batch", type=int, default=MAX_PER_REQUEST, help="submission maksimum per permintaan")
+    parser.add_argument("--max-tokens", type=int, default=MAX_PROMPT_TOKENS)
+    parser.add_argument("--resume", type=int, metavar="RUN_ID", help="lanjutkan job grading_runs ini")
+    parser.add_argument("--fake", action="store_true", help="pakai model tiruan lokal (tanpa API key)")
+    parser.add_argument("--fake-delay", type=float, default=0.05, help="latensi model tiruan per permintaan (detik)")
+    args = parser.parse_args(argv)
+
+    db = ConnectionPool(args.db)
+    migrate(db)
+    if args.fake:
+        model = StubModel(fake_grader, model_name="fake-grader", delay=args.fake_delay)
+    else:
+        import google.generativeai as genai
+
+        genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+        model = genai.GenerativeModel(MODEL_NAME)
+    executor = GeminiExecutor(max_workers=args.concurrency)
+    try:
+        report = grade_submissions(db, model, executor, args.assignment, run_id=args.resume, concurrency=args.concurrency,
+                                   max_tokens=args.max_tokens, max_items=args.batch)
+    finally:
+        executor.shutdown()
+        db.close_all()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
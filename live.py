@@ -0,0 +1,112 @@
+# Feed langsung untuk chat, forum, dan notifikasi. Setiap feed (satu percakapan, satu forum, atau
+# notifikasi satu user) menyimpan cursor id terakhir di session_state; setiap tick hanya membaca baris
+# dengan id > cursor lewat indeks. Sebelum query, versi (tabel, scope) dari ConnectionPool dibandingkan
+# dengan versi tick sebelumnya: jika tidak ada penulisan, tick tidak menyentuh SQLite sama sekali.
+#
+# Jumlah belum dibaca per (user, channel) disimpan di tabel feed_unread dan dinaikkan oleh trigger saat
+# pesan/notifikasi/post masuk; membuka feed mengenolkannya (mark_read). Channel: "dm:<user lain>",
+# "forum:<forum_id>", "notif". Forum dihitung untuk user yang pernah membuka forum itu.
+import os
+from collections import deque, namedtuple
+
+LIVE_INTERVAL = float(os.environ.get("KALAM_LIVE_INTERVAL", 3))  # detik antar tick fragment
+FEED_WINDOW = 50  # jumlah baris terakhir yang ditampilkan per feed
+
+FEED_SCHEMA = [
+    # Satu indeks untuk kedua arah percakapan: (from, to) = (a, b) atau (b, a), lalu id > cursor
+    '''CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (from_user, to_user, id)''',
+    '''CREATE TABLE IF NOT EXISTS feed_unread (user_id INTEGER, channel TEXT, unread INTEGER NOT NULL DEFAULT 0,
+        last_read_id INTEGER NOT NULL DEFAULT 0, PRIMARY KEY (user_id, channel))''',
+    '''CREATE INDEX IF NOT EXISTS idx_feed_unread_channel ON feed_unread (channel)''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_messages_unread AFTER INSERT ON messages
+        WHEN NEW.to_user IS NOT NULL AND NEW.to_user IS NOT NEW.from_user BEGIN
+        INSERT INTO feed_unread (user_id, channel, unread) VALUES (NEW.to_user, 'dm:' || NEW.from_user, 1)
+            ON CONFLICT (user_id, channel) DO UPDATE SET unread = unread + 1;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_notifications_unread AFTER INSERT ON notifications WHEN NEW.user_id IS NOT NULL BEGIN
+        INSERT INTO feed_unread (user_id, channel, unread) VALUES (NEW.user_id, 'notif', 1)
+            ON CONFLICT (user_id, channel) DO UPDATE SET unread = unread + 1;
+    END''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_forum_posts_unread AFTER INSERT ON forum_posts BEGIN
+        UPDATE feed_unread SET unread = unread + 1 WHERE channel = 'forum:' || NEW.forum_id AND user_id IS NOT NEW.user_id;
+    END''',
+]
+
+
+def backfill_unread(tx):
+    # Langkah migrasi: pesan dan notifikasi yang sudah ada dihitung belum dibaca
+    tx.execute('''INSERT INTO feed_unread (user_id, channel, unread)
+                  SELECT to_user, 'dm:' || from_user, COUNT(*) FROM messages
+                  WHERE to_user IS NOT NULL AND to_user IS NOT from_user GROUP BY to_user, from_user''')
+    tx.execute('''INSERT INTO feed_unread (user_id, channel, unread)
+                  SELECT user_id, 'notif', COUNT(*) FROM notifications WHERE user_id IS NOT NULL GROUP BY user_id''')
+
+
+# table/scope: sumber versi untuk deteksi perubahan. branches: filter baris feed ini sebagai beberapa
+# (where, params) yang digabung dengan OR; setiap cabang dibaca lewat indeksnya sendiri lalu digabung,
+# sehingga membuka percakapan panjang pun hanya membaca `limit` baris per cabang.
+Feed = namedtuple("Feed", "channel table columns branches scope")
+
+
+def dm_feed(user_id, other_id):
+    return Feed(f"dm:{other_id}", "messages", ("id", "from_user", "to_user", "content", "timestamp"),
+                (("from_user = ? AND to_user = ?", (user_id, other_id)), ("from_user = ? AND to_user = ?", (other_id, user_id))),
+                user_id)
+
+
+def forum_feed(forum_id):
+    return Feed(f"forum:{forum_id}", "forum_posts", ("id", "user_id", "content", "timestamp"), (("forum_id = ?", (forum_id,)),), forum_id)
+
+
+def notification_feed(user_id):
+    return Feed("notif", "notifications", ("id", "message", "timestamp"), (("user_id = ?", (user_id,)),), user_id)
+
+
+def fetch_new(db, feed, after_id, limit=FEED_WINDOW):
+    # Baris feed dengan id > after_id, paling banyak `limit` yang terbaru, urut naik
+    columns = ", ".join(feed.columns)
+    parts, params = [], []
+    for where, branch_params in feed.branches:
+        parts.append(f"SELECT * FROM (SELECT {columns} FROM {feed.table} WHERE {where} AND id > ? ORDER BY id DESC LIMIT ?)")
+        params.extend((*branch_params, after_id, limit))
+    rows = db.fetchall(" UNION ALL ".join(parts) + " ORDER BY id DESC LIMIT ?", (*params, limit))
+    return rows[::-1]
+
+
+class FeedState:
+    # Cursor dan jendela baris terakhir satu feed untuk satu sesi (disimpan di session_state)
+    def __init__(self, feed, window=FEED_WINDOW):
+        self.feed = feed
+        self.rows = deque(maxlen=window)
+        self.last_id = None
+        self.version = None
+
+    def poll(self, db):
+        # Kembalikan baris baru sejak poll sebelumnya; tanpa query jika versi tabel/scope tidak berubah.
+        # Versi dibaca sebelum query agar penulisan yang terjadi di antaranya tetap terlihat di tick berikutnya.
+        version = db.table_version(self.feed.table, self.feed.scope)
+        if version == self.version:
+            return []
+        self.version = version
+        new = fetch_new(db, self.feed, self.last_id or 0, self.rows.maxlen)
+        self.rows.extend(new)
+        if new:
+            self.last_id = new[-1][0]
+        elif self.last_id is None:
+            self.last_id = 0
+        return new
+
+
+def mark_read(db, user_id, channel, last_id):
+    db.execute('''INSERT INTO feed_unread (user_id, channel, unread, last_read_id) VALUES (?, ?, 0, ?)
+                  ON CONFLICT (user_id, channel) DO UPDATE SET unread = 0, last_read_id = MAX(last_read_id, excluded.last_read_id)''',
+               (user_id, channel, last_id), scopes=[user_id])
+
+
+def unread_counts(db, cache, user_id):
+    # {channel: jumlah belum dibaca} untuk user ini. feed_unread ditulis trigger, jadi kunci cache
+    # memuat versi tabel sumbernya juga; tanpa penulisan baru, hasil diambil dari cache.
+    versions = (db.table_version("messages", user_id), db.table_version("notifications", user_id), db.table_version("forum_posts"))
+    return cache.get_or_load("feed_unread", ("unread", user_id, versions),
+                             lambda: dict(db.fetchall("SELECT channel, unread FROM feed_unread WHERE user_id = ? AND unread > 0", (user_id,))),
+                             scope=user_id)
@@ -0,0 +1,226 @@
+# Helper pemanggilan model Gemini: generasi teks lewat cache respons, mode streaming, dan executor
+# bersama yang membatasi jumlah panggilan paralel, memberi timeout per permintaan, serta retry dengan
+# backoff saat terkena rate limit. Model stub lokal tersedia agar fitur AI bisa dijalankan dan diuji
+# tanpa API key maupun koneksi internet.
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+MODEL_NAME = 'Gemini-2.5-Flash-Lite'  # Atau model lain seperti 'gemini-1.5-pro'
+DEFAULT_WORKERS = int(os.environ.get("KALAM_AI_WORKERS", 4))
+DEFAULT_MAX_PENDING = int(os.environ.get("KALAM_AI_MAX_PENDING", 16))
+DEFAULT_TIMEOUT = float(os.environ.get("KALAM_AI_TIMEOUT", 60))
+
+
+class GeminiBusyError(RuntimeError):
+    pass
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    # Pengganti genai.GenerativeModel. responder(prompt) -> str menentukan jawaban;
+    # default-nya jawaban deterministik yang mengutip prompt.
+    def __init__(self, responder=None, model_name="stub", delay=0.0):
+        self.responder = responder or (lambda prompt: f"[stub] {prompt[:200]}")
+        self.model_name = model_name
+        self.delay = delay
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        text = self.responder(prompt)
+        if not stream:
+            return StubResponse(text)
+        # Mode streaming: kembalikan potongan per kata seperti respons Gemini
+        words = text.split(" ")
+        return [StubResponse(word) for word in [w + " " for w in words[:-1]] + words[-1:]]
+
+
+def model_name_of(model):
+    return getattr(model, "model_name", type(model).__name__)
+
+
+def is_rate_limit_error(exc):
+    # google.api_core.exceptions.ResourceExhausted (HTTP 429) atau pesan kuota dari API
+    if getattr(exc, "code", None) == 429 or type(exc).__name__ in ("ResourceExhausted", "TooManyRequests"):
+        return True
+    message = str(exc).lower()
+    return "429" in message or "rate limit" in message or "quota" in message
+
+
+def _chunk_text(chunk):
+    # Potongan tanpa teks (mis. diblokir filter keamanan) melempar ValueError pada .text
+    try:
+        return chunk.text or ""
+    except ValueError:
+        return ""
+
+
+class GeminiExecutor:
+    # Pool thread bersama untuk semua sesi: paling banyak max_workers panggilan berjalan bersamaan,
+    # dan paling banyak max_pending permintaan lain menunggu sebelum ditolak dengan GeminiBusyError.
+    #
+    # Panggilan yang melewati batas waktu tidak bisa dihentikan dari luar: ia tetap memakai worker dan
+    # slotnya sampai selesai sendiri. Panggilan seperti itu dihitung (_abandoned); selama semua worker
+    # terpakai olehnya, permintaan baru langsung ditolak alih-alih mengantre di belakang worker yang macet.
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING, timeout=DEFAULT_TIMEOUT,
+                 max_retries=3, backoff_seconds=1.0, sleep=time.sleep):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.sleep = sleep
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._abandoned = 0
+        self._abandoned_lock = threading.Lock()
+
+    def _acquire(self, timeout):
+        if self._abandoned >= self.max_workers:
+            raise GeminiBusyError("Semua worker AI masih menunggu panggilan yang melewati batas waktu, coba lagi nanti.")
+        if not self._slots.acquire(timeout=timeout):
+            raise GeminiBusyError("Terlalu banyak permintaan AI yang sedang berjalan, coba lagi sebentar lagi.")
+
+    def _abandon(self, future):
+        # Permintaan yang belum mulai dibatalkan (slotnya langsung lepas); yang sudah berjalan dihitung
+        # sebagai ditinggalkan sampai selesai
+        if future.cancel():
+            return
+        with self._abandoned_lock:
+            self._abandoned += 1
+
+        def finished(_):
+            with self._abandoned_lock:
+                self._abandoned -= 1
+        future.add_done_callback(finished)
+
+    def abandoned(self):
+        return self._abandoned
+
+    def _with_retry(self, fn, *args):
+        attempt = 0
+        while True:
+            try:
+                return fn(*args)
+            except Exception as exc:
+                if attempt >= self.max_retries or not is_rate_limit_error(exc):
+                    raise
+                # Exponential backoff dengan jitter
+                self.sleep(self.backoff_seconds * (2 ** attempt) * (1 + random.random() * 0.25))
+                attempt += 1
+
+    def submit(self, fn, *args, timeout=None):
+        # Versi non-blocking dari run(): kembalikan Future; timeout hanya untuk menunggu slot antrean
+        timeout = self.timeout if timeout is None else timeout
+        self._acquire(timeout)
+        try:
+            future = self._pool.submit(self._with_retry, fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, fn, *args, timeout=None):
+        # Satu tenggat untuk seluruh permintaan: waktu menunggu slot ikut mengurangi waktu menunggu hasil
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        future = self.submit(fn, *args, timeout=timeout)
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            self._abandon(future)
+            raise TimeoutError(f"Permintaan AI melebihi batas waktu {timeout:g} detik")
+
+    def stream(self, model, prompt, timeout=None):
+        # Generator potongan teks. Panggilan ke model dan iterasi respons berjalan di pool;
+        # timeout berlaku untuk jeda antar potongan.
+        timeout = self.timeout if timeout is None else timeout
+        chunks = queue.Queue()
+        done = object()
+        cancelled = threading.Event()
+
+        def produce():
+            try:
+                response = self._with_retry(lambda: model.generate_content(prompt, stream=True))
+                for chunk in response:
+                    if cancelled.is_set():
+                        break
+                    chunks.put(_chunk_text(chunk))
+            except BaseException as exc:
+                chunks.put(exc)
+            finally:
+                chunks.put(done)
+
+        self._acquire(timeout)
+        try:
+            future = self._pool.submit(produce)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            while True:
+                try:
+                    item = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    self._abandon(future)
+                    raise TimeoutError(f"Respons AI berhenti lebih dari {timeout:g} detik")
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                if item:
+                    yield item
+        finally:
+            cancelled.set()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _generate(model, prompt):
+    return model.generate_content(prompt).text
+
+
+def generate_text(model, prompt, cache=None, executor=None):
+    # Ambil dari cache jika ada; hanya respons yang berhasil yang disimpan ke cache
+    name = model_name_of(model)
+    if cache is not None:
+        cached = cache.get(name, prompt)
+        if cached is not None:
+            return cached
+    text = executor.run(_generate, model, prompt) if executor is not None else _generate(model, prompt)
+    if cache is not None:
+        cache.put(name, prompt, text)
+    return text
+
+
+def stream_text(model, prompt, cache=None, executor=None):
+    # Versi streaming generate_text; cocok untuk st.write_stream. Cache hit dikirim sekaligus.
+    name = model_name_of(model)
+    if cache is not None:
+        cached = cache.get(name, prompt)
+        if cached is not None:
+            yield cached
+            return
+    if executor is not None:
+        chunks = executor.stream(model, prompt)
+    else:
+        chunks = (_chunk_text(chunk) for chunk in model.generate_content(prompt, stream=True))
+    parts = []
+    for part in chunks:
+        parts.append(part)
+        yield part
+    if cache is not None:
+        cache.put(name, prompt, "".join(parts))
@@ -0,0 +1,162 @@
+# Instrumentasi jalur panas: setiap query SQLite (ConnectionPool), pembuatan DataFrame (read_sql),
+# panggilan Gemini, dan setiap rerun Kalam.py dicatat durasinya beserta jumlah baris/byte. Durasi
+# disimpan di ring buffer per kategori (persentil bergulir atas N pengamatan terakhir); statistik per
+# pernyataan SQL dan daftar query lambat membantu melihat ke mana waktu rerun habis.
+#
+# Waktu rerun dipecah per thread: sql, write, read_sql, dan gemini dijumlahkan selama rerun berjalan, sisanya
+# (render widget, pandas di halaman, dll.) dicatat sebagai "lainnya".
+#
+# Ekspor: to_json() / to_prometheus(); jika KALAM_METRICS_FILE di-set, maybe_export() menulis file itu
+# (format dari ekstensi: .prom atau .json) paling sering setiap KALAM_METRICS_INTERVAL detik.
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+RING_SIZE = int(os.environ.get("KALAM_METRICS_RING", 2048))
+SLOW_QUERY_MS = float(os.environ.get("KALAM_SLOW_QUERY_MS", 50))
+METRICS_FILE = os.environ.get("KALAM_METRICS_FILE")
+EXPORT_INTERVAL = float(os.environ.get("KALAM_METRICS_INTERVAL", 30))
+MAX_STATEMENTS = 500  # statistik per pernyataan SQL yang disimpan (LRU)
+MAX_SLOW_QUERIES = 100
+QUANTILES = (0.5, 0.95, 0.99)
+CATEGORIES = ("sql", "write", "read_sql", "gemini", "rerun")
+RUN_PARTS = ("sql", "write", "read_sql", "gemini")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _statement_key(sql):
+    return _WHITESPACE.sub(" ", sql).strip()[:500]
+
+
+class Metrics:
+    def __init__(self, ring_size=RING_SIZE, slow_query_ms=SLOW_QUERY_MS):
+        self.ring_size = ring_size
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._durations = {c: deque(maxlen=self.ring_size) for c in CATEGORIES}
+            self._counters = {c: {"calls": 0, "seconds": 0.0, "rows": 0, "bytes": 0} for c in CATEGORIES}
+            self._statements = OrderedDict()  # sql -> {calls, seconds, max_seconds, rows}
+            self._slow = deque(maxlen=MAX_SLOW_QUERIES)
+            self._runs = deque(maxlen=self.ring_size)
+            self._last_export = 0.0
+
+    def observe(self, category, seconds, rows=0, nbytes=0, sql=None):
+        with self._lock:
+            self._durations[category].append(seconds)
+            counters = self._counters[category]
+            counters["calls"] += 1
+            counters["seconds"] += seconds
+            counters["rows"] += rows
+            counters["bytes"] += nbytes
+            if sql is not None:
+                key = _statement_key(sql)
+                stats = self._statements.pop(key, None) or {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "rows": 0}
+                stats["calls"] += 1
+                stats["seconds"] += seconds
+                stats["max_seconds"] = max(stats["max_seconds"], seconds)
+                stats["rows"] += rows
+                self._statements[key] = stats
+                while len(self._statements) > MAX_STATEMENTS:
+                    self._statements.popitem(last=False)
+                if seconds * 1000 >= self.slow_query_ms:
+                    self._slow.append({"at": time.time(), "category": category, "ms": seconds * 1000, "rows": rows, "sql": key})
+        run = getattr(self._local, "run", None)
+        if run is not None and category in run:
+            run[category] += seconds
+
+    # Pencatatan per rerun (dipanggil Kalam.py di awal dan akhir script)
+    def begin_run(self):
+        self._local.run = dict.fromkeys(RUN_PARTS, 0.0)
+        self._local.run_started = time.perf_counter()
+
+    def end_run(self, page=None, **extra):
+        # extra: kolom tambahan untuk catatan rerun ini (mis. queries=jumlah query SQLite)
+        run = getattr(self._local, "run", None)
+        if run is None:
+            return None
+        seconds = time.perf_counter() - self._local.run_started
+        self._local.run = None
+        record = {"at": time.time(), "page": page, "seconds": seconds, **run,
+                  "other": max(seconds - sum(run.values()), 0.0), **extra}
+        self.observe("rerun", seconds)
+        with self._lock:
+            self._runs.append(record)
+        return record
+
+    def percentiles(self, category):
+        with self._lock:
+            values = np.fromiter(self._durations[category], dtype=float)
+        if not len(values):
+            return {f"p{int(q * 100)}": None for q in QUANTILES}
+        return {f"p{int(q * 100)}": float(v) for q, v in zip(QUANTILES, np.quantile(values, QUANTILES))}
+
+    def summary(self):
+        # Per kategori: jumlah panggilan, total detik, baris, byte, dan persentil durasi (detik)
+        with self._lock:
+            counters = {c: dict(v) for c, v in self._counters.items()}
+        return {c: {**counters[c], **self.percentiles(c)} for c in CATEGORIES}
+
+    def statements(self, limit=20):
+        # Pernyataan SQL dengan total waktu terbesar
+        with self._lock:
+            items = [{"sql": sql, **stats} for sql, stats in self._statements.items()]
+        return sorted(items, key=lambda s: s["seconds"], reverse=True)[:limit]
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    def runs(self):
+        with self._lock:
+            return list(self._runs)
+
+    def to_json(self):
+        return json.dumps({"generated_at": time.time(), "summary": self.summary(), "statements": self.statements(),
+                           "slow_queries": self.slow_queries()}, indent=2)
+
+    def to_prometheus(self):
+        # Format teks eksposisi Prometheus: satu summary per kategori
+        lines = []
+        for category, stats in self.summary().items():
+            name = f"kalam_{category}_seconds"
+            lines.append(f"# TYPE {name} summary")
+            for q in QUANTILES:
+                value = stats[f"p{int(q * 100)}"]
+                if value is not None:
+                    lines.append(f'{name}{{quantile="{q}"}} {value:.6f}')
+            lines.append(f"{name}_sum {stats['seconds']:.6f}")
+            lines.append(f"{name}_count {stats['calls']}")
+            for counter in ("rows", "bytes"):
+                lines.append(f"# TYPE kalam_{category}_{counter}_total counter")
+                lines.append(f"kalam_{category}_{counter}_total {stats[counter]}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        # Tulis atomik (file sementara + rename) agar pembaca tidak melihat file setengah jadi
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def maybe_export(self, path=METRICS_FILE, interval=EXPORT_INTERVAL):
+        if not path:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_export < interval:
+                return False
+            self._last_export = now
+        self.export(path)
+        return True
@@ -0,0 +1,88 @@
+# Query halaman-per-halaman untuk tampilan daftar: hanya kolom yang diminta yang diambil, pengurutan
+# dan filter dikerjakan SQLite, dan navigasi memakai keyset pagination (WHERE (sort, id) > (?, ?))
+# sehingga biaya satu halaman tidak tergantung pada posisi halaman maupun ukuran tabel.
+# Jika diberi QueryCache, hasil di-cache per versi (tabel, scope) sehingga INSERT ke tabel itu
+# otomatis membuat cache halamannya kedaluwarsa.
+import pandas as pd
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def build_page_query(table, columns, sort_by="id", descending=False, filters=None, where=None,
+                     search_column=None, search=None, cursor=None, page_size=50, preview_chars=None):
+    # Susun SQL + parameter untuk satu halaman. Nama tabel/kolom harus sudah divalidasi pemanggil;
+    # nilai dari pengguna selalu dikirim sebagai parameter.
+    preview_chars = preview_chars or {}
+    select = []
+    for col in columns:
+        if col in preview_chars:
+            select.append(f"substr({_quote(col)}, 1, {int(preview_chars[col])}) AS {_quote(col)}")
+        else:
+            select.append(_quote(col))
+    if "id" not in columns:
+        select.append('"id"')
+    if sort_by not in columns and sort_by != "id":
+        select.append(_quote(sort_by))
+    clauses, params = [], []
+    for col, value in (filters or {}).items():
+        clauses.append(f"{_quote(col)} = ?")
+        params.append(value)
+    if where:
+        # Fragmen WHERE tetap dari kode aplikasi, mis. ("to_user=? OR from_user=?", (1, 1))
+        clauses.append(f"({where[0]})")
+        params.extend(where[1])
+    if search_column and search:
+        clauses.append(f"{_quote(search_column)} LIKE ?")
+        params.append(f"%{search}%")
+    op = "<" if descending else ">"
+    direction = "DESC" if descending else "ASC"
+    if cursor is not None:
+        if sort_by == "id":
+            clauses.append(f'"id" {op} ?')
+            params.append(cursor[1])
+        else:
+            # NULL diurutkan paling awal oleh SQLite; perbandingan row value tidak menangani NULL,
+            # jadi sisi NULL ditangani eksplisit.
+            if cursor[0] is None:
+                if descending:
+                    clauses.append(f'({_quote(sort_by)} IS NULL AND "id" < ?)')
+                    params.append(cursor[1])
+                else:
+                    clauses.append(f'({_quote(sort_by)} IS NOT NULL OR "id" > ?)')
+                    params.append(cursor[1])
+            else:
+                null_side = f" OR {_quote(sort_by)} IS NULL" if descending else ""
+                clauses.append(f'(({_quote(sort_by)}, "id") {op} (?, ?){null_side})')
+                params.extend(cursor)
+    order = f'"id" {direction}' if sort_by == "id" else f'{_quote(sort_by)} {direction}, "id" {direction}'
+    sql = f"SELECT {', '.join(select)} FROM {_quote(table)}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # Ambil satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+    sql += f" ORDER BY {order} LIMIT {int(page_size) + 1}"
+    return sql, params
+
+
+def fetch_page(db, table, columns, sort_by="id", descending=False, filters=None, where=None,
+               search_column=None, search=None, cursor=None, page_size=50, preview_chars=None,
+               cache=None, scope=None):
+    # Kembalikan (DataFrame halaman, cursor halaman berikutnya atau None)
+    sql, params = build_page_query(table, columns, sort_by, descending, filters, where,
+                                   search_column, search, cursor, page_size, preview_chars)
+
+    def load():
+        rows = db.read_sql(sql, params=params)
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows.iloc[:page_size]
+            last = rows.iloc[-1]
+            sort_value = last[sort_by]
+            next_cursor = (None if pd.isna(sort_value) else sort_value.item() if hasattr(sort_value, "item") else sort_value,
+                           int(last["id"]))
+        return rows[list(columns)].reset_index(drop=True), next_cursor
+
+    if cache is None:
+        return load()
+    return cache.get_or_load(table, ("page", sql, tuple(params)), load, scope)
@@ -0,0 +1,67 @@
+# Cache hasil query yang dibatalkan oleh penulisan. Streamlit menjalankan ulang seluruh script pada
+# setiap interaksi widget; dengan cache ini rerun yang tidak didahului penulisan tidak menyentuh SQLite.
+# Kunci cache memuat versi (tabel, scope) dari ConnectionPool, jadi INSERT ke discussions untuk kasus X
+# hanya membuat entri kasus X kedaluwarsa (lihat ConnectionPool.table_version).
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class QueryCache:
+    def __init__(self, db, max_entries=DEFAULT_MAX_ENTRIES):
+        self.db = db
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, table, scope=None):
+        # table boleh berupa tuple beberapa tabel jika hasilnya bergantung pada semuanya
+        if isinstance(table, tuple):
+            return tuple(self.db.table_version(t, scope) for t in table)
+        return self.db.table_version(table, scope)
+
+    def get_or_load(self, table, key, loader, scope=None):
+        # key: apa pun yang hashable dan unik untuk query ini (biasanya (sql, params))
+        full_key = (table, scope, key, self.version(table, scope))
+        with self._lock:
+            if full_key in self._entries:
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                self._local.hits = getattr(self._local, "hits", 0) + 1
+                return self._entries[full_key]
+            self.misses += 1
+        value = loader()
+        with self._lock:
+            self._entries[full_key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def read_sql(self, table, sql, params=(), scope=None):
+        return self.get_or_load(table, ("read_sql", sql, tuple(params)), lambda: self.db.read_sql(sql, params=params), scope)
+
+    def fetchone(self, table, sql, params=(), scope=None):
+        return self.get_or_load(table, ("fetchone", sql, tuple(params)), lambda: self.db.fetchone(sql, params), scope)
+
+    def scalar(self, table, sql, params=(), scope=None, default=None):
+        row = self.fetchone(table, sql, params, scope)
+        return row[0] if row is not None else default
+
+    # Statistik: hits_this_run dihitung per thread (= per rerun, lihat ConnectionPool.reset_query_count)
+    def reset_run_stats(self):
+        self._local.hits = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+                "hits_this_run": getattr(self._local, "hits", 0),
+            }
@@ -0,0 +1,216 @@
+# Kuis dan asesmen terstruktur: teks soal (JSON dari text_area atau keluaran Gemini) di-parse dan
+# divalidasi sekali saat disimpan, lalu dipecah ke tabel quiz_questions / quiz_options / quiz_answers.
+# Kunci jawaban disimpan sudah dinormalisasi (harakat, varian alef, spasi, huruf besar/kecil), sehingga
+# penilaian cukup mencocokkan jawaban yang dinormalisasi dengan kunci lewat satu join.
+#
+# score_attempts() menilai semua attempt yang belum dinilai untuk satu kuis sekaligus (satu kelas dalam
+# satu pass pandas) dan menulis hasilnya ke quiz_attempts dan evaluations dalam satu transaksi.
+import ast
+import json
+import logging
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from textnorm import normalize_arabic
+
+logger = logging.getLogger(__name__)
+
+QUIZ_TABLES = ("quizzes", "assessments")
+QUIZ_LABELS = {"quizzes": "Kuis", "assessments": "Asesmen"}
+FORMAT_HINT = ('[{"q": "pertanyaan", "a": "jawaban"}] atau dengan pilihan ganda: '
+               '[{"q": "pertanyaan", "options": ["pilihan 1", "pilihan 2"], "a": "pilihan 1"}]; '
+               '"a" boleh berupa daftar beberapa jawaban yang diterima')
+
+QUIZ_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS quiz_questions (id INTEGER PRIMARY KEY, quiz_table TEXT NOT NULL, quiz_id INTEGER NOT NULL,
+        position INTEGER NOT NULL, prompt TEXT NOT NULL, kind TEXT NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_quiz_questions_quiz ON quiz_questions (quiz_table, quiz_id, position)''',
+    '''CREATE TABLE IF NOT EXISTS quiz_options (id INTEGER PRIMARY KEY, question_id INTEGER NOT NULL, position INTEGER NOT NULL, text TEXT NOT NULL)''',
+    '''CREATE INDEX IF NOT EXISTS idx_quiz_options_question_id ON quiz_options (question_id, position)''',
+    # Jawaban yang diterima per soal, beserta bentuk normalnya (kunci pencocokan)
+    '''CREATE TABLE IF NOT EXISTS quiz_answers (id INTEGER PRIMARY KEY, question_id INTEGER NOT NULL, answer TEXT NOT NULL,
+        normalized TEXT NOT NULL, UNIQUE (question_id, normalized))''',
+    '''CREATE TABLE IF NOT EXISTS quiz_attempts (id INTEGER PRIMARY KEY, quiz_table TEXT NOT NULL, quiz_id INTEGER NOT NULL,
+        user_id INTEGER, submitted_at TEXT, score INTEGER, evaluation_id INTEGER)''',
+    '''CREATE INDEX IF NOT EXISTS idx_quiz_attempts_quiz ON quiz_attempts (quiz_table, quiz_id, score)''',
+    '''CREATE TABLE IF NOT EXISTS quiz_responses (id INTEGER PRIMARY KEY, attempt_id INTEGER NOT NULL, question_id INTEGER NOT NULL,
+        response TEXT, correct INTEGER)''',
+    '''CREATE INDEX IF NOT EXISTS idx_quiz_responses_attempt_id ON quiz_responses (attempt_id)''',
+]
+
+
+class QuizFormatError(ValueError):
+    # errors: daftar pesan per soal, untuk ditampilkan ke pengguna
+    def __init__(self, errors):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+_PUNCTUATION = re.compile(r"[.,;:!?\"'()\[\]«»،؛؟]")
+
+
+def normalize_answer(text):
+    # Bentuk pembanding jawaban: tanpa harakat/tatweel, alef disamakan, tanda baca dan spasi berlebih dibuang
+    return normalize_arabic(_PUNCTUATION.sub(" ", str(text or ""))).casefold()
+
+
+def _normalize_series(values):
+    # Normalisasi satu kolom jawaban; setiap jawaban berbeda cukup dinormalisasi sekali
+    codes, uniques = pd.factorize(values.fillna(""))
+    normalized = np.array([normalize_answer(v) for v in uniques] + [""], dtype=object)
+    return pd.Series(normalized[codes], index=values.index, dtype=object)
+
+
+def _load_items(text):
+    # Terima JSON, JSON di dalam blok ```...``` (keluaran Gemini), atau literal Python dengan kutip tunggal
+    text = (text or "").strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.S)
+    if fenced:
+        text = fenced.group(1).strip()
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        raise QuizFormatError(["Soal harus berupa daftar JSON " + FORMAT_HINT])
+    text = text[start:end + 1]
+    try:
+        return json.loads(text)
+    except ValueError:
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            raise QuizFormatError(["JSON soal tidak valid; format yang diharapkan: " + FORMAT_HINT]) from None
+
+
+def parse_questions(text):
+    # Parse dan validasi teks soal -> [{"q", "options", "answers"}]; QuizFormatError berisi semua kesalahan
+    items = _load_items(text)
+    if not isinstance(items, list) or not items:
+        raise QuizFormatError(["Daftar soal kosong"])
+    questions, errors = [], []
+    for number, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            errors.append(f"Soal {number}: harus berupa objek")
+            continue
+        prompt = str(item.get("q") or item.get("question") or "").strip()
+        answers = item.get("a", item.get("answer"))
+        answers = [answers] if isinstance(answers, (str, int, float)) else (answers or [])
+        answers = [str(a).strip() for a in answers if str(a).strip()]
+        options = [str(o).strip() for o in (item.get("options") or item.get("choices") or []) if str(o).strip()]
+        if not prompt:
+            errors.append(f"Soal {number}: pertanyaan kosong")
+        if not answers:
+            errors.append(f"Soal {number}: jawaban kosong")
+        if options:
+            if len(options) < 2:
+                errors.append(f"Soal {number}: pilihan ganda butuh minimal 2 pilihan")
+            normalized_options = {normalize_answer(o) for o in options}
+            wrong = [a for a in answers if normalize_answer(a) not in normalized_options]
+            if wrong:
+                errors.append(f"Soal {number}: jawaban {wrong} tidak ada di pilihan")
+        questions.append({"q": prompt, "options": options, "answers": answers})
+    if errors:
+        raise QuizFormatError(errors)
+    return questions
+
+
+def _insert_questions(conn, quiz_table, quiz_id, questions):
+    for position, question in enumerate(questions):
+        kind = "choice" if question["options"] else "text"
+        question_id = conn.execute("INSERT INTO quiz_questions (quiz_table, quiz_id, position, prompt, kind) VALUES (?, ?, ?, ?, ?)",
+                                   (quiz_table, quiz_id, position, question["q"], kind)).lastrowid
+        conn.executemany("INSERT INTO quiz_options (question_id, position, text) VALUES (?, ?, ?)",
+                         [(question_id, i, option) for i, option in enumerate(question["options"])])
+        conn.executemany("INSERT OR IGNORE INTO quiz_answers (question_id, answer, normalized) VALUES (?, ?, ?)",
+                         [(question_id, answer, normalize_answer(answer)) for answer in question["answers"]])
+
+
+def save_quiz(db, quiz_table, title, text):
+    # Validasi lalu simpan kuis/asesmen beserta soal, pilihan, dan kunci jawabannya; kembalikan id-nya
+    questions = parse_questions(text)
+    canonical = json.dumps([{"q": q["q"], **({"options": q["options"]} if q["options"] else {}),
+                             "a": q["answers"][0] if len(q["answers"]) == 1 else q["answers"]} for q in questions],
+                           ensure_ascii=False)
+    with db.transaction() as tx:
+        quiz_id = db.execute(f"INSERT INTO {quiz_table} (title, questions) VALUES (?, ?)", (title, canonical))
+        _insert_questions(tx, quiz_table, quiz_id, questions)
+        for table in ("quiz_questions", "quiz_options", "quiz_answers"):
+            db.mark_written(table, [quiz_id])
+    return quiz_id
+
+
+def import_existing_quizzes(tx):
+    # Langkah migrasi: pecah soal JSON lama; baris yang tidak valid dibiarkan (tidak bisa dikerjakan)
+    for quiz_table in QUIZ_TABLES:
+        for quiz_id, questions in tx.execute(f"SELECT id, questions FROM {quiz_table}").fetchall():
+            try:
+                _insert_questions(tx, quiz_table, quiz_id, parse_questions(questions))
+            except QuizFormatError as exc:
+                logger.warning("%s %s dilewati: %s", quiz_table, quiz_id, exc)
+
+
+def load_questions(db, quiz_table, quiz_id):
+    # [(question_id, prompt, kind, [pilihan])] urut posisi, untuk ditampilkan saat mengerjakan
+    rows = db.fetchall('''SELECT q.id, q.prompt, q.kind, o.text FROM quiz_questions q
+                          LEFT JOIN quiz_options o ON o.question_id = q.id
+                          WHERE q.quiz_table = ? AND q.quiz_id = ? ORDER BY q.position, o.position''', (quiz_table, quiz_id))
+    questions = {}
+    for question_id, prompt, kind, option in rows:
+        entry = questions.setdefault(question_id, (question_id, prompt, kind, []))
+        if option is not None:
+            entry[3].append(option)
+    return list(questions.values())
+
+
+def submit_attempt(db, quiz_table, quiz_id, user_id, responses):
+    # responses: {question_id: jawaban}; attempt disimpan belum dinilai (lihat score_attempts)
+    with db.transaction():
+        attempt_id = db.execute("INSERT INTO quiz_attempts (quiz_table, quiz_id, user_id, submitted_at) VALUES (?, ?, ?, ?)",
+                                (quiz_table, quiz_id, user_id, datetime.now().isoformat()), scopes=[quiz_id])
+        db.executemany("INSERT INTO quiz_responses (attempt_id, question_id, response) VALUES (?, ?, ?)",
+                       [(attempt_id, question_id, response) for question_id, response in responses.items()], scopes=[quiz_id])
+    return attempt_id
+
+
+def score_attempts(db, quiz_table, quiz_id, attempt_ids=None):
+    # Nilai semua attempt kuis ini yang belum dinilai (atau hanya attempt_ids). Skor = persentase soal
+    # benar (0-100); setiap attempt juga dicatat sebagai baris evaluations untuk user-nya.
+    # Mengembalikan DataFrame (attempt_id, user_id, correct, score).
+    where = "a.quiz_table = ? AND a.quiz_id = ? AND a.score IS NULL"
+    params = [quiz_table, quiz_id]
+    if attempt_ids is not None:
+        where += f" AND a.id IN ({', '.join('?' * len(attempt_ids))})"
+        params.extend(attempt_ids)
+    # Pemilihan attempt "score IS NULL" dan penulisannya dalam satu transaksi tulis: dua penilaian
+    # bersamaan diserialkan, yang kedua tidak lagi melihat attempt yang sudah dinilai yang pertama
+    with db.transaction():
+        attempts = db.read_sql(f"SELECT a.id AS attempt_id, a.user_id FROM quiz_attempts a WHERE {where} ORDER BY a.id", params=params)
+        if attempts.empty:
+            return attempts.assign(correct=[], score=[])
+        responses = db.read_sql(f'''SELECT r.id, r.attempt_id, r.question_id, r.response FROM quiz_responses r
+                                    JOIN quiz_attempts a ON a.id = r.attempt_id WHERE {where}''', params=params)
+        key = db.read_sql('''SELECT DISTINCT k.question_id, k.normalized FROM quiz_answers k
+                             JOIN quiz_questions q ON q.id = k.question_id WHERE q.quiz_table = ? AND q.quiz_id = ?''',
+                          params=(quiz_table, quiz_id))
+        n_questions = db.scalar("SELECT COUNT(*) FROM quiz_questions WHERE quiz_table = ? AND quiz_id = ?", (quiz_table, quiz_id), default=0)
+
+        # Satu pass untuk seluruh kelas: normalisasi jawaban, join dengan kunci, jumlahkan per attempt
+        responses["normalized"] = _normalize_series(responses["response"])
+        responses = responses.merge(key.assign(correct=1), on=["question_id", "normalized"], how="left")
+        responses["correct"] = responses["correct"].fillna(0).astype(int)
+        per_attempt = responses.groupby("attempt_id")["correct"].sum()
+        attempts["correct"] = attempts["attempt_id"].map(per_attempt).fillna(0).astype(int)
+        attempts["score"] = np.rint(attempts["correct"] * 100 / max(n_questions, 1)).astype(int)
+
+        title = db.scalar(f"SELECT title FROM {quiz_table} WHERE id = ?", (quiz_id,), default="")
+        competency = f"{QUIZ_LABELS[quiz_table]}: {title}"
+        db.executemany("UPDATE quiz_responses SET correct = ? WHERE id = ?",
+                       list(zip(responses["correct"].tolist(), responses["id"].tolist())), scopes=[quiz_id])
+        updates = []
+        for attempt_id, user_id, score in attempts[["attempt_id", "user_id", "score"]].itertuples(index=False):
+            user_id = None if pd.isna(user_id) else int(user_id)
+            evaluation_id = db.execute("INSERT INTO evaluations (user_id, competency, score) VALUES (?, ?, ?)", (user_id, competency, int(score)))
+            updates.append((int(score), evaluation_id, int(attempt_id)))
+        db.executemany("UPDATE quiz_attempts SET score = ?, evaluation_id = ? WHERE id = ?", updates, scopes=[quiz_id])
+    return attempts
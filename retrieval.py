@@ -0,0 +1,507 @@
+# Retrieval untuk prompt Gemini: materi teks, kasus, diskusi, dan log pembelajaran dipotong per
+# CHUNK_WORDS kata, di-embed, lalu disimpan di tabel rag_chunks (vektor float32). Indeks di memori
+# (VectorIndex, NumPy) mencari potongan paling mirip (cosine) untuk dilampirkan ke prompt.
+#
+# Pembaruan inkremental: trigger pada tabel sumber memasukkan (source, ref_id) ke rag_pending saat
+# baris ditambah/diubah; Retriever.sync() meng-embed antrean itu dan menambahkan vektornya ke indeks
+# tanpa membangun ulang. sync() berjalan di thread latar (start_background), jadi retrieve() hanya
+# mencari di potongan yang sudah dimuat ke indeks dan tidak menjalankan query database untuk memperbaruinya. Potongan yang dihapus
+# atau diganti dicatat di rag_removed (trigger) dan ditandai di indeks agar tidak ikut dicari; indeks
+# dipadatkan saat porsi vektor usang melebihi STALE_MAX.
+#
+# Embedding default adalah HashingEmbedder: lokal, deterministik, tanpa API (cocok untuk offline dan
+# pengujian). KALAM_EMBEDDER=gemini memakai model embedding Gemini. Jika embedder berganti, semua
+# potongan di-embed ulang pada sync berikutnya.
+#
+#   python retrieval.py sync                  # embed antrean sekarang (mis. setelah impor besar)
+#   python retrieval.py query "kalam perkenalan diri"
+import argparse
+import hashlib
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from blobstore import BlobStore
+from search import SOURCE_LABELS
+from textnorm import normalize_search
+
+EMBEDDER = os.environ.get("KALAM_EMBEDDER", "hash")
+HASH_DIM = int(os.environ.get("KALAM_RAG_DIM", 256))
+CHUNK_WORDS = 80
+CHUNK_OVERLAP = 16
+TOP_K = 4
+MIN_SCORE = 0.15  # potongan dengan kemiripan di bawah ini tidak dilampirkan
+MAX_CONTEXT_CHARS = 1600  # batas total konteks yang ditambahkan ke satu prompt
+SYNC_BATCH = 500  # baris sumber per transaksi saat sync
+IVF_MIN = 50_000  # di atas jumlah vektor ini pencarian memakai IVF, di bawahnya brute force
+IVF_NPROBE = 16
+SYNC_INTERVAL = float(os.environ.get("KALAM_RAG_SYNC_INTERVAL", 5))  # detik antar sync di thread latar
+STALE_MAX = 0.25  # porsi vektor usang di indeks sebelum dipadatkan
+REMOVED_KEEP = 100_000  # catatan rag_removed terbaru yang disimpan; proses yang tertinggal memuat ulang indeks
+
+logger = logging.getLogger(__name__)
+
+# sumber -> (kode, query (id, judul, teks) untuk id tertentu); materials: teks dibaca dari blob store
+SOURCES = {
+    "materials": (1, "SELECT id, title, blob_sha FROM materials WHERE type LIKE 'text%' AND blob_sha IS NOT NULL AND id IN ({ids})"),
+    "cases": (2, "SELECT id, title, description FROM cases WHERE id IN ({ids})"),
+    "discussions": (3, "SELECT id, 'Diskusi kasus #' || case_id, comment FROM discussions WHERE id IN ({ids})"),
+    "learning_logs": (4, "SELECT id, 'Log kasus #' || case_id, log FROM learning_logs WHERE id IN ({ids})"),
+}
+SOURCE_BY_CODE = {code: source for source, (code, _) in SOURCES.items()}
+# kolom teks yang memicu embed ulang saat diubah
+_TEXT_COLUMNS = {"materials": "title, blob_sha", "cases": "title, description", "discussions": "comment", "learning_logs": "log"}
+
+
+def _triggers():
+    statements = []
+    for source, columns in _TEXT_COLUMNS.items():
+        when = " WHEN NEW.type LIKE 'text%'" if source == "materials" else ""
+        statements += [
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{source}_rag_ins AFTER INSERT ON {source}{when} BEGIN
+                INSERT OR IGNORE INTO rag_pending (source, ref_id) VALUES ('{source}', NEW.id);
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{source}_rag_upd AFTER UPDATE OF {columns} ON {source}{when} BEGIN
+                INSERT OR IGNORE INTO rag_pending (source, ref_id) VALUES ('{source}', NEW.id);
+            END''',
+            f'''CREATE TRIGGER IF NOT EXISTS trg_{source}_rag_del AFTER DELETE ON {source} BEGIN
+                DELETE FROM rag_chunks WHERE source = '{source}' AND ref_id = OLD.id;
+                DELETE FROM rag_pending WHERE source = '{source}' AND ref_id = OLD.id;
+            END''',
+        ]
+    return statements
+
+
+# AUTOINCREMENT: id potongan tidak pernah dipakai ulang, sehingga vektor lama di memori tidak bisa
+# tertukar dengan potongan baru hasil embed ulang. rag_removed mencatat id potongan yang dihapus (baris
+# sumber dihapus, diubah lalu di-embed ulang, atau embedder berganti), berurutan menurut seq, agar indeks
+# di memori setiap proses bisa menandai vektor lamanya.
+RAG_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS rag_chunks (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, ref_id INTEGER NOT NULL,
+        chunk INTEGER NOT NULL, title TEXT, text TEXT, embedder TEXT NOT NULL, vector BLOB NOT NULL, UNIQUE (source, ref_id, chunk))''',
+    '''CREATE TABLE IF NOT EXISTS rag_pending (source TEXT, ref_id INTEGER, PRIMARY KEY (source, ref_id)) WITHOUT ROWID''',
+    '''CREATE TABLE IF NOT EXISTS rag_removed (seq INTEGER PRIMARY KEY AUTOINCREMENT, chunk_id INTEGER NOT NULL)''',
+    '''CREATE TRIGGER IF NOT EXISTS trg_rag_chunks_removed AFTER DELETE ON rag_chunks BEGIN
+        INSERT INTO rag_removed (chunk_id) VALUES (OLD.id);
+    END''',
+] + _triggers()
+
+
+def queue_all(tx):
+    # Langkah migrasi (dan embed ulang saat embedder berganti): antrekan semua baris sumber
+    for source in SOURCES:
+        where = " WHERE type LIKE 'text%' AND blob_sha IS NOT NULL" if source == "materials" else ""
+        tx.execute(f"INSERT OR IGNORE INTO rag_pending (source, ref_id) SELECT '{source}', id FROM {source}{where}")
+
+
+def chunk_words(text, size=CHUNK_WORDS, overlap=CHUNK_OVERLAP):
+    # Potong teks per `size` kata dengan tumpang tindih `overlap` kata agar kalimat di batas tidak hilang
+    words = (text or "").split()
+    if not words:
+        return []
+    step = size - overlap
+    return [" ".join(words[start:start + size]) for start in range(0, max(len(words) - overlap, 1), step)]
+
+
+# --- Embedder ---
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def _feature_slot(feature, dim):
+    # (indeks, tanda) fitur; blake2b agar sama di setiap proses (hash() bawaan diacak per proses)
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dim, 1.0 if digest >> 63 else -1.0
+
+
+@lru_cache(maxsize=100_000)
+def _word_tokens(word):
+    # Token ternormalisasi dari satu kata (dipisah spasi); di-cache karena kosakata jauh lebih kecil dari teks
+    return tuple(_TOKEN.findall(normalize_search(word)))
+
+
+@lru_cache(maxsize=100_000)
+def _token_features(token, dim):
+    # Fitur satu kata: kata itu sendiri (bobot 1) dan trigram hurufnya (bobot 0.5) -> (slot, bobot bertanda)
+    padded = f"#{token}#"
+    features = [(token, 1.0)] + [(padded[i:i + 3], 0.5) for i in range(len(padded) - 2)]
+    slots, weights = [], []
+    for feature, weight in features:
+        slot, sign = _feature_slot(feature, dim)
+        slots.append(slot)
+        weights.append(sign * weight)
+    return np.array(slots, dtype=np.int64), np.array(weights, dtype=np.float64)
+
+
+class HashingEmbedder:
+    # Embedding lokal deterministik: kata dan trigram huruf (teks dinormalisasi seperti pencarian,
+    # sehingga harakat/varian alef tidak berpengaruh) di-hash ke `dim` dimensi, lalu dinormalisasi L2.
+    # Trigram huruf membuat kata berimbuhan (ال، و، ب) tetap mirip dengan kata dasarnya.
+    def __init__(self, dim=HASH_DIM, batch=1024):
+        self.dim = dim
+        self.batch = batch
+        self.name = f"hash-{dim}"
+
+    def embed(self, texts, query=False):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.batch):
+            batch = texts[start:start + self.batch]
+            tokens, rows = [], []
+            for row, text in enumerate(batch):
+                count = len(tokens)
+                for word in (text or "").split():
+                    tokens.extend(_word_tokens(word))
+                rows.extend([row] * (len(tokens) - count))
+            if not tokens:
+                continue
+            # Fitur per kata unik (di-cache), lalu diperluas ke setiap kemunculan dan dijumlahkan per
+            # (baris, slot) dengan bincount, tanpa loop Python per fitur
+            vocab = {}
+            inverse = np.fromiter((vocab.setdefault(t, len(vocab)) for t in tokens), dtype=np.int64, count=len(tokens))
+            features = [_token_features(t, self.dim) for t in vocab]
+            lengths = np.array([len(slots) for slots, _ in features])
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            slots = np.concatenate([f[0] for f in features])
+            weights = np.concatenate([f[1] for f in features])
+            counts = lengths[inverse]
+            offsets = np.repeat(starts[inverse] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+            cells = np.repeat(np.asarray(rows), counts) * self.dim + slots[offsets]
+            vectors[start:start + len(batch)] = np.bincount(cells, weights[offsets], minlength=len(batch) * self.dim).reshape(len(batch), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class GeminiEmbedder:
+    # Embedding dari API Gemini (butuh genai.configure, lihat common.get_embedder)
+    def __init__(self, model="models/text-embedding-004", dim=768, batch=100):
+        self.model = model
+        self.dim = dim
+        self.batch = batch
+        self.name = f"gemini:{model}"
+
+    def embed(self, texts, query=False):
+        import google.generativeai as genai
+
+        task = "retrieval_query" if query else "retrieval_document"
+        vectors = []
+        for start in range(0, len(texts), self.batch):
+            result = genai.embed_content(model=self.model, content=list(texts[start:start + self.batch]), task_type=task)
+            vectors.extend(result["embedding"])
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(texts), self.dim)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def make_embedder(kind=EMBEDDER):
+    if kind == "gemini":
+        return GeminiEmbedder()
+    if kind == "hash":
+        return HashingEmbedder()
+    raise ValueError(f"Embedder tidak dikenal: {kind!r} (gunakan hash atau gemini)")
+
+
+# --- Indeks vektor di memori ---
+
+class VectorIndex:
+    # Vektor ternormalisasi dalam satu matriks yang tumbuh berlipat (append O(1) teramortisasi).
+    # Di bawah IVF_MIN vektor: brute force (satu perkalian matriks). Di atasnya: IVF, yaitu vektor
+    # dikelompokkan ke sqrt(n) centroid (k-means) dan query hanya memeriksa `nprobe` kelompok terdekat
+    # ditambah vektor yang masuk setelah pelatihan terakhir; dilatih ulang saat jumlah vektor berlipat dua.
+    # Id harus ditambahkan berurutan naik (id rag_chunks), sehingga posisi id bisa dicari dengan searchsorted.
+    def __init__(self, dim, ivf_min=IVF_MIN, nprobe=IVF_NPROBE):
+        self.dim = dim
+        self.ivf_min = ivf_min
+        self.nprobe = nprobe
+        self._vectors = np.empty((1024, dim), dtype=np.float32)
+        self._ids = np.empty(1024, dtype=np.int64)
+        self._sources = np.empty(1024, dtype=np.int8)
+        self._refs = np.empty(1024, dtype=np.int64)
+        self._alive = np.empty(1024, dtype=bool)
+        self.size = 0
+        self.removed = 0  # vektor usang yang masih menempati indeks
+        self._centroids = None
+        self._lists = None  # posisi vektor per centroid
+        self._trained_size = 0
+
+    def add(self, ids, sources, refs, vectors):
+        n = len(ids)
+        if self.size + n > len(self._ids):
+            capacity = max(len(self._ids) * 2, self.size + n)
+            for name in ("_vectors", "_ids", "_sources", "_refs", "_alive"):
+                old = getattr(self, name)
+                new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:self.size] = old[:self.size]
+                setattr(self, name, new)
+        end = self.size + n
+        self._vectors[self.size:end] = vectors
+        self._ids[self.size:end] = ids
+        self._sources[self.size:end] = sources
+        self._refs[self.size:end] = refs
+        self._alive[self.size:end] = True
+        self.size = end
+        if self.size >= self.ivf_min and self.size >= 2 * self._trained_size:
+            self._train()
+
+    def remove(self, ids):
+        # Tandai potongan yang dihapus/diganti; id yang tidak ada di indeks diabaikan
+        ids = np.asarray(ids, dtype=np.int64)
+        positions = np.searchsorted(self._ids[:self.size], ids)
+        found = positions < self.size
+        positions = positions[found][self._ids[positions[found]] == ids[found]]
+        positions = positions[self._alive[positions]]
+        self._alive[positions] = False
+        self.removed += len(positions)
+        return len(positions)
+
+    def compacted(self):
+        # Salinan tanpa vektor usang; IVF dilatih ulang dari vektor yang tersisa
+        keep = np.flatnonzero(self._alive[:self.size])
+        index = VectorIndex(self.dim, self.ivf_min, self.nprobe)
+        if len(keep):
+            index.add(self._ids[keep], self._sources[keep], self._refs[keep], self._vectors[keep])
+        return index
+
+    def _train(self, iterations=5, seed=0):
+        # k-means sferis pada sampel, lalu semua vektor ditetapkan ke centroid terdekat
+        n = self.size
+        vectors = self._vectors[:n]
+        nlist = max(int(math.sqrt(n)), 1)
+        rng = np.random.default_rng(seed)
+        sample = vectors[rng.choice(n, size=min(n, nlist * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        assign = np.concatenate([np.argmax(vectors[i:i + 65536] @ centroids.T, axis=1) for i in range(0, n, 65536)])
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self._centroids = centroids
+        self._lists = [order[bounds[c]:bounds[c + 1]] for c in range(nlist)]
+        self._trained_size = n
+
+    def search(self, query, k, sources=None, exclude=()):
+        # [(id potongan, skor)] terurut menurun. sources: kode sumber yang boleh; exclude: [(kode, ref_id)]
+        n = self.size
+        if not n:
+            return []
+        if self._centroids is not None:
+            probe = np.argpartition(-(self._centroids @ query), min(self.nprobe, len(self._centroids)) - 1)[:self.nprobe]
+            positions = np.concatenate([self._lists[c] for c in probe] + [np.arange(self._trained_size, n)])
+        else:
+            positions = np.arange(n)
+        mask = self._alive[positions] if self.removed else np.ones(len(positions), dtype=bool)
+        if sources is not None:
+            mask &= np.isin(self._sources[positions], sources)
+        for code, ref in exclude:
+            mask &= ~((self._sources[positions] == code) & (self._refs[positions] == ref))
+        positions = positions[mask]
+        if not len(positions):
+            return []
+        if self._centroids is None:
+            # Brute force: satu perkalian atas matriks kontigu (tanpa salinan), lalu ambil posisi terpilih
+            scores = (self._vectors[:n] @ query)[positions]
+        else:
+            scores = self._vectors[positions] @ query
+        k = min(k, len(positions))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[positions[i]]), float(scores[i])) for i in top]
+
+
+Passage = namedtuple("Passage", "source ref_id title text score")
+
+
+class Retriever:
+    # Satu per proses (common.get_retriever): indeks dimuat dari rag_chunks saat pertama dipakai, lalu
+    # hanya potongan baru (dan penghapusan) yang diterapkan. Aman dipanggil dari beberapa sesi sekaligus:
+    # _lock menserialkan sync (embedding), _index_lock hanya melindungi indeks di memori sebentar.
+    def __init__(self, db, embedder=None, blob_store=None):
+        self.db = db
+        self.embedder = embedder or make_embedder()
+        self.blob_store = blob_store or BlobStore()
+        self.index = VectorIndex(self.embedder.dim)
+        self._loaded_id = None  # id rag_chunks terbesar yang sudah ada di indeks
+        self._removed_seq = 0  # seq rag_removed terakhir yang sudah diterapkan ke indeks
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._thread = None
+
+    def _load_new(self):
+        # Tambahkan potongan dengan id > _loaded_id (embedder sama) ke indeks di memori
+        rows = self.db.fetchall("SELECT id, source, ref_id, vector FROM rag_chunks WHERE id > ? AND embedder = ? ORDER BY id",
+                                (self._loaded_id, self.embedder.name))
+        if rows:
+            ids, sources, refs, blobs = zip(*rows)
+            vectors = np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(rows), self.embedder.dim)
+            self.index.add(ids, [SOURCES[s][0] for s in sources], refs, vectors)
+            self._loaded_id = ids[-1]
+
+    def _last_removed_seq(self):
+        return self.db.scalar("SELECT seq FROM sqlite_sequence WHERE name = 'rag_removed'", default=0)
+
+    def _load(self):
+        # Muat seluruh indeks dari rag_chunks. seq dibaca lebih dulu: penghapusan yang terjadi saat
+        # memuat diterapkan lagi pada refresh berikutnya (id yang tidak ada diabaikan)
+        self._removed_seq = self._last_removed_seq()
+        self.index = VectorIndex(self.embedder.dim)
+        self._loaded_id = 0
+        self._load_new()
+
+    def _start(self):
+        # Muat pertama kali; potongan dari embedder lain dihapus dan sumbernya diantrekan ulang
+        if self.db.scalar("SELECT 1 FROM rag_chunks WHERE embedder != ? LIMIT 1", (self.embedder.name,)):
+            with self.db.transaction() as tx:
+                tx.execute("DELETE FROM rag_chunks WHERE embedder != ?", (self.embedder.name,))
+                queue_all(tx)
+        self._load()
+
+    def _load_removed(self):
+        rows = self.db.fetchall("SELECT seq, chunk_id FROM rag_removed WHERE seq > ? ORDER BY seq", (self._removed_seq,))
+        if rows and rows[0][0] > self._removed_seq + 1:
+            # Catatan yang belum diterapkan sudah dipangkas (proses ini tertinggal jauh): muat ulang
+            self._load()
+            return
+        if rows:
+            self.index.remove([chunk_id for _, chunk_id in rows])
+            self._removed_seq = rows[-1][0]
+
+    def refresh(self):
+        # Terapkan potongan yang sudah di-embed (oleh proses mana pun) ke indeks; tanpa embedding
+        with self._index_lock:
+            if self._loaded_id is None:
+                self._start()
+            else:
+                self._load_removed()
+                self._load_new()
+            if self.index.removed > STALE_MAX * self.index.size:
+                self.index = self.index.compacted()
+
+    def _texts(self, source, ids):
+        sql = SOURCES[source][1].format(ids=", ".join("?" * len(ids)))
+        for ref_id, title, body in self.db.fetchall(sql, ids):
+            if source == "materials":
+                body = self.blob_store.read_text(body)
+            yield ref_id, title or "", body or ""
+
+    def sync(self, batch=SYNC_BATCH):
+        # Embed baris di rag_pending lalu tambahkan ke indeks; kembalikan jumlah potongan baru
+        added = 0
+        with self._lock:
+            self.refresh()
+            while pending := self.db.fetchall("SELECT source, ref_id FROM rag_pending LIMIT ?", (batch,)):
+                chunks = []
+                by_source = {}
+                for source, ref_id in pending:
+                    by_source.setdefault(source, []).append(ref_id)
+                for source, ids in by_source.items():
+                    for ref_id, title, body in self._texts(source, ids):
+                        for number, text in enumerate(chunk_words(body) or [title]):
+                            chunks.append((source, ref_id, number, title, text))
+                # Judul ikut di-embed agar potongan tengah dokumen tetap membawa topiknya
+                vectors = self.embedder.embed([f"{title}\n{text}" for _, _, _, title, text in chunks]) if chunks else []
+                with self.db.transaction() as tx:
+                    tx.executemany("DELETE FROM rag_chunks WHERE source = ? AND ref_id = ?", pending)
+                    tx.executemany("INSERT OR REPLACE INTO rag_chunks (source, ref_id, chunk, title, text, embedder, vector) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   [(*chunk, self.embedder.name, vector.tobytes()) for chunk, vector in zip(chunks, vectors)])
+                    tx.executemany("DELETE FROM rag_pending WHERE source = ? AND ref_id = ?", pending)
+                    tx.execute("DELETE FROM rag_removed WHERE seq <= (SELECT MAX(seq) FROM rag_removed) - ?", (REMOVED_KEEP,))
+                added += len(chunks)
+                self.refresh()  # potongan batch ini langsung bisa dicari
+        return added
+
+    def start_background(self, interval=SYNC_INTERVAL):
+        # Sync berkala di thread latar (sekali per proses), termasuk antrean besar setelah migrasi
+        with self._index_lock:
+            if self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._sync_loop, args=(interval,), name="rag-sync", daemon=True)
+        self._thread.start()
+        return True
+
+    def _sync_loop(self, interval):
+        while True:
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Sync indeks konteks gagal")
+            time.sleep(interval)
+
+    def retrieve(self, query, k=TOP_K, sources=None, exclude=(), min_score=MIN_SCORE):
+        # Potongan paling relevan untuk query, dari yang sudah ter-embed. exclude: [(source, ref_id)] yang sudah ada di prompt.
+        vector = self.embedder.embed([query], query=True)[0]
+        codes = [SOURCES[s][0] for s in sources] if sources else None
+        if self._loaded_id is None:
+            self.refresh()  # muat indeks sekali; selanjutnya diperbarui oleh sync (thread latar / CLI)
+        with self._index_lock:
+            # Sedikit kandidat cadangan untuk potongan yang dihapus sejak sync terakhir (tersaring di bawah)
+            hits = [(chunk_id, score) for chunk_id, score in
+                    self.index.search(vector, k + 2, codes, [(SOURCES[s][0], ref) for s, ref in exclude]) if score >= min_score]
+        if not hits:
+            return []
+        rows = {row[0]: row[1:] for row in self.db.fetchall(
+            f"SELECT id, source, ref_id, title, text FROM rag_chunks WHERE id IN ({', '.join('?' * len(hits))})", [h[0] for h in hits])}
+        return [Passage(*rows[chunk_id], score) for chunk_id, score in hits if chunk_id in rows][:k]
+
+
+def augment_prompt(prompt, passages, max_chars=MAX_CONTEXT_CHARS):
+    # Lampirkan potongan sebagai konteks bernomor di depan prompt, dibatasi max_chars karakter
+    context, used = [], 0
+    for passage in passages:
+        label = f"{SOURCE_LABELS.get(passage.source, passage.source)} #{passage.ref_id}"
+        if passage.title:
+            label += f" ({passage.title})"
+        text = passage.text[:max(max_chars - used, 0)]
+        if not text:
+            break
+        context.append(f"[{len(context) + 1}] {label}: {text}")
+        used += len(text)
+    if not context:
+        return prompt
+    return ("Konteks dari materi dan riwayat kasus di platform (gunakan bila relevan, sebut nomor sumbernya):\n"
+            + "\n".join(context) + "\n\n" + prompt)
+
+
+def main(argv=None):
+    from schema import migrate
+    from storage import ConnectionPool, DB_PATH
+
+    parser = argparse.ArgumentParser(description="Indeks vektor untuk konteks prompt Gemini")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--embedder", choices=["hash", "gemini"], default=EMBEDDER)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("sync", help="embed semua baris yang masih di antrean")
+    query_parser = commands.add_parser("query", help="tampilkan potongan paling relevan untuk teks")
+    query_parser.add_argument("text")
+    query_parser.add_argument("-k", type=int, default=TOP_K)
+    args = parser.parse_args(argv)
+
+    db = ConnectionPool(args.db)
+    migrate(db)
+    retriever = Retriever(db, make_embedder(args.embedder))
+    try:
+        started = time.perf_counter()
+        added = retriever.sync()
+        print(f"{added} potongan baru di-embed, {retriever.index.size} di indeks ({time.perf_counter() - started:.1f} s)", file=sys.stderr)
+        if args.command == "query":
+            started = time.perf_counter()
+            passages = retriever.retrieve(args.text, args.k)
+            print(f"{len(passages)} potongan dalam {(time.perf_counter() - started) * 1000:.1f} ms", file=sys.stderr)
+            for passage in passages:
+                print(f"{passage.score:.3f}  {passage.source} #{passage.ref_id} {passage.title}: {passage.text[:160]}")
+    finally:
+        db.close_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+# Skema database dan migrasi berversi. Versi yang sudah diterapkan disimpan di PRAGMA user_version,
+# sehingga setiap migrasi hanya dijalankan sekali per database, dan migrate() cukup dipanggil
+# sekali per proses (lihat get_db di Kalam.py).
+import logging
+import time
+
+from analytics import AGGREGATE_TABLES, AGGREGATE_TRIGGERS, rebuild_aggregates
+from blobstore import move_material_contents
+from grading import GRADING_TABLES
+from live import FEED_SCHEMA, backfill_unread
+from quiz import QUIZ_SCHEMA, import_existing_quizzes
+from retrieval import RAG_SCHEMA, queue_all
+from search import SEARCH_SCHEMA, rebuild_search_index
+
+logger = logging.getLogger(__name__)
+
+# Daftar migrasi: (versi, nama, [pernyataan SQL atau fungsi(tx)]). Tambahkan migrasi baru di akhir, jangan ubah yang lama.
+MIGRATIONS = [
+    (1, "tabel dasar", [
+        '''CREATE TABLE IF NOT EXISTS cases (id INTEGER PRIMARY KEY, title TEXT, description TEXT, user_id INTEGER)''',
+        '''CREATE TABLE IF NOT EXISTS discussions (id INTEGER PRIMARY KEY, case_id INTEGER, user_id INTEGER, comment TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS assignments (id INTEGER PRIMARY KEY, title TEXT, description TEXT, due_date TEXT, user_id INTEGER)''',
+        '''CREATE TABLE IF NOT EXISTS submissions (id INTEGER PRIMARY KEY, assignment_id INTEGER, user_id INTEGER, content TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS learning_logs (id INTEGER PRIMARY KEY, user_id INTEGER, case_id INTEGER, log TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS reports (id INTEGER PRIMARY KEY, user_id INTEGER, content TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS assessments (id INTEGER PRIMARY KEY, title TEXT, questions TEXT)''',  # questions as JSON string for simplicity
+        '''CREATE TABLE IF NOT EXISTS quizzes (id INTEGER PRIMARY KEY, title TEXT, questions TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS evaluations (id INTEGER PRIMARY KEY, user_id INTEGER, competency TEXT, score INTEGER)''',
+        '''CREATE TABLE IF NOT EXISTS forums (id INTEGER PRIMARY KEY, topic TEXT, user_id INTEGER)''',
+        '''CREATE TABLE IF NOT EXISTS forum_posts (id INTEGER PRIMARY KEY, forum_id INTEGER, user_id INTEGER, content TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY, from_user INTEGER, to_user INTEGER, content TEXT, timestamp TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS materials (id INTEGER PRIMARY KEY, title TEXT, type TEXT, content BLOB)''',  # content as BLOB for files
+        '''CREATE TABLE IF NOT EXISTS progress (id INTEGER PRIMARY KEY, user_id INTEGER, module TEXT, status TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS attendance (id INTEGER PRIMARY KEY, user_id INTEGER, date TEXT, status TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS simulations (id INTEGER PRIMARY KEY, title TEXT, description TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS notifications (id INTEGER PRIMARY KEY, user_id INTEGER, message TEXT, timestamp TEXT)''',
+    ]),
+    # Indeks untuk kolom yang dipakai di klausa WHERE halaman-halaman aplikasi
+    (2, "indeks sekunder", [
+        '''CREATE INDEX IF NOT EXISTS idx_discussions_case_id ON discussions (case_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_submissions_assignment_id ON submissions (assignment_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_learning_logs_user_id ON learning_logs (user_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_learning_logs_case_id ON learning_logs (case_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_evaluations_user_id ON evaluations (user_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_forum_posts_forum_id ON forum_posts (forum_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_messages_to_user ON messages (to_user)''',
+        '''CREATE INDEX IF NOT EXISTS idx_messages_from_user ON messages (from_user)''',
+        '''CREATE INDEX IF NOT EXISTS idx_progress_user_id ON progress (user_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_attendance_user_id ON attendance (user_id)''',
+        '''CREATE INDEX IF NOT EXISTS idx_notifications_user_id ON notifications (user_id)''',
+    ]),
+    # Cache persisten respons Gemini (lihat ai_cache.py)
+    (3, "cache respons AI", [
+        '''CREATE TABLE IF NOT EXISTS ai_cache (key TEXT PRIMARY KEY, model TEXT, response TEXT, created_at REAL)''',
+        '''CREATE INDEX IF NOT EXISTS idx_ai_cache_created_at ON ai_cache (created_at)''',
+    ]),
+    # Isi file materi dipindah ke blob store (lihat blobstore.py); materials hanya menyimpan metadata
+    (4, "materi di luar baris", [
+        '''ALTER TABLE materials ADD COLUMN blob_sha TEXT''',
+        '''ALTER TABLE materials ADD COLUMN size INTEGER''',
+        move_material_contents,
+        '''CREATE INDEX IF NOT EXISTS idx_materials_blob_sha ON materials (blob_sha)''',
+    ]),
+    # Tabel agregat analytics yang diperbarui trigger (lihat analytics.py), diisi dari data yang ada.
+    # Trigger aman untuk user/status/skor/modul kosong yang bisa masuk lewat impor.
+    (5, "agregat analytics", AGGREGATE_TABLES + AGGREGATE_TRIGGERS + [rebuild_aggregates]),
+    # Indeks pencarian teks penuh FTS5 beserta trigger pemeliharaannya; teks normal untuk pencocokan,
+    # judul/isi asli untuk tampilan (lihat search.py)
+    (6, "indeks pencarian", SEARCH_SCHEMA + [rebuild_search_index]),
+    # Hasil penilaian AI per submission dan catatan job penilaian massal (lihat grading.py)
+    (7, "penilaian AI", GRADING_TABLES),
+    # Soal kuis/asesmen terstruktur, attempt, dan jawaban; soal JSON lama di-parse ke tabel baru (lihat quiz.py)
+    (8, "kuis terstruktur", QUIZ_SCHEMA + [import_existing_quizzes]),
+    # Indeks percakapan dan penghitung belum dibaca untuk feed langsung (lihat live.py)
+    (9, "feed langsung", FEED_SCHEMA + [backfill_unread]),
+    # Potongan teks ber-embedding untuk konteks prompt Gemini, antrean pembaruannya, dan catatan potongan
+    # yang dihapus (lihat retrieval.py)
+    (10, "indeks konteks AI", RAG_SCHEMA + [queue_all]),
+]
+
+
+def schema_version(db):
+    return db.scalar("PRAGMA user_version", default=0)
+
+
+def migrate(db):
+    # Terapkan migrasi yang belum dijalankan dan kembalikan laporan waktu startup
+    started = time.perf_counter()
+    current = schema_version(db)
+    steps = []
+    for version, name, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        step_started = time.perf_counter()
+        with db.transaction() as tx:
+            for sql in statements:
+                if callable(sql):
+                    sql(tx)
+                else:
+                    tx.execute(sql)
+            tx.execute(f"PRAGMA user_version={int(version)}")
+        elapsed = time.perf_counter() - step_started
+        steps.append({"version": version, "name": name, "seconds": elapsed})
+        logger.info("Migrasi %s (%s) selesai dalam %.3f s", version, name, elapsed)
+    report = {
+        "from_version": current,
+        "to_version": schema_version(db),
+        "steps": steps,
+        "seconds": time.perf_counter() - started,
+    }
+    logger.info("Skema database versi %s -> %s dalam %.3f s", report["from_version"], report["to_version"], report["seconds"])
+    return report
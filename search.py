@@ -0,0 +1,160 @@
+# Pencarian teks penuh (SQLite FTS5) atas kasus, diskusi, post forum, laporan, log pembelajaran, dan
+# materi teks. Indeks search_index diperbarui secara inkremental oleh trigger pada tabel sumber; teks
+# dinormalisasi lewat fungsi SQL kalam_norm (textnorm.normalize_search, didaftarkan di setiap koneksi
+# oleh ConnectionPool) agar kata Arab dengan/tanpa harakat cocok satu sama lain.
+#
+# rowid indeks = id_sumber * 8 + kode_sumber, sehingga update/hapus baris sumber cukup menyentuh satu
+# rowid dan hasil pencarian bisa dipetakan kembali tanpa kolom tambahan.
+#
+# Teks normal hanya untuk pencocokan; judul asli dan EXCERPT_CHARS karakter awal isi asli disimpan di
+# kolom UNINDEXED title_text/body_text untuk tampilan, sehingga huruf besar, harakat, dan ة tetap seperti
+# yang ditulis pengguna. Cuplikan dibuat dari kutipan itu saja, jadi biayanya tidak bergantung pada panjang
+# dokumen; kecocokan di luar kutipan ditampilkan sebagai awal kutipan tanpa sorotan.
+import re
+
+import pandas as pd
+
+from blobstore import BlobStore
+from textnorm import normalize_search
+
+SOURCE_BITS = 8
+EXCERPT_CHARS = 1000  # panjang isi asli yang disimpan untuk cuplikan hasil
+
+# tabel sumber -> (kode, kolom judul, kolom isi); materials diindeks dari kode karena isinya di blob store
+SOURCES = {
+    "cases": (1, "title", "description"),
+    "discussions": (2, None, "comment"),
+    "forum_posts": (3, None, "content"),
+    "reports": (4, None, "content"),
+    "learning_logs": (5, None, "log"),
+    "materials": (6, "title", None),
+}
+SOURCE_LABELS = {
+    "cases": "Kasus",
+    "discussions": "Diskusi",
+    "forum_posts": "Post Forum",
+    "reports": "Laporan",
+    "learning_logs": "Log Pembelajaran",
+    "materials": "Materi",
+}
+SOURCE_BY_CODE = {code: table for table, (code, _, _) in SOURCES.items()}
+INDEXED_TABLES = tuple(SOURCES)
+
+
+def _column_sql(prefix, column):
+    return f"kalam_norm({prefix}.{column})" if column else "''"
+
+
+def _values_sql(prefix, title, body):
+    title_text = f"{prefix}.{title}" if title else "''"
+    body_text = f"substr({prefix}.{body}, 1, {EXCERPT_CHARS})" if body else "''"
+    return ", ".join((_column_sql(prefix, title), _column_sql(prefix, body), title_text, body_text))
+
+
+_INDEX_COLUMNS = "rowid, title, body, title_text, body_text"
+
+
+def _triggers():
+    statements = []
+    for table, (code, title, body) in SOURCES.items():
+        rowid_new = f"NEW.id * {SOURCE_BITS} + {code}"
+        rowid_old = f"OLD.id * {SOURCE_BITS} + {code}"
+        statements.append(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_search_del AFTER DELETE ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = {rowid_old};
+        END''')
+        if body is None:
+            # Isi materi diindeks dari kode (index_material); perubahan judul diperbarui di tempat
+            statements.append(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_search_upd AFTER UPDATE OF {title} ON {table} BEGIN
+            UPDATE search_index SET title = kalam_norm(NEW.{title}), title_text = NEW.{title} WHERE rowid = {rowid_new};
+        END''')
+            continue
+        columns = ", ".join(c for c in (title, body) if c)
+        statements.append(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_search_ins AFTER INSERT ON {table} BEGIN
+            INSERT INTO search_index ({_INDEX_COLUMNS}) VALUES ({rowid_new}, {_values_sql("NEW", title, body)});
+        END''')
+        statements.append(f'''CREATE TRIGGER IF NOT EXISTS trg_{table}_search_upd AFTER UPDATE OF {columns} ON {table} BEGIN
+            DELETE FROM search_index WHERE rowid = {rowid_old};
+            INSERT INTO search_index ({_INDEX_COLUMNS}) VALUES ({rowid_new}, {_values_sql("NEW", title, body)});
+        END''')
+    return statements
+
+
+SEARCH_SCHEMA = [
+    '''CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5 (
+        title, body, title_text UNINDEXED, body_text UNINDEXED, tokenize = "unicode61 remove_diacritics 2")''',
+] + _triggers()
+
+
+def rebuild_search_index(tx, blob_store=None):
+    # Isi ulang indeks dari semua tabel sumber; dipakai sebagai langkah migrasi (backfill)
+    tx.execute("DELETE FROM search_index")
+    for table, (code, title, body) in SOURCES.items():
+        if body is None:
+            continue
+        tx.execute(f'''INSERT INTO search_index ({_INDEX_COLUMNS})
+                       SELECT id * {SOURCE_BITS} + {code}, {_values_sql(table, title, body)} FROM {table}''')
+    blob_store = blob_store or BlobStore()
+    rows = tx.execute("SELECT id, title, blob_sha FROM materials WHERE type LIKE 'text%' AND blob_sha IS NOT NULL").fetchall()
+    for material_id, title, blob_sha in rows:
+        index_material(tx, material_id, title, blob_store.read_text(blob_sha))
+
+
+def index_material(conn, material_id, title, text):
+    # Materi teks diindeks dari kode saat disimpan (isinya tidak ada di tabel materials).
+    # conn: koneksi di dalam transaksi, atau ConnectionPool.
+    code = SOURCES["materials"][0]
+    conn.execute(f"INSERT OR REPLACE INTO search_index ({_INDEX_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                 (material_id * SOURCE_BITS + code, normalize_search(title), normalize_search(text), title, text[:EXCERPT_CHARS]))
+
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text):
+    # Ubah input pengguna menjadi query FTS5 yang aman: setiap kata dikutip, kata terakhir sebagai prefiks
+    tokens = _TOKEN.findall(normalize_search(text))
+    if not tokens:
+        return None
+    terms = [f'"{t}"' for t in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def make_snippet(text, query, width=16):
+    # Cuplikan dari teks asli seperti snippet() FTS5: kata yang bentuk normalnya cocok dengan query
+    # ditebalkan (kata terakhir query sebagai prefiks), sekitar width kata di sekitar kecocokan pertama
+    tokens = _TOKEN.findall(normalize_search(query))
+    words = (text or "").split()
+    if not tokens or not words:
+        return " ".join(words[:width])
+    exact, prefix = set(tokens[:-1]), tokens[-1]
+
+    def matches(word):
+        return any(t in exact or t.startswith(prefix) for t in _TOKEN.findall(normalize_search(word)))
+
+    hits = [i for i, word in enumerate(words) if matches(word)]
+    start = max(0, min(hits[0] - width // 4, len(words) - width)) if hits else 0
+    window = [f"**{word}**" if i in hits else word for i, word in enumerate(words[start:start + width], start)]
+    return ("…" if start > 0 else "") + " ".join(window) + ("…" if start + width < len(words) else "")
+
+
+def search(db, text, sources=None, limit=20):
+    # Kembalikan DataFrame (source, ref_id, title, snippet, score) terurut BM25 (judul diberi bobot 2x)
+    match = build_match_query(text)
+    columns = ["source", "ref_id", "title", "snippet", "score"]
+    if match is None:
+        return pd.DataFrame(columns=columns)
+    sql = f'''SELECT rowid, title_text AS title, body_text, bm25(search_index, 2.0, 1.0) AS score
+              FROM search_index WHERE search_index MATCH ?'''
+    params = [match]
+    if sources:
+        codes = [SOURCES[s][0] for s in sources]
+        sql += f" AND rowid % {SOURCE_BITS} IN ({', '.join('?' * len(codes))})"
+        params.extend(codes)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(int(limit))
+    df = db.read_sql(sql, params=params)
+    df["source"] = (df["rowid"] % SOURCE_BITS).map(SOURCE_BY_CODE)
+    df["ref_id"] = df["rowid"] // SOURCE_BITS
+    df["snippet"] = [make_snippet(body, text) for body in df["body_text"]]
+    return df[columns]
@@ -0,0 +1,312 @@
+# Lapisan penyimpanan SQLite: database berbasis file (mode WAL) dengan satu koneksi per thread.
+# Streamlit menjalankan setiap sesi di thread-nya sendiri, sehingga pembacaan dari banyak sesi
+# bisa berjalan paralel, sementara penulisan diserialkan oleh satu kunci penulis. Setiap rerun
+# Streamlit berjalan di thread ScriptRunner baru, jadi koneksi milik thread yang sudah selesai ditutup
+# saat koneksi baru dibuat; jumlah koneksi terbuka mengikuti jumlah thread yang masih hidup.
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from textnorm import normalize_search
+
+DB_PATH = os.environ.get("KALAM_DB_PATH", "kalam.db")
+# Versi tabel yang disimpan di database, dinaikkan oleh setiap proses (server maupun CLI) saat commit
+VERSIONS_SCHEMA = "CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+_BUMP_VERSION = ("INSERT INTO table_versions (name, version) VALUES (?, 1) "
+                 "ON CONFLICT(name) DO UPDATE SET version = version + 1 RETURNING version")
+
+_WRITE_TARGET = re.compile(r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM)\s+(\w+)", re.I)
+
+
+def write_target(sql):
+    # Nama tabel yang diubah oleh pernyataan INSERT/UPDATE/DELETE, atau None
+    match = _WRITE_TARGET.match(sql)
+    return match.group(1).lower() if match else None
+
+
+class _ObservedCursor:
+    # Cursor hasil SELECT di dalam transaksi: durasi dicatat saat hasil diambil, bersama jumlah barisnya
+    def __init__(self, pool, sql, cursor, started):
+        self._pool = pool
+        self._sql = sql
+        self._cursor = cursor
+        self._started = started
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._pool._observe("sql", self._sql, self._started, int(row is not None))
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._pool._observe("sql", self._sql, self._started, len(rows))
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class TransactionConnection:
+    # Koneksi yang diberikan transaction(): setiap execute/executemany dicatat ke metrics seperti
+    # helper pool (penulisan sebagai "write", pembacaan sebagai "sql"); atribut lain diteruskan
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def execute(self, sql, params=()):
+        started = time.perf_counter()
+        cursor = self._conn.execute(sql, params)
+        if cursor.description is not None:
+            return _ObservedCursor(self._pool, sql, cursor, started)
+        self._pool._observe("write", sql, started, max(cursor.rowcount, 0))
+        return cursor
+
+    def executemany(self, sql, seq_of_params):
+        started = time.perf_counter()
+        cursor = self._conn.executemany(sql, seq_of_params)
+        self._pool._observe("write", sql, started, max(cursor.rowcount, 0))
+        return cursor
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class ConnectionPool:
+    def __init__(self, path=DB_PATH, busy_timeout_ms=5000, cached_statements=256, metrics=None):
+        self.path = path
+        self.metrics = metrics  # metrics.Metrics opsional: durasi dan jumlah baris setiap query
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._write_lock = threading.RLock()
+        self._all_lock = threading.Lock()
+        self._all = {}  # thread -> koneksi miliknya
+        self._versions = {}  # tabel -> nomor versi, naik setiap kali tabel ditulis
+        self._epochs = {}  # tabel -> naik pada penulisan tanpa scope
+        self._scoped = {}  # (tabel, scope) -> naik pada penulisan ber-scope
+        self._stored = {}  # tabel -> versi di table_versions yang terakhir diketahui proses ini
+        self._monitor = None  # koneksi khusus untuk PRAGMA data_version
+        self._monitor_lock = threading.Lock()
+        self._data_version = None
+
+    def _connect(self):
+        # isolation_level=None: transaksi dikendalikan secara eksplisit lewat transaction()
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.cached_statements,  # cache prepared statement per koneksi
+        )
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(VERSIONS_SCHEMA)
+        # Dipakai trigger indeks pencarian (search.py), jadi harus ada di setiap koneksi
+        conn.create_function("kalam_norm", 1, normalize_search, deterministic=True)
+        with self._all_lock:
+            self._close_finished()
+            self._all[threading.current_thread()] = conn
+        return conn
+
+    def _close_finished(self):
+        # Dipanggil dengan _all_lock: tutup koneksi milik thread yang sudah berhenti (tidak mungkin dipakai lagi)
+        for thread in [t for t in self._all if not t.is_alive()]:
+            self._all.pop(thread).close()
+
+    def open_connections(self):
+        with self._all_lock:
+            return len(self._all)
+
+    def connection(self):
+        # Koneksi milik thread saat ini, dibuat saat pertama kali diminta
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        # Satu penulis pada satu waktu; BEGIN IMMEDIATE mengambil kunci tulis sejak awal.
+        # Yang diberikan adalah TransactionConnection, jadi query di dalam transaksi ikut tercatat.
+        with self._write_lock:
+            conn = self.connection()
+            if conn.in_transaction:
+                # Transaksi bersarang ikut transaksi luar
+                yield TransactionConnection(self, conn)
+                return
+            self._local.written = set()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield TransactionConnection(self, conn)
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                stored = {table: conn.execute(_BUMP_VERSION, (table,)).fetchone()[0]
+                          for table in {table for table, _ in self._local.written}}
+                conn.execute("COMMIT")
+                with self._all_lock:
+                    for table, version in stored.items():
+                        self._stored[table] = max(self._stored.get(table, 0), version)
+                for table, scope in self._local.written:
+                    self.touch(table, scope)
+            finally:
+                self._local.written = set()
+
+    # Versi tabel dipakai sebagai bagian kunci cache hasil query: setiap penulisan lewat
+    # execute()/executemany() menaikkan versi tabel tujuannya setelah commit, sehingga cache lama
+    # tidak terpakai lagi. Penulisan langsung lewat transaction() memanggil mark_written() sendiri.
+    #
+    # Penulisan boleh menyebut scope (mis. case_id untuk discussions): yang naik hanya versi scope itu
+    # dan versi tabel keseluruhan, jadi cache untuk scope lain tetap berlaku. Penulisan tanpa scope
+    # menaikkan "epoch" tabel yang membatalkan cache semua scope.
+    #
+    # Penulis lain (CLI grading/dataio/retrieval, proses server kedua) tidak menaikkan penghitung di
+    # memori proses ini. Karena itu setiap commit juga menaikkan versi tabel di table_versions, dan
+    # sebelum versi dibaca, refresh() memeriksa PRAGMA data_version: bila database diubah koneksi lain,
+    # table_versions dibaca ulang dan tabel yang versinya berubah di luar proses ini di-touch() penuh.
+    def refresh(self):
+        with self._monitor_lock:
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                self._monitor.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+                self._monitor.execute(VERSIONS_SCHEMA)
+            data_version = self._monitor.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return
+            self._data_version = data_version
+            rows = self._monitor.execute("SELECT name, version FROM table_versions").fetchall()
+        changed = []
+        with self._all_lock:
+            for name, version in rows:
+                if version > self._stored.get(name, 0):
+                    self._stored[name] = version
+                    changed.append(name)
+        for name in changed:
+            self.touch(name)
+
+    def table_version(self, table, scope=None):
+        self.refresh()
+        key = table.lower()
+        if scope is None:
+            return self._versions.get(key, 0)
+        return self._epochs.get(key, 0), self._scoped.get((key, scope), 0)
+
+    def touch(self, table, scope=None):
+        with self._all_lock:
+            key = table.lower()
+            self._versions[key] = self._versions.get(key, 0) + 1
+            if scope is None:
+                self._epochs[key] = self._epochs.get(key, 0) + 1
+            else:
+                self._scoped[(key, scope)] = self._scoped.get((key, scope), 0) + 1
+
+    def mark_written(self, table, scopes=None):
+        # Harus dipanggil di dalam transaction(); versi dinaikkan saat commit
+        for scope in (None,) if scopes is None else scopes:
+            self._local.written.add((table.lower(), scope))
+
+    # Helper tulis: menggantikan pasangan cursor.execute(...) / conn.commit().
+    # scopes: daftar nilai scope yang terkena penulisan ini, atau None jika tidak diketahui.
+    def execute(self, sql, params=(), scopes=None):
+        started = time.perf_counter()
+        with self.transaction():
+            # Koneksi mentah: durasi dicatat di bawah termasuk BEGIN/COMMIT
+            cursor = self.connection().execute(sql, params)
+            table = write_target(sql)
+            if table:
+                self.mark_written(table, scopes)
+        self._observe("write", sql, started, max(cursor.rowcount, 0))
+        return cursor.lastrowid
+
+    def executemany(self, sql, seq_of_params, scopes=None):
+        started = time.perf_counter()
+        with self.transaction():
+            rowcount = self.connection().executemany(sql, seq_of_params).rowcount
+            table = write_target(sql)
+            if table:
+                self.mark_written(table, scopes)
+        self._observe("write", sql, started, max(rowcount, 0))
+        return rowcount
+
+    # Penghitung query per thread; Streamlit menjalankan satu rerun di satu thread, sehingga
+    # reset_query_count() di awal script memberi jumlah query per rerun.
+    def reset_query_count(self):
+        self._local.queries = 0
+
+    def query_count(self):
+        return getattr(self._local, "queries", 0)
+
+    def _cursor(self, sql, params):
+        self._local.queries = getattr(self._local, "queries", 0) + 1
+        return self.connection().execute(sql, params)
+
+    def _observe(self, category, sql, started, rows=0, nbytes=0):
+        if self.metrics is not None:
+            self.metrics.observe(category, time.perf_counter() - started, rows, nbytes, sql)
+
+    # Helper baca: tidak mengambil kunci tulis, berjalan paralel antar thread
+    def fetchone(self, sql, params=()):
+        started = time.perf_counter()
+        row = self._cursor(sql, params).fetchone()
+        self._observe("sql", sql, started, int(row is not None))
+        return row
+
+    def fetchall(self, sql, params=()):
+        started = time.perf_counter()
+        rows = self._cursor(sql, params).fetchall()
+        self._observe("sql", sql, started, len(rows))
+        return rows
+
+    def scalar(self, sql, params=(), default=None):
+        row = self.fetchone(sql, params)
+        return row[0] if row is not None else default
+
+    def iterchunks(self, sql, params=(), size=1000):
+        # Hasil dibaca bertahap dengan fetchmany, tanpa memuat seluruhnya; waktu ambil dan jumlah
+        # baris dicatat sekali setelah iterasi selesai (atau berhenti)
+        self._local.queries = getattr(self._local, "queries", 0) + 1
+        started = time.perf_counter()
+        cursor = self.connection().execute(sql, params)
+        elapsed, rows = time.perf_counter() - started, 0
+        try:
+            while True:
+                started = time.perf_counter()
+                chunk = cursor.fetchmany(size)
+                elapsed += time.perf_counter() - started
+                if not chunk:
+                    return
+                rows += len(chunk)
+                yield chunk
+        finally:
+            cursor.close()
+            if self.metrics is not None:
+                self.metrics.observe("sql", elapsed, rows, 0, sql)
+
+    def read_sql(self, sql, params=()):
+        # Dicatat terpisah dari fetch*: termasuk biaya membangun DataFrame (byte = ukuran kolom)
+        self._local.queries = getattr(self._local, "queries", 0) + 1
+        started = time.perf_counter()
+        df = pd.read_sql(sql, self.connection(), params=params)
+        if self.metrics is not None:
+            self._observe("read_sql", sql, started, len(df), int(df.memory_usage(index=False).sum()))
+        return df
+
+    def close_all(self):
+        with self._all_lock:
+            conns, self._all = list(self._all.values()), {}
+        for conn in conns:
+            conn.close()
+        with self._monitor_lock:
+            if self._monitor is not None:
+                self._monitor.close()
+            self._monitor, self._data_version = None, None
+        self._local = threading.local()
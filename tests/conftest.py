@@ -0,0 +1,23 @@
+# Fixture bersama: database SQLite sementara yang sudah dimigrasi. Pengujian hanya memakai logika lokal
+# (model stub, embedder hashing), tanpa Streamlit maupun API Gemini.
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Harus di-set sebelum blobstore diimpor (BLOB_DIR dibaca saat impor)
+os.environ.setdefault("KALAM_BLOB_DIR", tempfile.mkdtemp(prefix="kalam-blobs-"))
+
+import pytest
+
+from schema import migrate
+from storage import ConnectionPool
+
+
+@pytest.fixture
+def db(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "kalam.db"))
+    migrate(pool)
+    yield pool
+    pool.close_all()
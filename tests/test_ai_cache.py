@@ -0,0 +1,43 @@
+from ai_cache import ResponseCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl():
+    clock = Clock()
+    cache = ResponseCache(ttl_seconds=60, clock=clock)
+    cache.put("m", "Analisis  kasus", "jawaban")
+    clock.now += 59
+    assert cache.get("m", "Analisis kasus ") == "jawaban"  # spasi dinormalisasi
+    assert cache.get("lain", "Analisis kasus") is None
+    clock.now += 2
+    assert cache.get("m", "Analisis kasus") is None
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResponseCache(max_entries=2, ttl_seconds=None)
+    cache.put("m", "a", "A")
+    cache.put("m", "b", "B")
+    assert cache.get("m", "a") == "A"
+    cache.put("m", "c", "C")
+    assert cache.get("m", "b") is None
+    assert (cache.get("m", "a"), cache.get("m", "c")) == ("A", "C")
+
+
+def test_database_tier_and_prune(db):
+    clock = Clock()
+    ResponseCache(db, ttl_seconds=60, clock=clock).put("m", "p", "tersimpan")
+    fresh = ResponseCache(db, ttl_seconds=60, clock=clock)
+    assert fresh.get("m", "p") == "tersimpan"
+    assert fresh.stats()["db_hits"] == 1
+    clock.now += 61
+    assert ResponseCache(db, ttl_seconds=60, clock=clock).get("m", "p") is None
+    fresh.prune()
+    assert db.scalar("SELECT COUNT(*) FROM ai_cache") == 0
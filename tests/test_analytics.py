@@ -0,0 +1,45 @@
+import random
+
+from analytics import rebuild_aggregates
+
+AGGREGATES = ("agg_progress_latest", "agg_progress_user", "agg_attendance_user",
+              "agg_evaluation_scores", "agg_activity_daily", "agg_activity_user")
+
+
+def _snapshot(db):
+    return {table: sorted(db.fetchall(f"SELECT * FROM {table}"), key=repr) for table in AGGREGATES}
+
+
+def test_incremental_aggregates_match_rebuild(db):
+    rng = random.Random(0)
+    users = [1, 2, 3, None]
+    for _ in range(400):
+        user = rng.choice(users)
+        table = rng.choice(["progress", "attendance", "evaluations", "learning_logs", "discussions"])
+        if table == "progress":
+            db.execute("INSERT INTO progress (user_id, module, status) VALUES (?, ?, ?)",
+                       (user, rng.choice(["Nahwu", "Sharaf", "", None]), rng.choice(["Completed", "In Progress", None])))
+        elif table == "attendance":
+            db.execute("INSERT INTO attendance (user_id, date, status) VALUES (?, '2024-01-01', ?)",
+                       (user, rng.choice(["Hadir", "Absen", None])))
+        elif table == "evaluations":
+            db.execute("INSERT INTO evaluations (user_id, competency, score) VALUES (?, ?, ?)",
+                       (user, rng.choice(["Kalam", "Istima'"]), rng.choice([0, 9, 10, 55, 99, 100, None])))
+        elif table == "learning_logs":
+            db.execute("INSERT INTO learning_logs (user_id, case_id, log, timestamp) VALUES (?, 1, 'log', ?)",
+                       (user, f"2024-01-0{rng.randint(1, 3)}T08:00:00"))
+        else:
+            db.execute("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (1, ?, 'x', ?)",
+                       (user, f"2024-01-0{rng.randint(1, 3)}T08:00:00"))
+
+    incremental = _snapshot(db)
+    assert all(incremental[table] for table in AGGREGATES)
+    with db.transaction() as tx:
+        rebuild_aggregates(tx)
+    assert _snapshot(db) == incremental
+
+
+def test_progress_keeps_latest_status_per_module(db):
+    db.executemany("INSERT INTO progress (user_id, module, status) VALUES (?, ?, ?)",
+                   [(1, "Nahwu", "Completed"), (1, "Nahwu", "In Progress"), (1, None, "Completed"), (1, None, "Completed")])
+    assert db.fetchone("SELECT modules, completed FROM agg_progress_user WHERE user_id = 1") == (2, 1)
@@ -0,0 +1,91 @@
+import io
+
+import pytest
+
+from dataio import ImportValidationError, _converter, _to_int, _to_real, export_table, import_table
+
+
+@pytest.mark.parametrize("value, expected", [(3, 3), ("3", 3), (" 4 ", 4), ("3.0", 3), (5.0, 5), ("1e3", 1000)])
+def test_to_int(value, expected):
+    assert _to_int(value) == expected
+
+
+@pytest.mark.parametrize("value", ["3.5", 2.5, True, "tiga", ""])
+def test_to_int_rejects(value):
+    with pytest.raises(ValueError):
+        _to_int(value)
+
+
+def test_to_real():
+    assert _to_real("2.5") == 2.5
+    with pytest.raises(ValueError):
+        _to_real(False)
+
+
+def test_converter():
+    convert = _converter([("id", "INTEGER"), ("score", "REAL"), ("note", "TEXT"), ("data", "BLOB")], ["score", "note", "data"])
+    assert convert({"score": "7", "note": 12, "data": "ab"}) == (7.0, "12", b"ab")
+    assert convert({"score": "", "note": None, "data": ""}) == (None, None, None)
+    with pytest.raises(ValueError, match="kolom score"):
+        convert({"score": "tujuh", "note": "", "data": ""})
+
+
+@pytest.mark.parametrize("header, message", [
+    (["id", "nilai"], "Kolom tidak dikenal: nilai"),
+    (["score", "score"], "ganda"),
+    (["id"], "tidak berisi"),
+])
+def test_converter_rejects_header(header, message):
+    with pytest.raises(ImportValidationError, match=message):
+        _converter([("id", "INTEGER"), ("score", "REAL")], header)
+
+
+def _csv(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_import_and_export_csv(db):
+    report = import_table(db, "attendance", _csv("user_id,date,status\n1,2024-01-01,Hadir\n2,2024-01-01,\n"))
+    assert (report["rows"], report["inserted"]) == (2, 2)
+    assert db.fetchall("SELECT user_id, date, status FROM attendance ORDER BY id") == [(1, "2024-01-01", "Hadir"), (2, "2024-01-01", None)]
+    out = io.BytesIO()
+    assert export_table(db, "attendance", out, chunk_rows=1)["rows"] == 2
+    assert out.getvalue().decode("utf-8").splitlines() == ["id,user_id,date,status", "1,1,2024-01-01,Hadir", "2,2,2024-01-01,"]
+
+
+def test_bad_row_rolls_back_whole_import(db):
+    db.execute("INSERT INTO attendance (user_id, date, status) VALUES (9, '2023-12-31', 'Hadir')")
+    # Potongan pertama sudah ditulis sebelum baris salah ditemukan di potongan kedua
+    text = "user_id,date,status\n1,a,Hadir\n2,b,Hadir\n3,c,Hadir\nsatu,d,Hadir\n"
+    with pytest.raises(ImportValidationError) as exc:
+        import_table(db, "attendance", _csv(text), chunk_rows=2)
+    assert exc.value.errors == ["Baris 4: kolom user_id: nilai 'satu' bukan INTEGER"]
+    assert db.fetchall("SELECT user_id FROM attendance") == [(9,)]
+    assert db.scalar("SELECT total FROM agg_attendance_user WHERE user_id = 1") is None
+
+
+def test_skip_existing(db):
+    import_table(db, "cases", _csv("id,title\n1,Lama\n"))
+    with pytest.raises(Exception):
+        import_table(db, "cases", _csv("id,title\n1,Baru\n2,Dua\n"))
+    report = import_table(db, "cases", _csv("id,title\n1,Baru\n2,Dua\n"), skip_existing=True)
+    assert report["inserted"] == 1
+    assert db.fetchall("SELECT id, title FROM cases ORDER BY id") == [(1, "Lama"), (2, "Dua")]
+
+
+def test_rejects_internal_tables(db):
+    with pytest.raises(ValueError):
+        import_table(db, "agg_attendance_user", _csv("user_id\n1\n"))
+    with pytest.raises(ValueError):
+        export_table(db, "ai_cache", io.BytesIO())
+
+
+def test_parquet_round_trip(db):
+    pytest.importorskip("pyarrow")
+    import_table(db, "evaluations", _csv("user_id,competency,score\n1,Kalam,80\n2,Nahwu,\n"))
+    out = io.BytesIO()
+    export_table(db, "evaluations", out, fmt="parquet")
+    db.execute("DELETE FROM evaluations")
+    out.seek(0)
+    assert import_table(db, "evaluations", out, fmt="parquet")["inserted"] == 2
+    assert db.fetchall("SELECT id, user_id, competency, score FROM evaluations ORDER BY id") == [(1, 1, "Kalam", 80), (2, 2, "Nahwu", None)]
@@ -0,0 +1,77 @@
+import pytest
+
+from grading import MAX_SUBMISSION_CHARS, build_prompt, count_ungraded, fake_grader, grade_submissions, pack_batches, parse_grades
+from llm import GeminiExecutor, StubModel
+
+
+def _rows(lengths):
+    return [(i, 1, "Tugas", "x" * n) for i, n in enumerate(lengths, 1)]
+
+
+def test_pack_batches_limits_items_and_tokens():
+    rows = _rows([10] * 7)
+    assert [len(b) for b in pack_batches(rows, max_items=3)] == [3, 3, 1]
+    # Submission yang melebihi anggaran tetap dikirim, sendirian
+    rows = _rows([300, 300, MAX_SUBMISSION_CHARS, 300])
+    batches = list(pack_batches(rows, max_tokens=600, max_items=8))
+    assert [[row[0] for row in b] for b in batches] == [[1, 2], [3], [4]]
+    assert [row for b in batches for row in b] == rows
+
+
+def test_fake_grader_round_trip():
+    batch = _rows([5, 5, 5])
+    grades = parse_grades(fake_grader(build_prompt(batch)), {1, 2, 3})
+    assert set(grades) == {1, 2, 3}
+    assert all(0 <= score <= 100 and feedback for score, feedback in grades.values())
+
+
+def test_parse_grades_filters_and_clamps():
+    text = 'Hasil:\n[{"id": "1", "score": 120.4, "feedback": " ok "}, {"id": 2, "score": "x"}, {"id": 9, "score": 50}, {"score": 1}]'
+    assert parse_grades(text, {1, 2}) == {1: (100, "ok")}
+    with pytest.raises(ValueError):
+        parse_grades("tidak ada JSON", {1})
+
+
+@pytest.fixture
+def submissions(db):
+    db.execute("INSERT INTO assignments (title) VALUES ('Perkenalan')")
+    db.executemany("INSERT INTO submissions (assignment_id, user_id, content) VALUES (1, ?, ?)",
+                   [(i, f"jawaban {i}") for i in range(1, 21)])
+    return db
+
+
+def test_grade_submissions(submissions):
+    executor = GeminiExecutor(max_workers=2)
+    try:
+        report = grade_submissions(submissions, StubModel(fake_grader), executor, 1, concurrency=2, max_items=6)
+    finally:
+        executor.shutdown()
+    assert (report["status"], report["graded"], report["failed"], report["requests"]) == ("done", 20, 0, 4)
+    assert count_ungraded(submissions, 1) == 0
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+def test_rate_limit_stops_without_per_item_retries(submissions):
+    calls = []
+
+    def responder(prompt):
+        calls.append(prompt)
+        if len(calls) > 1:
+            raise RateLimited("quota exceeded")
+        return fake_grader(prompt)
+
+    executor = GeminiExecutor(max_workers=1, max_retries=0)
+    try:
+        report = grade_submissions(submissions, StubModel(responder), executor, 1, concurrency=1, max_items=5)
+        assert (report["status"], report["graded"], report["failed"]) == ("stopped", 5, 0)
+        assert len(calls) == 2
+        assert count_ungraded(submissions, 1) == 15
+        # Job dilanjutkan dari checkpoint-nya
+        report = grade_submissions(submissions, StubModel(fake_grader), executor, 1, run_id=report["run_id"])
+    finally:
+        executor.shutdown()
+    assert report["status"] == "done" and count_ungraded(submissions, 1) == 0
+    assert submissions.fetchone("SELECT graded, failed, status, error FROM grading_runs") == (20, 0, "done", None)
@@ -0,0 +1,62 @@
+import pytest
+
+from quiz import QuizFormatError, load_questions, normalize_answer, parse_questions, save_quiz, score_attempts, submit_attempt
+
+QUIZ = '''Berikut soalnya:
+```json
+[{"q": "Arti 'sekolah'?", "a": "مَدْرَسَةٌ"},
+ {"q": "Pilih fi'il", "options": ["كَتَبَ", "كِتَابٌ"], "a": "كَتَبَ"},
+ {"q": "Salam", "a": ["Assalamu'alaikum", "السلام عليكم"]}]
+```'''
+
+
+def test_parse_fenced_json():
+    questions = parse_questions(QUIZ)
+    assert [q["q"] for q in questions] == ["Arti 'sekolah'?", "Pilih fi'il", "Salam"]
+    assert questions[1]["options"] == ["كَتَبَ", "كِتَابٌ"]
+    assert questions[2]["answers"] == ["Assalamu'alaikum", "السلام عليكم"]
+
+
+def test_parse_python_literal():
+    assert parse_questions("[{'q': 'Satu?', 'a': 1}]") == [{"q": "Satu?", "options": [], "answers": ["1"]}]
+
+
+def test_parse_collects_every_error():
+    with pytest.raises(QuizFormatError) as exc:
+        parse_questions('[{"q": "", "a": "x"}, {"q": "B", "options": ["a", "b"], "a": "c"}, "soal"]')
+    assert exc.value.errors == ["Soal 1: pertanyaan kosong", "Soal 2: jawaban ['c'] tidak ada di pilihan",
+                                "Soal 3: harus berupa objek"]
+
+
+@pytest.mark.parametrize("text", ["", "bukan daftar", "[]", "[{'q': }]"])
+def test_parse_rejects_invalid(text):
+    with pytest.raises(QuizFormatError):
+        parse_questions(text)
+
+
+def test_normalize_answer():
+    assert normalize_answer("  مَدْرَسَةٌ! ") == normalize_answer("مدرسة") == "مدرسة"
+    assert normalize_answer("أحمد") == normalize_answer("احمد")
+    assert normalize_answer("Assalamu'alaikum.") == "assalamu alaikum"
+
+
+def test_score_attempts(db):
+    quiz_id = save_quiz(db, "quizzes", "Kosakata", QUIZ)
+    questions = load_questions(db, "quizzes", quiz_id)
+    assert [kind for _, _, kind, _ in questions] == ["text", "choice", "text"]
+    q1, q2, q3 = (question_id for question_id, *_ in questions)
+    perfect = submit_attempt(db, "quizzes", quiz_id, 1, {q1: "مدرسة", q2: "كَتَبَ", q3: "assalamu alaikum"})
+    partial = submit_attempt(db, "quizzes", quiz_id, 2, {q1: "sekolah", q2: "كِتَابٌ", q3: "السَّلَامُ عَلَيْكُمْ"})
+    empty = submit_attempt(db, "quizzes", quiz_id, 3, {})
+
+    scored = score_attempts(db, "quizzes", quiz_id)
+    assert scored.set_index("attempt_id")[["correct", "score"]].to_dict("index") == {
+        perfect: {"correct": 3, "score": 100},
+        partial: {"correct": 1, "score": 33},
+        empty: {"correct": 0, "score": 0},
+    }
+    assert db.fetchall("SELECT user_id, competency, score FROM evaluations ORDER BY user_id") == [
+        (1, "Kuis: Kosakata", 100), (2, "Kuis: Kosakata", 33), (3, "Kuis: Kosakata", 0)]
+    # Attempt yang sudah dinilai tidak dinilai ulang
+    assert score_attempts(db, "quizzes", quiz_id).empty
+    assert db.scalar("SELECT COUNT(*) FROM evaluations") == 3
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from retrieval import VectorIndex
+
+DIM = 16
+
+
+def _vectors(n, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _index(n, **kwargs):
+    vectors = _vectors(n)
+    index = VectorIndex(DIM, **kwargs)
+    ids = np.arange(1, n + 1) * 10
+    # Ditambahkan bertahap, seperti sync()
+    for start in range(0, n, 97):
+        end = min(start + 97, n)
+        index.add(ids[start:end], ids[start:end] % 3, ids[start:end] // 10, vectors[start:end])
+    return index, ids, vectors
+
+
+def _exact(ids, vectors, query, k, keep=None):
+    scores = vectors @ query
+    order = [i for i in np.argsort(-scores) if keep is None or keep[i]]
+    return [(int(ids[i]), float(scores[i])) for i in order[:k]]
+
+
+def _assert_same(results, expected):
+    assert [i for i, _ in results] == [i for i, _ in expected]
+    assert np.allclose([s for _, s in results], [s for _, s in expected], atol=1e-5)
+
+
+def test_brute_force_matches_exact_search():
+    index, ids, vectors = _index(500)
+    assert index._centroids is None
+    for query in _vectors(5, seed=1):
+        _assert_same(index.search(query, 7), _exact(ids, vectors, query, 7))
+
+
+def test_brute_force_filters_and_removal():
+    index, ids, vectors = _index(300)
+    query = _vectors(1, seed=2)[0]
+    keep = ids % 3 == 1
+    _assert_same(index.search(query, 5, sources=[1]), _exact(ids, vectors, query, 5, keep))
+    top = index.search(query, 1)[0][0]
+    excluded = index.search(query, 5, exclude=[(top % 3, top // 10)])
+    assert top not in [i for i, _ in excluded]
+    assert index.remove([top, 99999]) == 1
+    alive = ids != top
+    _assert_same(index.search(query, 5), _exact(ids, vectors, query, 5, alive))
+    compacted = index.compacted()
+    assert (compacted.size, compacted.removed) == (299, 0)
+    _assert_same(compacted.search(query, 5), _exact(ids, vectors, query, 5, alive))
+
+
+def test_ivf_probing_every_list_is_exact():
+    # nprobe >= jumlah list: posisi kandidat berupa permutasi semua vektor, skor harus tetap milik id yang benar
+    index, ids, vectors = _index(1000, ivf_min=200, nprobe=1000)
+    assert index._centroids is not None
+    for query in _vectors(5, seed=3):
+        _assert_same(index.search(query, 10), _exact(ids, vectors, query, 10))
+
+
+def test_ivf_scores_belong_to_returned_ids():
+    index, ids, vectors = _index(1200, ivf_min=200, nprobe=2)
+    by_id = dict(zip(ids.tolist(), vectors))
+    query = _vectors(1, seed=4)[0]
+    results = index.search(query, 10)
+    assert len(results) == 10
+    assert [s for _, s in results] == sorted((s for _, s in results), reverse=True)
+    for chunk_id, score in results:
+        assert score == pytest.approx(float(by_id[chunk_id] @ query), abs=1e-5)
+    # Vektor yang ditambahkan setelah pelatihan terakhir selalu ikut diperiksa
+    extra = query.reshape(1, -1)
+    index.add([99990], [0], [9999], extra)
+    assert index.search(query, 1)[0][0] == 99990
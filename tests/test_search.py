@@ -0,0 +1,78 @@
+import pytest
+
+from search import EXCERPT_CHARS, build_match_query, index_material, search
+from textnorm import normalize_arabic, normalize_search
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("كَتَبَ", "كتب"),
+    ("مَدْرَسَةٌ", "مدرسة"),
+    ("أَحْمَدُ إِلَى آمَنَ", "احمد الى امن"),
+    ("كـــتـــب", "كتب"),
+    ("  dua   spasi \n", "dua spasi"),
+    (None, ""),
+])
+def test_normalize_arabic(text, expected):
+    assert normalize_arabic(text) == expected
+
+
+def test_normalize_search_folds_spelling_variants():
+    assert normalize_search("مدرسة") == normalize_search("مدرسه") == "مدرسه"
+    assert normalize_search("على") == normalize_search("علي")
+    assert normalize_search("ﻣﺪﺭﺳﺔ") == "مدرسه"  # bentuk presentasi Arab
+    assert normalize_search("KALAM") == "kalam"
+
+
+def test_match_query_quotes_tokens():
+    assert build_match_query('kata "OR" madra') == '"kata" "or" "madra"*'
+    assert build_match_query("  ?! ") is None
+
+
+@pytest.fixture
+def indexed(db):
+    db.execute("INSERT INTO cases (title, description, user_id) VALUES (?, ?, 1)",
+               ("Kasus Membaca", "Siswa pergi ke مَدْرَسَةٌ kemarin pagi bersama teman"))
+    db.execute("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (1, 2, ?, '2024-01-01')",
+               ("Saya setuju, madrasah itu مدرسة besar",))
+    db.execute("INSERT INTO reports (user_id, content, timestamp) VALUES (1, ?, '2024-01-02')", ("Laporan tanpa kata kunci",))
+    return db
+
+
+@pytest.mark.parametrize("query", ["مدرسة", "مَدْرَسَةٌ", "مدرسه", "مَدْرَسَه"])
+def test_arabic_with_and_without_harakat(indexed, query):
+    results = search(indexed, query)
+    assert sorted(zip(results["source"], results["ref_id"])) == [("cases", 1), ("discussions", 1)]
+    snippets = dict(zip(results["source"], results["snippet"]))
+    # Cuplikan memakai teks asli: harakat dan ة tetap seperti yang ditulis
+    assert "**مَدْرَسَةٌ**" in snippets["cases"]
+    assert "**مدرسة**" in snippets["discussions"]
+
+
+def test_prefix_case_and_source_filter(indexed):
+    results = search(indexed, "MADRA")
+    assert list(results["source"]) == ["discussions"]
+    assert search(indexed, "kasus").iloc[0]["title"] == "Kasus Membaca"
+    assert search(indexed, "مدرسة", sources=["cases"])["source"].tolist() == ["cases"]
+    assert search(indexed, "").empty
+
+
+def test_index_follows_updates_and_deletes(indexed):
+    indexed.execute("UPDATE cases SET description = 'Sekarang tentang masjid' WHERE id = 1")
+    assert search(indexed, "مدرسة")["source"].tolist() == ["discussions"]
+    assert search(indexed, "masjid")["ref_id"].tolist() == [1]
+    indexed.execute("DELETE FROM discussions WHERE id = 1")
+    assert search(indexed, "مدرسة").empty
+
+
+def test_material_excerpt_and_rename(db):
+    body = "Pendahuluan " + "isi " * 400 + "khusus"
+    with db.transaction() as tx:
+        material_id = db.execute("INSERT INTO materials (title, type) VALUES ('Nahwu', 'text/markdown')")
+        index_material(tx, material_id, "Nahwu", body)
+    stored = db.scalar("SELECT body_text FROM search_index WHERE rowid = ?", (material_id * 8 + 6,))
+    assert len(stored) == EXCERPT_CHARS
+    # Kata di luar kutipan tetap bisa dicari, cuplikannya awal kutipan
+    assert search(db, "khusus").iloc[0]["snippet"].startswith("Pendahuluan isi")
+    db.execute("UPDATE materials SET title = 'Sharaf' WHERE id = ?", (material_id,))
+    assert search(db, "sharaf")["title"].tolist() == ["Sharaf"]
+    assert search(db, "nahwu").empty
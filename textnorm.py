@@ -0,0 +1,30 @@
+# Normalisasi teks Arab/Indonesia untuk pencarian dan pencocokan jawaban: harakat dan tatweel dibuang,
+# varian alef disamakan, spasi dirapikan. Contoh: "كَتَبَ" dan "كتب" menjadi sama.
+import re
+import unicodedata
+
+# Harakat (fathah, kasrah, dammah, tanwin, sukun, syaddah, ...), alef khanjariyah, dan tanda mushaf
+_HARAKAT = re.compile("[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06DC\u06DF-\u06E8\u06EA-\u06ED]")
+_TATWEEL = "\u0640"
+_ALEF_VARIANTS = str.maketrans({"\u0623": "\u0627", "\u0625": "\u0627", "\u0622": "\u0627", "\u0671": "\u0627"})  # أ إ آ ٱ -> ا
+# Untuk pencarian: alef maqsurah -> ya, ta marbutah -> ha (ejaan yang sering tertukar)
+_SEARCH_FOLD = str.maketrans({"\u0649": "\u064A", "\u0629": "\u0647"})  # ى -> ي, ة -> ه
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_arabic(text):
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", str(text))
+    text = _HARAKAT.sub("", text).replace(_TATWEEL, "")
+    text = text.translate(_ALEF_VARIANTS)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def normalize_search(text):
+    # Bentuk yang disimpan di indeks FTS dan dipakai untuk query: juga huruf kecil dan NFKC
+    # (mis. bentuk presentasi Arab U+FExx menjadi huruf dasar)
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", str(text))
+    return normalize_arabic(text).translate(_SEARCH_FOLD).casefold()
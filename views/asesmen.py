@@ -0,0 +1,98 @@
+import streamlit as st
+from common import generate_gemini_response, get_db, get_query_cache, role, user_id
+from quiz import FORMAT_HINT, QUIZ_LABELS, QuizFormatError, load_questions, save_quiz, score_attempts, submit_attempt
+from widgets import paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+
+
+def save_quiz_form(quiz_table, title, text):
+    # Soal divalidasi sekali saat disimpan; semua kesalahan ditampilkan sekaligus
+    try:
+        save_quiz(db, quiz_table, title, text)
+    except QuizFormatError as e:
+        st.error("Soal tidak valid:\n" + "\n".join(f"- {message}" for message in e.errors))
+        return
+    st.success(f"{QUIZ_LABELS[quiz_table]} dibuat!")
+
+
+def take_quiz(quiz_table):
+    # Kerjakan kuis/asesmen: jawaban dinilai langsung oleh score_attempts, hasilnya masuk ke evaluations
+    label = QUIZ_LABELS[quiz_table]
+    titles = query_cache.read_sql(quiz_table, f"SELECT id, title FROM {quiz_table} ORDER BY id")
+    quiz_id = st.selectbox(f"Kerjakan {label}", titles['id'], format_func=dict(zip(titles['id'], titles['title'])).get)
+    if quiz_id is None:
+        return
+    quiz_id = int(quiz_id)
+    questions = query_cache.get_or_load(("quiz_questions", "quiz_options"), ("questions", quiz_table, quiz_id),
+                                        lambda: load_questions(db, quiz_table, quiz_id), scope=quiz_id)
+    if not questions:
+        st.info(f"{label} ini tidak punya soal yang valid.")
+        return
+    with st.form(f"{quiz_table}_{quiz_id}_form"):
+        responses = {}
+        for number, (question_id, prompt, kind, options) in enumerate(questions, 1):
+            if kind == "choice":
+                responses[question_id] = st.radio(f"{number}. {prompt}", options, index=None, key=f"q_{question_id}")
+            else:
+                responses[question_id] = st.text_input(f"{number}. {prompt}", key=f"q_{question_id}")
+        submitted = st.form_submit_button("Kirim Jawaban")
+    if submitted:
+        attempt_id = submit_attempt(db, quiz_table, quiz_id, user_id, responses)
+        result = score_attempts(db, quiz_table, quiz_id, attempt_ids=[attempt_id]).iloc[0]
+        st.success(f"Skor: {result['score']} ({result['correct']}/{len(questions)} benar)")
+
+    if role == 'admin':
+        # Penilaian massal: semua attempt yang belum dinilai (mis. hasil impor) dalam satu pass
+        if st.button("Nilai Semua Attempt yang Belum Dinilai", key=f"{quiz_table}_score_all"):
+            scored = score_attempts(db, quiz_table, quiz_id)
+            st.success(f"{len(scored)} attempt dinilai.")
+        st.write("Hasil Attempt:")
+        paged_dataframe(query_cache, "quiz_attempts", ["id", "user_id", "submitted_at", "score"], key=f"{quiz_table}_attempts",
+                        filters={"quiz_table": quiz_table, "quiz_id": quiz_id}, sort_columns=["id", "score"], scope=quiz_id)
+
+st.header("Fitur Asesmen & Evaluasi")
+subpage = st.selectbox("Pilih Sub Fitur", ["Asesmen Daring", "Kuis Interaktif", "Evaluasi Kompetensi"])
+
+if subpage == "Asesmen Daring":
+    st.subheader("Asesmen Daring")
+    ass_title = st.text_input("Judul Asesmen")
+    questions = st.text_area(f"Pertanyaan (JSON format: {FORMAT_HINT})")
+    if st.button("Buat Asesmen"):
+        save_quiz_form("assessments", ass_title, questions)
+
+    st.write("Daftar Asesmen:")
+    assessments = paged_dataframe(query_cache, "assessments", ["id", "title", "questions"], key="assessments",
+                                  sort_columns=["id", "title"], search_columns=["title"], preview_chars={"questions": 200})
+    take_quiz("assessments")
+
+elif subpage == "Kuis Interaktif":
+    st.subheader("Kuis Interaktif")
+    quiz_title = st.text_input("Judul Kuis")
+    topic = st.text_input("Topik untuk Generasi Kuis dengan Gemini")
+    if st.button("Generate Kuis dengan Gemini"):
+        prompt = f"Generate 5 soal kuis tentang {topic}. Jawab hanya dengan JSON dalam format: {FORMAT_HINT}"
+        # Hasil generate mengisi text_area di bawah agar bisa diperiksa/diedit sebelum disimpan
+        st.session_state["quiz_questions_input"] = generate_gemini_response(prompt)
+
+    questions_input = st.text_area("Pertanyaan (JSON format)", key="quiz_questions_input")
+    if st.button("Buat Kuis"):
+        save_quiz_form("quizzes", quiz_title, questions_input)
+
+    st.write("Daftar Kuis:")
+    quizzes = paged_dataframe(query_cache, "quizzes", ["id", "title", "questions"], key="quizzes",
+                              sort_columns=["id", "title"], search_columns=["title"], preview_chars={"questions": 200})
+    take_quiz("quizzes")
+
+elif subpage == "Evaluasi Kompetensi":
+    st.subheader("Evaluasi Kompetensi")
+    competency = st.text_input("Kompetensi")
+    score = st.number_input("Skor", 0, 100)
+    if st.button("Simpan Evaluasi"):
+        db.execute("INSERT INTO evaluations (user_id, competency, score) VALUES (?, ?, ?)", (user_id, competency, score))
+        st.success("Evaluasi disimpan!")
+
+    st.write("Daftar Evaluasi:")
+    evals = paged_dataframe(query_cache, "evaluations", ["id", "user_id", "competency", "score"], key="evaluations",
+                            sort_columns=["id", "score", "competency"], search_columns=["competency"])
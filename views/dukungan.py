@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import tempfile
+import streamlit as st
+import pandas as pd
+from common import get_ai_cache, get_db, get_metrics, get_query_cache, get_startup_report, role
+from dataio import IMPORT_TABLES, ImportValidationError, available_formats, export_table, exportable_tables, format_of, import_table, table_columns
+from metrics import METRICS_FILE
+
+db = get_db()
+query_cache = get_query_cache()
+startup_report = get_startup_report()
+ai_cache = get_ai_cache()
+metrics = get_metrics()
+
+st.header("Fitur Dukungan Teknis")
+subpage = st.selectbox("Pilih Sub Fitur", ["Technical Support", "Troubleshooting Guide", "Training & Tutorial", "Impor/Ekspor Data", "Performa"])
+
+if subpage == "Technical Support":
+    st.subheader("Technical Support")
+    issue = st.text_area("Deskripsikan Masalah")
+    if st.button("Kirim ke Support"):
+        st.success("Tikett support dibuat (placeholder).")
+
+elif subpage == "Troubleshooting Guide":
+    st.subheader("Troubleshooting Guide")
+    st.write("Panduan umum: Restart app, check login, dll.")
+
+    st.write("Laporan Startup Database:")
+    st.write(f"Versi skema {startup_report['from_version']} -> {startup_report['to_version']}, startup {startup_report['startup_seconds']:.3f} detik")
+    if startup_report["steps"]:
+        st.dataframe(pd.DataFrame(startup_report["steps"]))
+
+    st.write("Statistik Cache Respons AI:")
+    st.json(ai_cache.stats())
+
+elif subpage == "Training & Tutorial":
+    st.subheader("Training & Tutorial")
+    st.write("Tutorial penggunaan: Pilih menu di sidebar.")
+
+elif subpage == "Impor/Ekspor Data":
+    st.subheader("Impor/Ekspor Data")
+    if role != 'admin':
+        st.write("Hanya admin yang dapat mengimpor/mengekspor data.")
+    else:
+        st.write("Untuk file yang sangat besar gunakan CLI: `python dataio.py import|export <tabel> <file>`.")
+        formats = available_formats()
+        tab_import, tab_export = st.tabs(["Impor", "Ekspor"])
+        with tab_import:
+            import_target = st.selectbox("Tabel Tujuan", IMPORT_TABLES)
+            # Skema hanya berubah saat migrasi (startup), jadi daftar tabel/kolom cukup dibaca sekali
+            columns = query_cache.get_or_load("sqlite_master", ("columns", import_target), lambda: table_columns(db, import_target))
+            st.caption("Kolom: " + ", ".join(f"{name} ({kind})" for name, kind in columns))
+            uploaded = st.file_uploader("File " + " atau ".join(f.upper() for f in formats), type=formats)
+            skip_existing = st.checkbox("Lewati baris yang id-nya sudah ada")
+            if uploaded is not None and st.button("Impor"):
+                try:
+                    report = import_table(db, import_target, uploaded, format_of(uploaded.name), skip_existing)
+                except ImportValidationError as e:
+                    st.error("Impor dibatalkan, tidak ada baris yang disimpan:\n" + "\n".join(f"- {message}" for message in e.errors))
+                except (sqlite3.Error, RuntimeError, ValueError) as e:
+                    st.error(f"Impor gagal, tidak ada baris yang disimpan: {str(e)}")
+                else:
+                    st.success(f"{report['inserted']} dari {report['rows']} baris diimpor dalam {report['seconds']:.1f} detik.")
+        with tab_export:
+            export_source = st.selectbox("Tabel", query_cache.get_or_load("sqlite_master", ("tables",), lambda: exportable_tables(db)),
+                                         key="export_table")
+            export_format = st.radio("Format", formats, horizontal=True)
+            if st.button("Siapkan Ekspor"):
+                # Ditulis per potongan ke file sementara milik permintaan ini; tombol unduh menerima handle
+                # file-nya, lalu file dihapus setelah tombol dibuat
+                with tempfile.TemporaryDirectory() as tmp:
+                    path = os.path.join(tmp, f"kalam_{export_source}.{export_format}")
+                    try:
+                        with open(path, "wb") as f:
+                            report = export_table(db, export_source, f, export_format)
+                    except RuntimeError as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"{report['rows']} baris diekspor dalam {report['seconds']:.1f} detik.")
+                        with open(path, "rb") as f:
+                            st.download_button("Unduh", f, file_name=os.path.basename(path))
+
+elif subpage == "Performa":
+    st.subheader("Performa")
+    if role != 'admin':
+        st.write("Hanya admin yang dapat melihat metrik performa.")
+    else:
+        st.caption(f"Persentil dihitung atas {metrics.ring_size} pengamatan terakhir per kategori; "
+                   f"query lambat: >= {metrics.slow_query_ms:.0f} ms.")
+        summary = pd.DataFrame.from_dict(metrics.summary(), orient="index")
+        for column in ("p50", "p95", "p99"):
+            summary[column] = summary[column] * 1000
+        st.write("Ringkasan per kategori (ms):")
+        st.dataframe(summary.rename(columns={"calls": "panggilan", "seconds": "total detik", "rows": "baris", "bytes": "byte"}))
+
+        runs = metrics.runs()
+        if runs:
+            st.write("Rerun terakhir (detik):")
+            recent = pd.DataFrame(runs[-50:][::-1]).rename(columns={"other": "lainnya"})
+            recent["at"] = pd.to_datetime(recent["at"], unit="s")
+            st.dataframe(recent)
+            st.bar_chart(recent.groupby("page")[["sql", "write", "read_sql", "gemini", "lainnya"]].mean())
+
+        st.write("Pernyataan SQL dengan total waktu terbesar:")
+        st.dataframe(pd.DataFrame(metrics.statements()))
+        slow = metrics.slow_queries()
+        st.write(f"Query lambat ({len(slow)}):")
+        if slow:
+            slow = pd.DataFrame(slow)
+            slow["at"] = pd.to_datetime(slow["at"], unit="s")
+            st.dataframe(slow)
+
+        # Hanya file dari KALAM_METRICS_FILE yang boleh ditulis; lokasi tidak bisa diatur dari halaman
+        col_export, col_reset = st.columns(2)
+        if METRICS_FILE and col_export.button("Ekspor Metrik"):
+            try:
+                metrics.export(METRICS_FILE)
+            except OSError as e:
+                st.error(f"Gagal menulis metrik: {str(e)}")
+            else:
+                st.success(f"Metrik ditulis ke {METRICS_FILE}.")
+        if col_reset.button("Reset Metrik"):
+            metrics.reset()
+            st.rerun()
+        st.download_button("Unduh JSON", metrics.to_json(), file_name="kalam_metrics.json", mime="application/json")
+        st.download_button("Unduh Prometheus", metrics.to_prometheus(), file_name="kalam_metrics.prom", mime="text/plain")
@@ -0,0 +1,4 @@
+import streamlit as st
+
+st.header("Selamat Datang di Platform Pembelajaran Klinis")
+st.write("Ini adalah aplikasi demo untuk platform pendidikan klinis dengan integrasi AI Gemini untuk analisis dan generasi konten. Pilih menu di sidebar untuk mengeksplorasi fitur.")
@@ -0,0 +1,124 @@
+import streamlit as st
+from datetime import datetime
+from common import generate_gemini_response, get_db, get_grader, get_model, get_query_cache, prompt_with_context, user_id
+from grading import count_ungraded
+from widgets import context_expander, paged_dataframe, record_lookup
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Fitur Pembelajaran Klinis & Kasus")
+subpage = st.selectbox("Pilih Sub Fitur", ["Diskusi Kasus", "Manajemen Tugas", "Dokumentasi Pembelajaran", "Pelaporan Klinis Digital"])
+
+if subpage == "Diskusi Kasus":
+    st.subheader("Diskusi Kasus")
+    case_title = st.text_input("Judul Kasus")
+    case_desc = st.text_area("Deskripsi Kasus")
+    if st.button("Buat Kasus Baru"):
+        db.execute("INSERT INTO cases (title, description, user_id) VALUES (?, ?, ?)", (case_title, case_desc, user_id))
+        st.success("Kasus dibuat!")
+
+    st.write("Daftar Kasus:")
+    paged_dataframe(query_cache, "cases", ["id", "title", "description", "user_id"], key="cases",
+                    sort_columns=["id", "title"], search_columns=["title", "description"],
+                    preview_chars={"description": 200})
+
+    selected_case = record_lookup(query_cache, "cases", "ID Kasus untuk Diskusi", key="discussion_case")
+    if selected_case:
+        comment = st.text_area("Tambah Komentar")
+        if st.button("Kirim Komentar"):
+            timestamp = datetime.now().isoformat()
+            db.execute("INSERT INTO discussions (case_id, user_id, comment, timestamp) VALUES (?, ?, ?, ?)", (selected_case, user_id, comment, timestamp), scopes=[selected_case])
+            st.success("Komentar dikirim!")
+
+        st.write("Diskusi:")
+        discussions = paged_dataframe(query_cache, "discussions", ["id", "user_id", "comment", "timestamp"], key="discussions",
+                                      filters={"case_id": selected_case}, search_columns=["comment"], scope=selected_case)
+
+        # Integrasi Gemini: Analisis kasus dengan AI
+        if st.button("Analisis Kasus dengan Gemini AI"):
+            desc = query_cache.scalar("cases", "SELECT description FROM cases WHERE id=?", (selected_case,))
+            prompt = f"Analisis kasus klinis berikut: {desc}. Berikan saran diagnosis dan treatment."
+            # Materi, kasus serupa, diskusi, dan log yang relevan dilampirkan (kasus ini sendiri sudah ada di prompt)
+            prompt, passages = prompt_with_context(prompt, desc or "", exclude=[("cases", selected_case)])
+            context_expander(passages)
+            st.write("Analisis AI (Gemini):")
+            st.write_stream(generate_gemini_response(prompt, stream=True))
+
+elif subpage == "Manajemen Tugas":
+    st.subheader("Manajemen Tugas")
+    ass_title = st.text_input("Judul Tugas")
+    ass_desc = st.text_area("Deskripsi Tugas")
+    due_date = st.date_input("Batas Waktu")
+    if st.button("Buat Tugas Baru"):
+        db.execute("INSERT INTO assignments (title, description, due_date, user_id) VALUES (?, ?, ?, ?)", (ass_title, ass_desc, str(due_date), user_id))
+        st.success("Tugas dibuat!")
+
+    st.write("Daftar Tugas:")
+    assignments = paged_dataframe(query_cache, "assignments", ["id", "title", "description", "due_date", "user_id"], key="assignments",
+                                  sort_columns=["id", "due_date", "title"], search_columns=["title"],
+                                  preview_chars={"description": 200})
+
+    selected_ass = st.selectbox("Pilih Tugas untuk Submit", assignments['id'] if not assignments.empty else [])
+    if selected_ass:
+        content = st.text_area("Isi Submission")
+        if st.button("Submit Tugas"):
+            timestamp = datetime.now().isoformat()
+            db.execute("INSERT INTO submissions (assignment_id, user_id, content, timestamp) VALUES (?, ?, ?, ?)", (selected_ass, user_id, content, timestamp), scopes=[selected_ass])
+            st.success("Submission dikirim!")
+
+        st.write("Submissions:")
+        subs = paged_dataframe(query_cache, "submissions", ["id", "user_id", "content", "timestamp"], key="submissions",
+                               filters={"assignment_id": selected_ass}, preview_chars={"content": 200}, scope=selected_ass)
+
+        # Penilaian AI massal: berjalan di thread latar, hasilnya muncul setelah setiap kelompok ditulis
+        st.write("Penilaian AI:")
+        grader = get_grader()
+        if grader.running(selected_ass):
+            st.info("Penilaian AI sedang berjalan di latar belakang. Muat ulang halaman untuk melihat kemajuan.")
+            if st.button("Hentikan Penilaian"):
+                grader.stop(selected_ass)
+        else:
+            ungraded = query_cache.get_or_load(("submissions", "submission_feedback"), ("ungraded", selected_ass),
+                                               lambda: count_ungraded(db, selected_ass), scope=selected_ass)
+            if st.button(f"Nilai {ungraded} Submission dengan AI", disabled=not ungraded):
+                try:
+                    grader.start(selected_ass, get_model())
+                    st.info("Penilaian AI dimulai di latar belakang.")
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
+        last_run = query_cache.read_sql("grading_runs", "SELECT status, graded, failed, requests, seconds, error FROM grading_runs WHERE assignment_id = ? ORDER BY id DESC LIMIT 1",
+                                        (selected_ass,), scope=selected_ass)
+        if not last_run.empty:
+            run = last_run.iloc[0]
+            rate = run["graded"] / run["seconds"] if run["seconds"] else 0
+            st.caption(f"Job terakhir: {run['status']} — {run['graded']} dinilai, {run['failed']} gagal, "
+                       f"{run['requests']} permintaan, {rate:.1f} submission/detik" + (f" ({run['error']})" if run["error"] else ""))
+        paged_dataframe(query_cache, "submission_feedback", ["id", "submission_id", "score", "feedback", "graded_at"], key="submission_feedback",
+                        filters={"assignment_id": selected_ass}, sort_columns=["id", "score"], preview_chars={"feedback": 300},
+                        scope=selected_ass)
+
+elif subpage == "Dokumentasi Pembelajaran":
+    st.subheader("Dokumentasi Pembelajaran")
+    selected_case = record_lookup(query_cache, "cases", "ID Kasus", key="log_case")
+    log = st.text_area("Catatan Pembelajaran")
+    if st.button("Simpan Log", disabled=selected_case is None):
+        timestamp = datetime.now().isoformat()
+        db.execute("INSERT INTO learning_logs (user_id, case_id, log, timestamp) VALUES (?, ?, ?, ?)", (user_id, selected_case, log, timestamp), scopes=[user_id])
+        st.success("Log disimpan!")
+
+    st.write("Log Pembelajaran:")
+    logs = paged_dataframe(query_cache, "learning_logs", ["id", "case_id", "log", "timestamp"], key="learning_logs",
+                           filters={"user_id": user_id}, search_columns=["log"], preview_chars={"log": 200}, scope=user_id)
+
+elif subpage == "Pelaporan Klinis Digital":
+    st.subheader("Pelaporan Klinis Digital")
+    report_content = st.text_area("Isi Laporan")
+    if st.button("Kirim Laporan"):
+        timestamp = datetime.now().isoformat()
+        db.execute("INSERT INTO reports (user_id, content, timestamp) VALUES (?, ?, ?)", (user_id, report_content, timestamp))
+        st.success("Laporan dikirim!")
+
+    st.write("Daftar Laporan:")
+    reports = paged_dataframe(query_cache, "reports", ["id", "user_id", "content", "timestamp"], key="reports",
+                              search_columns=["content"], preview_chars={"content": 200})
@@ -0,0 +1,65 @@
+import streamlit as st
+from datetime import datetime
+from common import get_db, get_query_cache, user_id
+from live import dm_feed, forum_feed, unread_counts
+from widgets import live_feed, paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Fitur Komunikasi & Kolaborasi")
+subpage = st.selectbox("Pilih Sub Fitur", ["Forum Diskusi", "Chat/Pesan Langsung", "Video Conference Integration"])
+
+if subpage == "Forum Diskusi":
+    st.subheader("Forum Diskusi")
+    topic = st.text_input("Topik Forum")
+    if st.button("Buat Forum Baru"):
+        db.execute("INSERT INTO forums (topic, user_id) VALUES (?, ?)", (topic, user_id))
+        st.success("Forum dibuat!")
+
+    st.write("Daftar Forum:")
+    forums = paged_dataframe(query_cache, "forums", ["id", "topic", "user_id"], key="forums",
+                             sort_columns=["id", "topic"], search_columns=["topic"])
+
+    unread = unread_counts(db, query_cache, user_id)
+    selected_forum = st.selectbox("Pilih Forum", forums['id'] if not forums.empty else [],
+                                  format_func=lambda f: f"{f} ({unread[f'forum:{f}']} baru)" if unread.get(f"forum:{f}") else str(f))
+    if selected_forum:
+        selected_forum = int(selected_forum)
+        post_content = st.text_area("Tambah Post")
+        if st.button("Kirim Post"):
+            timestamp = datetime.now().isoformat()
+            db.execute("INSERT INTO forum_posts (forum_id, user_id, content, timestamp) VALUES (?, ?, ?, ?)", (selected_forum, user_id, post_content, timestamp), scopes=[selected_forum])
+            st.success("Post dikirim!")
+
+        st.write("Posts:")
+        # Post terbaru diperbarui otomatis; riwayat lengkap dan pencarian ada di bawahnya
+        live_feed(db, forum_feed(selected_forum), user_id, lambda row: st.markdown(f"**User {row[1]}** · {row[3]}\n\n{row[2]}"))
+        with st.expander("Semua Post"):
+            posts = paged_dataframe(query_cache, "forum_posts", ["id", "user_id", "content", "timestamp"], key="forum_posts",
+                                    filters={"forum_id": selected_forum}, search_columns=["content"], scope=selected_forum)
+
+elif subpage == "Chat/Pesan Langsung":
+    st.subheader("Chat/Pesan Langsung")
+    dm_unread = {channel[3:]: n for channel, n in unread_counts(db, query_cache, user_id).items() if channel.startswith("dm:")}
+    if dm_unread:
+        st.caption("Pesan baru dari: " + ", ".join(f"User {other} ({n})" for other, n in sorted(dm_unread.items())))
+    to_user_id = int(st.number_input("Kirim ke User ID", min_value=1))
+    message = st.text_area("Pesan")
+    if st.button("Kirim Pesan"):
+        timestamp = datetime.now().isoformat()
+        db.execute("INSERT INTO messages (from_user, to_user, content, timestamp) VALUES (?, ?, ?, ?)", (user_id, to_user_id, message, timestamp), scopes=[user_id, to_user_id])
+        st.success("Pesan dikirim!")
+
+    st.write(f"Percakapan dengan User {to_user_id}:")
+    live_feed(db, dm_feed(user_id, to_user_id), user_id, lambda row: st.chat_message(f"User {row[1]}").write(f"{row[3]}  \n_{row[4]}_"))
+    with st.expander("Semua Pesan"):
+        messages = paged_dataframe(query_cache, "messages", ["id", "from_user", "to_user", "content", "timestamp"], key="messages",
+                                   where=("to_user=? OR from_user=?", (user_id, user_id)), search_columns=["content"], scope=user_id)
+
+elif subpage == "Video Conference Integration":
+    st.subheader("Video Conference Integration")
+    st.write("Integrasi dengan Zoom atau Google Meet. Masukkan link meeting:")
+    link = st.text_input("Link Video Conference")
+    if link:
+        st.write(f"Link: {link} (Integrasi placeholder - gunakan API eksternal untuk real implementasi)")
@@ -0,0 +1,87 @@
+import mimetypes
+import streamlit as st
+from blobstore import STATIC_MAX_SIZE
+from common import generate_gemini_response, get_blob_store, get_db, get_query_cache, prompt_with_context
+from search import index_material
+from widgets import context_expander, paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+blobs = get_blob_store()
+
+st.header("Fitur Manajemen Konten")
+subpage = st.selectbox("Pilih Sub Fitur", ["Library Materi", "Upload Dokumen", "Multimedia Integration", "E-book/BSE"])
+
+if subpage == "Library Materi":
+    st.subheader("Library Materi")
+    st.write("Daftar Materi:")
+    materials = paged_dataframe(query_cache, "materials", ["id", "title", "type", "size"], key="materials",
+                                sort_columns=["id", "title", "type", "size"], search_columns=["title", "type"])
+
+    # Tambahan: Generate Materi dengan Gemini
+    st.subheader("Generate Materi dengan Gemini AI")
+    materi_title = st.text_input("Judul Materi")
+    materi_topic = st.text_area("Topik atau Deskripsi untuk Generasi Materi")
+    if st.button("Generate Materi"):
+        if materi_topic:
+            prompt = f"Generate materi pembelajaran lengkap tentang {materi_topic}. Sertakan penjelasan, contoh, dan ringkasan dalam format teks Markdown."
+            prompt, passages = prompt_with_context(prompt, materi_topic)
+            context_expander(passages)
+            st.write("Materi Generated:")
+            st.session_state["generated_materi"] = st.write_stream(generate_gemini_response(prompt, stream=True))
+    elif st.session_state.get("generated_materi"):
+        # Hasil generate disimpan di session_state agar tetap ada saat tombol simpan ditekan (rerun baru)
+        st.write("Materi Generated:")
+        st.markdown(st.session_state["generated_materi"])
+
+    # Simpan ke database sebagai teks (type 'text')
+    if st.session_state.get("generated_materi") and st.button("Simpan Materi Generated ke Library"):
+        generated_content = st.session_state.pop("generated_materi")
+        blob_sha, size = blobs.put_bytes(generated_content.encode('utf-8'))  # Simpan teks ke blob store
+        with db.transaction() as tx:
+            material_id = db.execute("INSERT INTO materials (title, type, blob_sha, size) VALUES (?, ?, ?, ?)", (materi_title, 'text/markdown', blob_sha, size))
+            index_material(tx, material_id, materi_title, generated_content)
+        st.success("Materi disimpan ke library!")
+
+elif subpage == "Upload Dokumen":
+    st.subheader("Upload Dokumen")
+    title = st.text_input("Judul Dokumen")
+    uploaded_file = st.file_uploader("Upload File")
+    if uploaded_file and st.button("Upload"):
+        # Isi file ditulis per potongan ke blob store; database hanya menyimpan metadata
+        blob_sha, size = blobs.put_stream(uploaded_file)
+        file_type = uploaded_file.type
+        with db.transaction() as tx:
+            material_id = db.execute("INSERT INTO materials (title, type, blob_sha, size) VALUES (?, ?, ?, ?)", (title, file_type, blob_sha, size))
+            if file_type and file_type.startswith('text'):
+                index_material(tx, material_id, title, blobs.read_text(blob_sha))
+        st.success("Dokumen diupload!")
+
+elif subpage == "Multimedia Integration":
+    st.subheader("Multimedia Integration")
+    st.write("Dukungan untuk video, audio, gambar. Upload di atas dan tampilkan di sini (placeholder).")
+    selected_material = st.selectbox("Pilih Materi", query_cache.read_sql("materials", "SELECT id FROM materials ORDER BY id")['id'])
+    if selected_material:
+        mat_type, blob_sha, size = query_cache.fetchone("materials", "SELECT type, blob_sha, size FROM materials WHERE id=?", (selected_material,))
+        mat_type = mat_type or ''
+        if 'text' in mat_type:
+            st.markdown(blobs.read_text(blob_sha))  # Tampilkan jika teks
+        elif any(kind in mat_type for kind in ('image', 'video', 'audio')):
+            if (size or 0) > STATIC_MAX_SIZE:
+                st.warning("File terlalu besar untuk diputar dari aplikasi; ambil langsung dari penyimpanan server.")
+            else:
+                # Media disajikan lewat static serving (dari disk, mendukung Range), bukan lewat memori Streamlit
+                url = blobs.publish(blob_sha, mimetypes.guess_extension(mat_type) or "")
+                if 'image' in mat_type:
+                    st.image(url)
+                elif 'video' in mat_type:
+                    st.video(url)
+                else:
+                    st.audio(url)
+        else:
+            # Isi file baru dibaca saat tombol diklik, bukan di setiap rerun
+            st.download_button("Download", lambda: blobs.read_bytes(blob_sha), file_name="file")
+
+elif subpage == "E-book/BSE":
+    st.subheader("E-book/BSE")
+    st.write("Akses ke e-book (placeholder - integrasi dengan library eksternal).")
@@ -0,0 +1,35 @@
+import streamlit as st
+from common import get_db, get_query_cache
+from widgets import paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Fitur Laboratorium Virtual/Simulasi")
+subpage = st.selectbox("Pilih Sub Fitur", ["Virtual Lab", "Interactive Simulation", "3D Visualization", "Real-time Feedback"])
+
+if subpage == "Virtual Lab":
+    st.subheader("Virtual Lab")
+    sim_title = st.text_input("Judul Simulasi")
+    sim_desc = st.text_area("Deskripsi")
+    if st.button("Buat Simulasi"):
+        db.execute("INSERT INTO simulations (title, description) VALUES (?, ?)", (sim_title, sim_desc))
+        st.success("Simulasi dibuat!")
+
+    sims = paged_dataframe(query_cache, "simulations", ["id", "title", "description"], key="simulations",
+                           sort_columns=["id", "title"], search_columns=["title"], preview_chars={"description": 200})
+
+elif subpage == "Interactive Simulation":
+    st.subheader("Interactive Simulation")
+    st.write("Placeholder untuk simulasi interaktif (gunakan library seperti pygame jika diintegrasikan).")
+
+elif subpage == "3D Visualization":
+    st.subheader("3D Visualization")
+    st.write("Placeholder untuk 3D (gunakan library seperti plotly atau three.js via components).")
+
+elif subpage == "Real-time Feedback":
+    st.subheader("Real-time Feedback")
+    st.write("Umpan balik placeholder berdasarkan input.")
+    input_sim = st.text_input("Input Simulasi")
+    if input_sim:
+        st.write("Feedback: Input diterima!")
@@ -0,0 +1,78 @@
+import streamlit as st
+import pandas as pd
+from analytics import (ACTIVITY_SOURCES, activity_by_user, activity_daily, attendance_summary,
+                       progress_summary, rebuild_aggregates, score_distribution)
+from common import get_db, get_query_cache, role, user_id
+from widgets import paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Fitur Monitoring & Tracking")
+subpage = st.selectbox("Pilih Sub Fitur", ["Progress Tracking", "Dashboard Analytics", "Attendance Tracking", "Learning Analytics"])
+
+if subpage == "Progress Tracking":
+    st.subheader("Progress Tracking")
+    module = st.text_input("Modul")
+    status = st.selectbox("Status", ["In Progress", "Completed"])
+    if st.button("Update Progress"):
+        db.execute("INSERT INTO progress (user_id, module, status) VALUES (?, ?, ?)", (user_id, module, status), scopes=[user_id])
+        st.success("Progress diupdate!")
+
+    progress = paged_dataframe(query_cache, "progress", ["id", "module", "status"], key="progress",
+                               filters={"user_id": user_id}, sort_columns=["id", "module", "status"], search_columns=["module"], scope=user_id)
+
+elif subpage == "Dashboard Analytics":
+    st.subheader("Dashboard Analytics")
+    # Semua angka dibaca dari tabel agregat (analytics.py), bukan dari tabel mentah
+    progress_stats = progress_summary(query_cache)
+    attendance_stats = attendance_summary(query_cache)
+    score_hist, competency_stats = score_distribution(query_cache)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Rata-rata Penyelesaian Modul", f"{progress_stats['completion_rate'].mean():.0%}" if not progress_stats.empty else "-")
+    c2.metric("Tingkat Kehadiran", f"{attendance_stats['present'].sum() / attendance_stats['total'].sum():.0%}" if not attendance_stats.empty else "-")
+    c3.metric("Jumlah Evaluasi", int(competency_stats['n'].sum()) if not competency_stats.empty else 0)
+
+    if not progress_stats.empty:
+        st.write("Status Modul (terakhir per pengguna):")
+        st.bar_chart(pd.Series({
+            "Completed": int(progress_stats['completed'].sum()),
+            "In Progress": int((progress_stats['modules'] - progress_stats['completed']).sum()),
+        }))
+    if not attendance_stats.empty:
+        st.write("Tingkat Kehadiran per Pengguna:")
+        st.bar_chart(attendance_stats.set_index('user_id')['attendance_rate'])
+    if not score_hist.empty:
+        st.write("Distribusi Skor Evaluasi:")
+        st.bar_chart(score_hist)
+        st.dataframe(competency_stats, hide_index=True)
+
+elif subpage == "Attendance Tracking":
+    st.subheader("Attendance Tracking")
+    date = st.date_input("Tanggal")
+    status = st.selectbox("Status", ["Hadir", "Absen"])
+    if st.button("Catat Kehadiran"):
+        db.execute("INSERT INTO attendance (user_id, date, status) VALUES (?, ?, ?)", (user_id, str(date), status))
+        st.success("Kehadiran dicatat!")
+
+    attendance = paged_dataframe(query_cache, "attendance", ["id", "user_id", "date", "status"], key="attendance",
+                                 sort_columns=["id", "date"], search_columns=["status"])
+
+elif subpage == "Learning Analytics":
+    st.subheader("Learning Analytics")
+    daily = activity_daily(query_cache)
+    if daily.empty:
+        st.write("Belum ada aktivitas (log pembelajaran atau diskusi).")
+    else:
+        st.write("Aktivitas Harian (30 hari terakhir yang tercatat):")
+        st.line_chart(daily)
+        st.write("Pengguna Paling Aktif:")
+        st.dataframe(activity_by_user(query_cache))
+
+    if role == 'admin' and st.button("Hitung Ulang Agregat"):
+        with db.transaction() as tx:
+            rebuild_aggregates(tx)
+            for table in ("progress", "attendance", "evaluations") + ACTIVITY_SOURCES:
+                db.mark_written(table)
+        st.success("Agregat dihitung ulang!")
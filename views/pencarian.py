@@ -0,0 +1,20 @@
+import streamlit as st
+from common import get_db, get_query_cache
+from search import INDEXED_TABLES, SOURCE_LABELS, search
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Pencarian")
+st.write("Cari kasus, diskusi, post forum, laporan, log pembelajaran, dan materi teks (Arab atau Indonesia).")
+query = st.text_input("Kata kunci")
+sources = st.multiselect("Sumber", list(INDEXED_TABLES), format_func=SOURCE_LABELS.get)
+if query:
+    # Hasil di-cache sampai salah satu tabel sumber ditulis
+    results = query_cache.get_or_load(INDEXED_TABLES, ("search", query, tuple(sources)),
+                                      lambda: search(db, query, sources=sources, limit=50))
+    if results.empty:
+        st.write("Tidak ada hasil.")
+    for row in results.itertuples():
+        st.markdown(f"**{SOURCE_LABELS[row.source]} #{row.ref_id}** {row.title}")
+        st.caption(row.snippet)
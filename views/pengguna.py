@@ -0,0 +1,34 @@
+import streamlit as st
+from datetime import datetime
+from common import get_db, get_query_cache, user_id
+from live import notification_feed, unread_counts
+from widgets import live_feed, paged_dataframe
+
+db = get_db()
+query_cache = get_query_cache()
+
+st.header("Fitur Manajemen Pengguna")
+subpage = st.selectbox("Pilih Sub Fitur", ["Role-Based Access", "User Management", "Notification System"])
+
+if subpage == "Role-Based Access":
+    st.subheader("Role-Based Access")
+    st.write("Sudah diimplementasikan via role check (placeholder untuk demo).")
+
+elif subpage == "User Management":
+    st.subheader("User Management")
+    st.write("Fitur manajemen pengguna (placeholder, karena login dihapus).")
+
+elif subpage == "Notification System":
+    st.subheader("Notification System")
+    message = st.text_input("Pesan Notifikasi")
+    if st.button("Kirim Notifikasi"):
+        timestamp = datetime.now().isoformat()
+        db.execute("INSERT INTO notifications (user_id, message, timestamp) VALUES (?, ?, ?)", (user_id, message, timestamp), scopes=[user_id])
+        st.success("Notifikasi dikirim!")
+
+    new_count = unread_counts(db, query_cache, user_id).get("notif", 0)
+    st.write(f"Notifikasi ({new_count} baru):" if new_count else "Notifikasi:")
+    live_feed(db, notification_feed(user_id), user_id, lambda row: st.markdown(f"**{row[1]}**  \n_{row[2]}_"))
+    with st.expander("Semua Notifikasi"):
+        notifs = paged_dataframe(query_cache, "notifications", ["id", "message", "timestamp"], key="notifications",
+                                 filters={"user_id": user_id}, scope=user_id)
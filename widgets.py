@@ -0,0 +1,91 @@
+# Komponen UI Streamlit yang dipakai ulang di banyak halaman.
+import streamlit as st
+
+from live import FEED_WINDOW, LIVE_INTERVAL, FeedState, mark_read
+from paging import fetch_page
+from search import SOURCE_LABELS
+
+
+def paged_dataframe(cache, table, columns, key, filters=None, where=None, sort_columns=None,
+                    search_columns=None, page_size=25, preview_chars=None, scope=None):
+    # Tampilkan tabel per halaman dengan pengurutan, pencarian, dan tombol navigasi.
+    # cache: QueryCache; scope: nilai scope penulisan yang membatalkan daftar ini (mis. case_id).
+    # Mengembalikan DataFrame halaman yang sedang tampil.
+    sort_columns = sort_columns or ["id"]
+    c1, c2, c3 = st.columns([2, 1, 3])
+    sort_by = c1.selectbox("Urutkan", sort_columns, key=f"{key}_sort")
+    descending = c2.toggle("Terbaru dulu", value=True, key=f"{key}_desc")
+    search_column, search = None, None
+    if search_columns:
+        s1, s2 = c3.columns([1, 2])
+        search_column = s1.selectbox("Cari di", search_columns, key=f"{key}_search_col")
+        search = s2.text_input("Cari", key=f"{key}_search") or None
+
+    # Tumpukan cursor awal setiap halaman; diulang dari awal jika urutan/filter berubah
+    signature = (sort_by, descending, search_column, search, tuple(sorted((filters or {}).items())), where)
+    state_key = f"{key}_pages"
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[state_key] = [None]
+    pages = st.session_state[state_key]
+
+    rows, next_cursor = fetch_page(cache.db, table, columns, sort_by, descending, filters, where,
+                                   search_column, search, pages[-1], page_size, preview_chars,
+                                   cache=cache, scope=scope)
+    st.dataframe(rows, hide_index=True)
+
+    n1, n2, n3 = st.columns([1, 2, 1])
+    if n1.button("Sebelumnya", key=f"{key}_prev", disabled=len(pages) == 1):
+        pages.pop()
+        st.rerun()
+    n2.caption(f"Halaman {len(pages)}")
+    if n3.button("Berikutnya", key=f"{key}_next", disabled=next_cursor is None):
+        pages.append(next_cursor)
+        st.rerun()
+    return rows
+
+
+def record_lookup(cache, table, label, key, title_column="title"):
+    # Pilih satu baris lewat id-nya, tidak tergantung halaman daftar yang sedang tampil.
+    # Judulnya ditampilkan sebagai konfirmasi; mengembalikan id, atau None jika kosong/tidak ada.
+    record_id = st.number_input(label, min_value=1, step=1, value=None, key=key, placeholder="Masukkan ID")
+    if record_id is None:
+        return None
+    row = cache.fetchone(table, f"SELECT id, {title_column} FROM {table} WHERE id = ?", (int(record_id),))
+    if row is None:
+        st.warning(f"ID {int(record_id)} tidak ditemukan.")
+        return None
+    st.caption(f"#{row[0]} — {row[1]}")
+    return row[0]
+
+
+def live_feed(db, feed, user_id, render_row, window=FEED_WINDOW, interval=LIVE_INTERVAL):
+    # Tampilkan `window` baris terakhir sebuah feed (live.Feed) dan perbarui setiap `interval` detik
+    # tanpa rerun halaman penuh. Cursor feed disimpan di session_state per channel.
+    # render_row(row) menggambar satu baris (tuple sesuai feed.columns).
+    @st.fragment(run_every=interval)
+    def render():
+        state_key = f"feed_{feed.channel}_{feed.branches}"
+        state = st.session_state.get(state_key)
+        if state is None:
+            state = st.session_state[state_key] = FeedState(feed, window)
+        first = state.last_id is None
+        if state.poll(db) or first:
+            mark_read(db, user_id, feed.channel, state.last_id)
+        if not state.rows:
+            st.caption("Belum ada apa pun di sini.")
+        for row in state.rows:
+            render_row(row)
+
+    render()
+
+
+def context_expander(passages):
+    # Tampilkan potongan konteks (retrieval.Passage) yang dilampirkan ke prompt Gemini
+    if not passages:
+        return
+    with st.expander(f"Konteks yang dipakai ({len(passages)} sumber)"):
+        for number, passage in enumerate(passages, 1):
+            st.markdown(f"**[{number}] {SOURCE_LABELS.get(passage.source, passage.source)} #{passage.ref_id}** "
+                        f"{passage.title} · kemiripan {passage.score:.2f}")
+            st.caption(passage.text[:300])